@@ -0,0 +1,329 @@
+"""
+Almacén de Resultados: Réplicas de todas las configuraciones en una base SQLite
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set, Tuple
+import numpy as np
+
+from .cache import describir_semilla
+from .generadores.variables_aleatorias import Semilla
+
+
+# Indicadores por unidad (ej. tiempo ocioso por sala): se guardan como
+# vectores float64 en binario, no como columnas
+INDICADORES_VECTORIALES = ('PTOSR',)
+
+# Tabla de réplicas: la serie de semillas (semilla base y números aleatorios
+# comunes) es parte de la clave, para que barridos con distintas semillas no
+# se pisen
+_CREAR_TABLA = (
+    "CREATE TABLE IF NOT EXISTS {tabla} ("
+    "G INTEGER NOT NULL, SR INTEGER NOT NULL, I INTEGER NOT NULL, SC INTEGER NOT NULL, "
+    "semilla_base INTEGER NOT NULL, crn INTEGER NOT NULL, replica INTEGER NOT NULL, semilla TEXT, "
+    "PRIMARY KEY (G, SR, I, SC, semilla_base, crn, replica))"
+)
+
+
+class AlmacenResultados:
+    """
+    Guarda los resultados de réplicas individuales en una base SQLite: una
+    fila por réplica, indexada por configuración (G, SR, I, SC), serie de
+    semillas (semilla base y si se usaron números aleatorios comunes) y
+    número de réplica, con una columna por indicador escalar y los
+    indicadores por unidad (INDICADORES_VECTORIALES) como vectores float64.
+    
+    Barridos con distintas semillas conviven en la misma base sin pisarse.
+    Las cargas devuelven una sola serie: la pedida, o la única guardada (si
+    hay varias y no se indica cuál, se lanza ValueError en lugar de
+    mezclarlas en una misma muestra).
+    
+    Cargar un barrido completo es una sola consulta en lugar de abrir un
+    archivo por réplica. Las escrituras se acumulan en memoria y se confirman
+    en lotes (una transacción cada tamano_lote réplicas, o al llamar a
+    confirmar); solo el proceso principal escribe.
+    """
+    
+    def __init__(self, archivo: str, tamano_lote: int = 500):
+        """
+        Abre (o crea) la base de resultados.
+        
+        Args:
+            archivo: Ruta del archivo SQLite
+            tamano_lote: Réplicas a acumular antes de escribir una transacción
+        """
+        self.archivo = Path(archivo)
+        self.archivo.parent.mkdir(parents=True, exist_ok=True)
+        self.tamano_lote = tamano_lote
+        self._conexion = sqlite3.connect(str(self.archivo))
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        with self._conexion:
+            self._conexion.execute(_CREAR_TABLA.format(tabla="replicas"))
+        self._columnas = [fila[1] for fila in self._conexion.execute("PRAGMA table_info(replicas)")]
+        if 'crn' not in self._columnas:
+            self._migrar()
+        self._pendientes: List[Dict[str, Any]] = []
+    
+    def guardar(self, resultados: Dict[str, Any], semilla: Semilla):
+        """
+        Agrega una réplica al lote pendiente (reemplaza la réplica guardada
+        con la misma configuración, serie de semillas y número de réplica).
+        
+        Args:
+            resultados: Resultados de la réplica (con clave 'replica')
+            semilla: Semilla de la réplica (ver semilla_replica)
+        """
+        fila = {}
+        for nombre, valor in resultados.items():
+            if nombre in INDICADORES_VECTORIALES:
+                valor = np.asarray(valor, dtype=np.float64).tobytes()
+            elif isinstance(valor, np.generic):
+                valor = valor.item()
+            fila[nombre] = valor
+        descripcion = describir_semilla(semilla)
+        fila['semilla'] = json.dumps(descripcion)
+        fila['semilla_base'], fila['crn'] = _serie(descripcion)
+        self._pendientes.append(fila)
+        if len(self._pendientes) >= self.tamano_lote:
+            self.confirmar()
+    
+    def confirmar(self):
+        """Escribe las réplicas pendientes en una única transacción."""
+        if not self._pendientes:
+            return
+        nuevas = sorted({nombre for fila in self._pendientes for nombre in fila} - set(self._columnas))
+        columnas = self._columnas + nuevas
+        sentencia = (
+            f"INSERT OR REPLACE INTO replicas ({', '.join(_columna(c) for c in columnas)}) "
+            f"VALUES ({', '.join('?' * len(columnas))})"
+        )
+        with self._conexion:
+            for nombre in nuevas:
+                # Sin tipo declarado: enteros y reales se guardan tal cual
+                self._conexion.execute(f"ALTER TABLE replicas ADD COLUMN {_columna(nombre)}")
+            self._conexion.executemany(
+                sentencia, [tuple(fila.get(c) for c in columnas) for fila in self._pendientes]
+            )
+        self._columnas = columnas
+        self._pendientes = []
+    
+    def claves(self) -> Set[Tuple[int, int, int, int, int, int, int]]:
+        """
+        Retorna las réplicas guardadas.
+        
+        Returns:
+            Conjunto de tuplas (G, SR, I, SC, semilla_base, crn, replica)
+        """
+        self.confirmar()
+        return set(self._conexion.execute("SELECT G, SR, I, SC, semilla_base, crn, replica FROM replicas"))
+    
+    def series(self) -> List[Tuple[int, bool]]:
+        """
+        Retorna las series de semillas guardadas.
+        
+        Returns:
+            Lista de tuplas (semilla_base, crn), ordenada
+        """
+        self.confirmar()
+        return [(base, bool(crn)) for base, crn in self._conexion.execute(
+            "SELECT DISTINCT semilla_base, crn FROM replicas ORDER BY semilla_base, crn")]
+    
+    def obtener(self, G: int, SR: int, I: int, SC: int, replica: int,
+                semilla: Semilla) -> Optional[Dict[str, Any]]:
+        """
+        Carga una réplica.
+        
+        Args:
+            G, SR, I, SC: Configuración del escenario
+            replica: Número de réplica
+            semilla: Semilla de la réplica (solo se carga si coincide)
+        
+        Returns:
+            Resultados de la réplica, o None si no está guardada con esa semilla
+        """
+        descripcion = describir_semilla(semilla)
+        replicas = self._consultar(
+            "WHERE G = ? AND SR = ? AND I = ? AND SC = ? AND semilla_base = ? AND crn = ? AND replica = ? "
+            "AND semilla = ?",
+            (G, SR, I, SC) + _serie(descripcion) + (replica, json.dumps(descripcion))
+        )
+        return replicas[0] if replicas else None
+    
+    def cargar_escenario(self, G: int, SR: int, I: int, SC: int, semilla_base: Optional[int] = None,
+                         crn: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """
+        Carga todas las réplicas de un escenario de una serie de semillas.
+        
+        Args:
+            G, SR, I, SC: Configuración del escenario
+            semilla_base: Semilla base de la serie (None = cualquiera)
+            crn: Si la serie usa números aleatorios comunes (None = cualquiera)
+        
+        Returns:
+            Lista de resultados de réplicas (ordenada por número de réplica)
+        
+        Raises:
+            ValueError: Si el escenario tiene réplicas de varias series que
+                cumplen el filtro
+        """
+        condicion, parametros = self._filtro_serie(semilla_base, crn, "G = ? AND SR = ? AND I = ? AND SC = ?",
+                                                   (G, SR, I, SC))
+        return self._consultar(f"WHERE {condicion} ORDER BY replica", parametros)
+    
+    def cargar_tabla(self, vectoriales: bool = False, semilla_base: Optional[int] = None,
+                     crn: Optional[bool] = None):
+        """
+        Carga todas las réplicas de una serie de semillas como un DataFrame
+        (una fila por réplica).
+        
+        Args:
+            vectoriales: Si incluir los indicadores por unidad (como arrays)
+            semilla_base: Semilla base de la serie (None = cualquiera)
+            crn: Si la serie usa números aleatorios comunes (None = cualquiera)
+        
+        Returns:
+            pandas.DataFrame ordenado por configuración y réplica
+        
+        Raises:
+            ValueError: Si hay réplicas de varias series que cumplen el filtro
+        """
+        import pandas as pd
+        
+        condicion, parametros = self._filtro_serie(semilla_base, crn)
+        columnas = [c for c in self._columnas if vectoriales or c not in INDICADORES_VECTORIALES]
+        df = pd.read_sql_query(
+            f"SELECT {', '.join(_columna(c) for c in columnas)} FROM replicas "
+            f"WHERE {condicion} ORDER BY G, SR, I, SC, replica",
+            self._conexion,
+            params=parametros
+        )
+        for nombre in INDICADORES_VECTORIALES:
+            if nombre in df.columns:
+                df[nombre] = [None if v is None else np.frombuffer(v, dtype=np.float64) for v in df[nombre]]
+        return df
+    
+    def _filtro_serie(
+        self,
+        semilla_base: Optional[int],
+        crn: Optional[bool],
+        condicion: str = "1",
+        parametros: Tuple = ()
+    ) -> Tuple[str, Tuple]:
+        """
+        Restringe una condición SQL a una sola serie de semillas.
+        
+        Args:
+            semilla_base: Semilla base de la serie (None = cualquiera)
+            crn: Si la serie usa números aleatorios comunes (None = cualquiera)
+            condicion: Condición WHERE de las réplicas a cargar
+            parametros: Valores de los parámetros de la condición
+        
+        Returns:
+            Tupla (condicion, parametros) que además fija la serie
+        
+        Raises:
+            ValueError: Si hay réplicas de varias series que cumplen el filtro
+        """
+        self.confirmar()
+        if semilla_base is not None:
+            condicion, parametros = f"{condicion} AND semilla_base = ?", parametros + (semilla_base,)
+        if crn is not None:
+            condicion, parametros = f"{condicion} AND crn = ?", parametros + (int(crn),)
+        series = self._conexion.execute(
+            f"SELECT DISTINCT semilla_base, crn FROM replicas WHERE {condicion}", parametros).fetchall()
+        if len(series) > 1:
+            descripcion = ", ".join(f"semilla_base={base} crn={bool(crn)}" for base, crn in sorted(series))
+            raise ValueError(f"{self.archivo} tiene réplicas de varias series de semillas ({descripcion}); "
+                             f"indicar semilla_base y crn")
+        if series:
+            condicion = f"{condicion} AND semilla_base = ? AND crn = ?"
+            parametros = parametros + tuple(series[0])
+        return condicion, parametros
+    
+    def _migrar(self):
+        """
+        Lleva una base con el esquema anterior (clave sin la serie de
+        semillas) al esquema actual. La serie de cada réplica se deduce de su
+        semilla; las réplicas guardadas sin semilla se descartan, ya que no
+        se puede saber a qué serie pertenecen.
+        """
+        with self._conexion:
+            self._conexion.execute(_CREAR_TABLA.format(tabla="replicas_migradas"))
+            for nombre in self._columnas:
+                if nombre not in ('G', 'SR', 'I', 'SC', 'replica', 'semilla'):
+                    self._conexion.execute(f"ALTER TABLE replicas_migradas ADD COLUMN {_columna(nombre)}")
+            filas = self._conexion.execute(
+                f"SELECT {', '.join(_columna(c) for c in self._columnas)} FROM replicas WHERE semilla IS NOT NULL")
+            columnas = self._columnas + ['semilla_base', 'crn']
+            indice = self._columnas.index('semilla')
+            self._conexion.executemany(
+                f"INSERT INTO replicas_migradas ({', '.join(_columna(c) for c in columnas)}) "
+                f"VALUES ({', '.join('?' * len(columnas))})",
+                [fila + _serie(json.loads(fila[indice])) for fila in filas]
+            )
+            self._conexion.execute("DROP TABLE replicas")
+            self._conexion.execute("ALTER TABLE replicas_migradas RENAME TO replicas")
+        self._columnas = [fila[1] for fila in self._conexion.execute("PRAGMA table_info(replicas)")]
+    
+    def _consultar(self, condicion: str, parametros: Tuple) -> List[Dict[str, Any]]:
+        """
+        Carga las réplicas que cumplen una condición SQL.
+        
+        Args:
+            condicion: Cláusula WHERE (y ORDER BY) de la consulta
+            parametros: Valores de los parámetros de la condición
+        
+        Returns:
+            Lista de resultados de réplicas
+        """
+        self.confirmar()
+        cursor = self._conexion.execute(f"SELECT * FROM replicas {condicion}", parametros)
+        nombres = [descripcion[0] for descripcion in cursor.description]
+        replicas = []
+        for fila in cursor:
+            resultados = {}
+            for nombre, valor in zip(nombres, fila):
+                if nombre in ('semilla', 'semilla_base', 'crn') or valor is None:
+                    continue
+                if nombre in INDICADORES_VECTORIALES:
+                    valor = np.frombuffer(valor, dtype=np.float64).tolist()
+                resultados[nombre] = valor
+            replicas.append(resultados)
+        return replicas
+    
+    def cerrar(self):
+        """Confirma las réplicas pendientes y cierra la base."""
+        self.confirmar()
+        self._conexion.close()
+    
+    def __enter__(self) -> 'AlmacenResultados':
+        return self
+    
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+def _serie(descripcion: Any) -> Tuple[int, int]:
+    """
+    Deduce la serie de semillas de una réplica.
+    
+    Args:
+        descripcion: Semilla descrita con describir_semilla
+    
+    Returns:
+        Tupla (semilla_base, crn): la entropía de la SeedSequence y 1 si su
+        spawn_key es solo el número de réplica (números aleatorios comunes) o
+        0 si incluye la configuración; un entero se toma como su propia base
+    """
+    if isinstance(descripcion, list):
+        entropia, spawn_key = descripcion[0], descripcion[1]
+        return int(entropia), int(len(spawn_key) <= 1)
+    return int(descripcion), 1
+
+
+def _columna(nombre: str) -> str:
+    """Nombre de columna entre comillas (los indicadores son identificadores válidos)."""
+    return '"' + nombre.replace('"', '""') + '"'
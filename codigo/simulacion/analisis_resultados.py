@@ -6,10 +6,13 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import json
 import glob
 
+from .almacen import AlmacenResultados
+from .metamodelo import Metamodelo, INDICADORES_METAMODELO
+
 
 class AnalizadorResultados:
     """
@@ -40,6 +43,51 @@ class AnalizadorResultados:
         df = pd.read_csv(archivo_csv)
         return df
     
+    def cargar_replicas(self, vectoriales: bool = False, semilla_base: Optional[int] = None,
+                        crn: Optional[bool] = None) -> pd.DataFrame:
+        """
+        Carga los resultados de todas las réplicas de una serie de semillas
+        desde el almacén de resultados (resultados.sqlite), en una sola consulta.
+        
+        Args:
+            vectoriales: Si incluir los indicadores por sala (ej. PTOSR) como arrays
+            semilla_base: Semilla base de las réplicas (None = la única guardada)
+            crn: Si las réplicas usan números aleatorios comunes (None = la
+                única serie guardada)
+        
+        Returns:
+            DataFrame con una fila por réplica
+        
+        Raises:
+            ValueError: Si el almacén tiene varias series de semillas y no se
+                indica cuál cargar
+        """
+        archivo = self.directorio_resultados / "resultados.sqlite"
+        
+        if not archivo.exists():
+            raise FileNotFoundError(f"No se encuentra el archivo: {archivo}")
+        
+        with AlmacenResultados(archivo) as almacen:
+            return almacen.cargar_tabla(vectoriales=vectoriales, semilla_base=semilla_base, crn=crn)
+    
+    def entrenar_metamodelo(self, indicadores: List[str] = INDICADORES_METAMODELO,
+                            semilla_base: Optional[int] = None, crn: Optional[bool] = None) -> Metamodelo:
+        """
+        Entrena un metamodelo (proceso gaussiano por indicador) con todas las
+        réplicas del almacén, para predecir configuraciones no simuladas.
+        
+        Args:
+            indicadores: Indicadores a modelar
+            semilla_base: Semilla base de las réplicas (None = la única guardada)
+            crn: Si las réplicas usan números aleatorios comunes (None = la
+                única serie guardada)
+        
+        Returns:
+            Metamodelo entrenado (ver Metamodelo.consultar y
+            Metamodelo.proximas_simulaciones)
+        """
+        return Metamodelo(self.cargar_replicas(semilla_base=semilla_base, crn=crn), indicadores)
+    
     def generar_graficos_comparativos(self, df: pd.DataFrame, output_dir: Path = None):
         """
         Genera gráficos comparativos de los resultados.
@@ -414,6 +462,12 @@ class AnalizadorResultados:
         # Ordenar por G, SR, I para mejor visualización
         df_ordenado = df.sort_values(['G', 'SR', 'I'])
         
+        # PTOSR por sala de todas las réplicas (una sola consulta al almacén)
+        try:
+            replicas = self.cargar_replicas(vectoriales=True)
+        except (FileNotFoundError, ValueError):
+            replicas = None
+        
         for idx, row in df_ordenado.iterrows():
             print(f"\n{'─'*100}")
             print(f"ESCENARIO: G={int(row['G'])}, SR={int(row['SR'])}, I={int(row['I'])}, SC={int(row['SC'])}")
@@ -436,34 +490,19 @@ class AnalizadorResultados:
             print(f"  IC 95%: [{ptosr_ic_inf:.2f}%, {ptosr_ic_sup:.2f}%]")
             
             # Intentar cargar PTOSR por sala desde las réplicas si están disponibles
-            nombre_escenario = f"G{int(row['G'])}_SR{int(row['SR'])}_I{int(row['I'])}_SC{int(row['SC'])}"
-            directorio_escenario = self.directorio_resultados / nombre_escenario
-            if directorio_escenario.exists():
-                try:
-                    # Cargar algunas réplicas para mostrar distribución por sala
-                    archivos_replicas = sorted(glob.glob(str(directorio_escenario / "replica_*.json")))[:5]  # Primeras 5 réplicas
-                    if archivos_replicas:
-                        ptosr_por_sala = []
-                        for archivo in archivos_replicas:
-                            with open(archivo, 'r', encoding='utf-8') as f:
-                                replica = json.load(f)
-                                if 'PTOSR' in replica and isinstance(replica['PTOSR'], list):
-                                    if len(ptosr_por_sala) == 0:
-                                        ptosr_por_sala = [[] for _ in range(len(replica['PTOSR']))]
-                                    for i, valor in enumerate(replica['PTOSR']):
-                                        if i < len(ptosr_por_sala):
-                                            ptosr_por_sala[i].append(valor)
-                        
-                        if ptosr_por_sala:
-                            print(f"  Distribución por sala (muestra de {len(archivos_replicas)} réplicas):")
-                            for i, valores_sala in enumerate(ptosr_por_sala[:10]):  # Mostrar primeras 10 salas
-                                if valores_sala:
-                                    promedio_sala = np.mean(valores_sala)
-                                    print(f"    Sala {i+1}: {promedio_sala:.2f}%")
-                            if len(ptosr_por_sala) > 10:
-                                print(f"    ... (y {len(ptosr_por_sala) - 10} salas más)")
-                except Exception:
-                    pass  # Si falla, solo mostrar el promedio
+            configuracion = (int(row['G']), int(row['SR']), int(row['I']), int(row['SC']))
+            try:
+                # Primeras 5 réplicas, para mostrar la distribución por sala
+                muestra = self._ptosr_por_replica(replicas, configuracion)[:5]
+                if muestra:
+                    ptosr_por_sala = np.mean(np.vstack(muestra), axis=0)
+                    print(f"  Distribución por sala (muestra de {len(muestra)} réplicas):")
+                    for i, promedio_sala in enumerate(ptosr_por_sala[:10]):  # Mostrar primeras 10 salas
+                        print(f"    Sala {i+1}: {promedio_sala:.2f}%")
+                    if len(ptosr_por_sala) > 10:
+                        print(f"    ... (y {len(ptosr_por_sala) - 10} salas más)")
+            except Exception:
+                pass  # Si falla, solo mostrar el promedio
             
             # PPDSR - Porcentaje de derivaciones por falta de salas
             ppdsr_media = row.get('PPDSR_media', 0)
@@ -491,6 +530,33 @@ class AnalizadorResultados:
         
         print(f"\n{'='*100}\n")
     
+    def _ptosr_por_replica(self, replicas: pd.DataFrame, configuracion: tuple) -> List[np.ndarray]:
+        """
+        Obtiene el PTOSR por sala de cada réplica de un escenario.
+        
+        Args:
+            replicas: DataFrame de cargar_replicas(vectoriales=True), o None para
+                leer los replica_XX.json de resultados anteriores al almacén
+            configuracion: Tupla (G, SR, I, SC)
+        
+        Returns:
+            Lista de arrays (uno por réplica, ordenados por número de réplica)
+        """
+        G, SR, I, SC = configuracion
+        if replicas is not None:
+            filas = replicas[(replicas['G'] == G) & (replicas['SR'] == SR) &
+                             (replicas['I'] == I) & (replicas['SC'] == SC)]
+            return [v for v in filas['PTOSR'] if v is not None and len(v) > 0]
+        
+        directorio_escenario = self.directorio_resultados / f"G{G}_SR{SR}_I{I}_SC{SC}"
+        vectores = []
+        for archivo in sorted(glob.glob(str(directorio_escenario / "replica_*.json"))):
+            with open(archivo, 'r', encoding='utf-8') as f:
+                replica = json.load(f)
+            if isinstance(replica.get('PTOSR'), list) and replica['PTOSR']:
+                vectores.append(np.array(replica['PTOSR'], dtype=float))
+        return vectores
+    
     def elegir_mejores_opciones(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
         Elige las mejores opciones basándose en los criterios especificados.
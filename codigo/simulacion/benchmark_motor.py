@@ -0,0 +1,214 @@
+"""
+Benchmark del Motor: Mide el rendimiento del simulador en eventos por segundo
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+import numpy as np
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from simulacion.simulador import Simulador
+from simulacion.simulador_vectorizado import SimuladorVectorizado
+from simulacion.generadores.variables_aleatorias import semilla_replica
+from simulacion.core.tef import crear_tef
+from simulacion.core.evento import Evento, LLEGADA, FIN_REPOSO, FIN_INCUBACION
+
+
+def medir_eventos_por_segundo(G: int = 3, SR: int = 24, I: int = 15, SC: int = 3,
+                              anios: float = 1.0, semilla: int = 42,
+                              repeticiones: int = 3, tipo_tef: str = 'heap') -> dict:
+    """
+    Mide la velocidad del motor ejecutando réplicas con un horizonte reducido.
+    
+    Args:
+        G, SR, I, SC: Configuración del escenario
+        anios: Horizonte de simulación en años
+        semilla: Semilla de la réplica
+        repeticiones: Cantidad de ejecuciones (se informa la más rápida)
+        tipo_tef: Implementación de la TEF ('heap' o 'calendario')
+    
+    Returns:
+        Diccionario con eventos procesados, tiempo y eventos por segundo
+    """
+    class SimuladorBenchmark(Simulador):
+        TIEMPO_SIMULACION = anios * 365 * 24 * 60
+    
+    mejor_tiempo = float('inf')
+    eventos = 0
+    for _ in range(repeticiones):
+        simulador = SimuladorBenchmark(G=G, SR=SR, I=I, SC=SC, semilla=semilla, tipo_tef=tipo_tef)
+        inicio = time.perf_counter()
+        resultados = simulador.ejecutar(mostrar_progreso=False)
+        transcurrido = time.perf_counter() - inicio
+        eventos = resultados['eventos_procesados']
+        mejor_tiempo = min(mejor_tiempo, transcurrido)
+    
+    return {
+        'eventos_procesados': eventos,
+        'tiempo_segundos': mejor_tiempo,
+        'eventos_por_segundo': eventos / mejor_tiempo
+    }
+
+
+def comparar_motor_vectorizado(G: int = 3, SR: int = 24, I: int = 15, SC: int = 3,
+                               anios: float = 1.0, replicas: int = 256,
+                               semilla: int = 42) -> dict:
+    """
+    Valida el motor vectorizado contra el de referencia y compara su velocidad.
+    
+    Ejecuta las mismas réplicas (semillas CRN 1..replicas) con
+    SimuladorVectorizado, en lockstep, y con Simulador, una por una. Cada
+    réplica debe dar exactamente los mismos indicadores y costos.
+    
+    Args:
+        G, SR, I, SC: Configuración del escenario
+        anios: Horizonte de simulación en años
+        replicas: Cantidad de réplicas
+        semilla: Semilla base del experimento
+    
+    Returns:
+        Diccionario con la máxima diferencia absoluta, los eventos procesados
+        y los eventos por segundo de cada motor
+    """
+    class SimuladorBenchmark(Simulador):
+        TIEMPO_SIMULACION = anios * 365 * 24 * 60
+    
+    class SimuladorVectorizadoBenchmark(SimuladorVectorizado):
+        TIEMPO_SIMULACION = anios * 365 * 24 * 60
+    
+    semillas = [semilla_replica(semilla, replica) for replica in range(1, replicas + 1)]
+    
+    inicio = time.perf_counter()
+    vectorizados = SimuladorVectorizadoBenchmark(G=G, SR=SR, I=I, SC=SC, semillas=semillas).ejecutar()
+    tiempo_vectorizado = time.perf_counter() - inicio
+    
+    inicio = time.perf_counter()
+    referencia = [SimuladorBenchmark(G=G, SR=SR, I=I, SC=SC, semilla=s).ejecutar() for s in semillas]
+    tiempo_referencia = time.perf_counter() - inicio
+    
+    diferencia = 0.0
+    for resultado_ref, resultado_vec in zip(referencia, vectorizados):
+        for clave, valor in resultado_ref.items():
+            diferencia = max(diferencia, float(np.max(np.abs(
+                np.asarray(valor, dtype=float) - np.asarray(resultado_vec[clave], dtype=float)
+            ), initial=0.0)))
+    
+    eventos = sum(r['eventos_procesados'] for r in referencia)
+    return {
+        'diferencia_maxima': diferencia,
+        'eventos_procesados': eventos,
+        'eventos_por_segundo_referencia': eventos / tiempo_referencia,
+        'eventos_por_segundo_vectorizado': eventos / tiempo_vectorizado
+    }
+
+
+def medir_tef(tipo_tef: str, poblacion: int, operaciones: int = 200000,
+              semilla: int = 42) -> float:
+    """
+    Mide una TEF con el modelo "hold": con una población constante de eventos
+    pendientes, extrae el próximo y programa uno nuevo, repetidamente.
+    
+    Las demoras siguen la mezcla del modelo: eventos cortos (arribos y
+    consultas, exponencial de media 20 min), fin de reposo (uniforme 24-36 h)
+    y fin de incubación (4 días), con proporciones similares a las de la
+    población de eventos de la simulación.
+    
+    Args:
+        tipo_tef: Implementación de la TEF ('heap' o 'calendario')
+        poblacion: Cantidad de eventos pendientes (aprox. SR + I + arribos)
+        operaciones: Cantidad de pares extraer/insertar a medir
+        semilla: Semilla para las demoras
+        
+    Returns:
+        Operaciones hold por segundo
+    """
+    rng = random.Random(semilla)
+    
+    def demora():
+        r = rng.random()
+        if r < 0.5:
+            return LLEGADA, rng.expovariate(1.0 / 20.0)
+        if r < 0.9:
+            return FIN_REPOSO, rng.uniform(24.0 * 60.0, 36.0 * 60.0)
+        return FIN_INCUBACION, 4.0 * 24.0 * 60.0
+    
+    tef = crear_tef(tipo_tef)
+    for _ in range(poblacion):
+        tipo, d = demora()
+        tef.insertar(Evento(tipo=tipo, tiempo=d))
+    
+    inicio = time.perf_counter()
+    for _ in range(operaciones):
+        evento = tef.extraer_proximo()
+        tipo, d = demora()
+        tef.insertar(Evento(tipo=tipo, tiempo=evento.tiempo + d))
+    return operaciones / (time.perf_counter() - inicio)
+
+
+def main():
+    """Ejecuta el benchmark del motor."""
+    parser = argparse.ArgumentParser(description="Benchmark del motor de simulación")
+    parser.add_argument("--G", type=int, default=3, help="Cantidad de médicos (default: 3)")
+    parser.add_argument("--SR", type=int, default=24, help="Salas de recuperación (default: 24)")
+    parser.add_argument("--I", type=int, default=15, help="Incubadoras (default: 15)")
+    parser.add_argument("--SC", type=int, default=3, help="Salas de consultorio (default: 3)")
+    parser.add_argument("--anios", type=float, default=1.0, help="Horizonte en años (default: 1)")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Repeticiones (default: 3)")
+    parser.add_argument("--tef", choices=['heap', 'calendario'], default='heap',
+                        help="Implementación de la TEF (default: heap)")
+    parser.add_argument("--hold", action="store_true",
+                        help="Comparar implementaciones de TEF con el modelo hold")
+    parser.add_argument("--vectorizado", type=int, metavar="R", default=None,
+                        help="Validar el motor vectorizado con R réplicas en lockstep y comparar su velocidad")
+    args = parser.parse_args()
+    
+    if args.vectorizado is not None:
+        print("\n" + "="*80)
+        print("MOTOR VECTORIZADO VS. MOTOR DE REFERENCIA")
+        print("="*80)
+        print(f"Escenario: G={args.G}, SR={args.SR}, I={args.I}, SC={args.SC}")
+        print(f"Horizonte: {args.anios} años - Réplicas: {args.vectorizado}")
+        comparacion = comparar_motor_vectorizado(args.G, args.SR, args.I, args.SC,
+                                                 anios=args.anios, replicas=args.vectorizado)
+        print(f"\nEventos procesados: {comparacion['eventos_procesados']:,}")
+        print(f"Diferencia máxima entre motores: {comparacion['diferencia_maxima']:.3g}")
+        print(f"Referencia (réplica por réplica): {comparacion['eventos_por_segundo_referencia']:,.0f} eventos/s")
+        print(f"Vectorizado (lockstep): {comparacion['eventos_por_segundo_vectorizado']:,.0f} eventos/s")
+        print("="*80 + "\n")
+        return
+    
+    if args.hold:
+        print("\n" + "="*80)
+        print("BENCHMARK DE LA TEF (MODELO HOLD)")
+        print("="*80)
+        print(f"{'Eventos pendientes':>20} {'heap (op/s)':>15} {'calendario (op/s)':>20}")
+        for poblacion in [50, 100, 500, 1000, 5000, 20000, 100000]:
+            heap = medir_tef('heap', poblacion)
+            calendario = medir_tef('calendario', poblacion)
+            print(f"{poblacion:>20,} {heap:>15,.0f} {calendario:>20,.0f}")
+        print("="*80 + "\n")
+        return
+    
+    print("\n" + "="*80)
+    print("BENCHMARK DEL MOTOR DE SIMULACIÓN")
+    print("="*80)
+    print(f"Escenario: G={args.G}, SR={args.SR}, I={args.I}, SC={args.SC}")
+    print(f"Horizonte: {args.anios} años - Repeticiones: {args.repeticiones} - TEF: {args.tef}")
+    
+    medicion = medir_eventos_por_segundo(args.G, args.SR, args.I, args.SC,
+                                         anios=args.anios, repeticiones=args.repeticiones,
+                                         tipo_tef=args.tef)
+    
+    print(f"\nEventos procesados: {medicion['eventos_procesados']:,}")
+    print(f"Tiempo (mejor de {args.repeticiones}): {medicion['tiempo_segundos']:.3f} s")
+    print(f"Eventos por segundo: {medicion['eventos_por_segundo']:,.0f}")
+    print("="*80 + "\n")
+
+
+if __name__ == "__main__":
+    main()
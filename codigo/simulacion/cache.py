@@ -0,0 +1,216 @@
+"""
+Caché de Resultados: Resultados de réplicas direccionados por contenido
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Any, Optional, Type
+import numpy as np
+
+from .simulador import Simulador
+from .generadores.variables_aleatorias import GeneradorVariablesAleatorias, Semilla
+
+
+# Fuentes del modelo (relativas al paquete): cualquier cambio en ellas cambia
+# la versión del código y, con ella, todas las claves de la caché
+FUENTES_MODELO = (
+    'core', 'eventos', 'recursos', 'generadores', 'indicadores',
+    'simulador.py', 'descomposicion.py'
+)
+
+_version_codigo: Optional[str] = None
+
+
+def version_codigo() -> str:
+    """
+    Calcula el hash del código fuente del modelo (ver FUENTES_MODELO).
+    
+    Se calcula una vez por proceso.
+    
+    Returns:
+        Hash SHA-256 (hexadecimal) de las rutas y contenidos de los archivos .py
+    """
+    global _version_codigo
+    if _version_codigo is None:
+        paquete = Path(__file__).parent
+        archivos = []
+        for fuente in FUENTES_MODELO:
+            ruta = paquete / fuente
+            archivos.extend(sorted(ruta.rglob('*.py')) if ruta.is_dir() else [ruta])
+        resumen = hashlib.sha256()
+        for archivo in archivos:
+            resumen.update(archivo.relative_to(paquete).as_posix().encode('utf-8'))
+            resumen.update(archivo.read_bytes())
+        _version_codigo = resumen.hexdigest()
+    return _version_codigo
+
+
+def parametros_generador() -> Dict[str, float]:
+    """
+    Obtiene los parámetros de las FDP del generador de variables aleatorias.
+    
+    Returns:
+        Diccionario {atributo: valor} con los parámetros numéricos
+    """
+    generador = GeneradorVariablesAleatorias(semilla=0)
+    return {
+        nombre: valor for nombre, valor in sorted(vars(generador).items())
+        if isinstance(valor, (int, float)) and not isinstance(valor, bool)
+    }
+
+
+def describir_semilla(semilla: Semilla) -> Any:
+    """
+    Representa una semilla de forma serializable y estable.
+    
+    Args:
+        semilla: Entero o SeedSequence
+    
+    Returns:
+        El entero, o [entropía, spawn_key, pool_size] de la SeedSequence
+    """
+    if isinstance(semilla, np.random.SeedSequence):
+        return [int(semilla.entropy), [int(k) for k in semilla.spawn_key], int(semilla.pool_size)]
+    return int(semilla)
+
+
+class CacheResultados:
+    """
+    Caché en disco de los resultados de réplicas individuales.
+    
+    Cada resultado se guarda bajo el hash de todo lo que lo determina:
+    configuración (G, SR, I, SC), semilla, horizonte, calentamiento, tamaño de
+    bloque, parámetros de las FDP y versión del código del modelo. Si algo de
+    eso cambia la clave cambia, por lo que no hace falta invalidar entradas:
+    las viejas simplemente dejan de consultarse.
+    """
+    
+    def __init__(self, directorio: str):
+        """
+        Inicializa la caché.
+        
+        Args:
+            directorio: Directorio donde guardar las entradas
+        """
+        self.directorio = Path(directorio)
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        self.aciertos = 0
+        self.fallos = 0
+    
+    def descriptor(
+        self,
+        G: int,
+        SR: int,
+        I: int,
+        SC: int,
+        semilla: Semilla,
+        simulador: Type[Simulador] = Simulador,
+        tiempo_simulacion: Optional[float] = None,
+        tiempo_calentamiento: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Reúne los datos que determinan el resultado de una réplica.
+        
+        Args:
+            G, SR, I, SC: Configuración del escenario
+            semilla: Semilla de la réplica
+            simulador: Clase de simulador (define horizonte, calentamiento y bloque)
+            tiempo_simulacion: Horizonte de la réplica (None = el de simulador)
+            tiempo_calentamiento: Calentamiento de la réplica (None = el de simulador)
+        
+        Returns:
+            Diccionario serializable
+        """
+        if tiempo_simulacion is None:
+            tiempo_simulacion = simulador.TIEMPO_SIMULACION
+        if tiempo_calentamiento is None:
+            tiempo_calentamiento = simulador.TIEMPO_CALENTAMIENTO
+        return {
+            'configuracion': [int(G), int(SR), int(I), int(SC)],
+            'semilla': describir_semilla(semilla),
+            'tiempo_simulacion': float(tiempo_simulacion),
+            'tiempo_calentamiento': float(tiempo_calentamiento),
+            'tamano_bloque': simulador.TAMANO_BLOQUE,
+            'parametros_generador': parametros_generador(),
+            'version_codigo': version_codigo()
+        }
+    
+    def clave(
+        self,
+        G: int,
+        SR: int,
+        I: int,
+        SC: int,
+        semilla: Optional[Semilla],
+        simulador: Type[Simulador] = Simulador,
+        tiempo_simulacion: Optional[float] = None,
+        tiempo_calentamiento: Optional[float] = None
+    ) -> Optional[str]:
+        """
+        Calcula la clave de una réplica.
+        
+        Args:
+            G, SR, I, SC: Configuración del escenario
+            semilla: Semilla de la réplica
+            simulador: Clase de simulador (define horizonte, calentamiento y bloque)
+            tiempo_simulacion: Horizonte de la réplica (None = el de simulador)
+            tiempo_calentamiento: Calentamiento de la réplica (None = el de simulador)
+        
+        Returns:
+            Hash SHA-256 (hexadecimal), o None si la semilla es None (réplica
+            no reproducible, no se cachea)
+        """
+        if semilla is None:
+            return None
+        descriptor = self.descriptor(G, SR, I, SC, semilla, simulador,
+                                     tiempo_simulacion, tiempo_calentamiento)
+        texto = json.dumps(descriptor, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+    
+    def _archivo(self, clave: str) -> Path:
+        """Ruta de la entrada de una clave (subdirectorio por prefijo)."""
+        return self.directorio / clave[:2] / f"{clave}.json"
+    
+    def obtener(self, clave: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Busca el resultado de una réplica.
+        
+        Args:
+            clave: Clave de la réplica (None = no cacheable)
+        
+        Returns:
+            Diccionario de resultados, o None si no está en la caché
+        """
+        if clave is None:
+            return None
+        archivo = self._archivo(clave)
+        try:
+            with open(archivo, 'r', encoding='utf-8') as f:
+                resultados = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.fallos += 1
+            return None
+        self.aciertos += 1
+        return resultados
+    
+    def guardar(self, clave: Optional[str], resultados: Dict[str, Any]):
+        """
+        Guarda el resultado de una réplica.
+        
+        La escritura es atómica (archivo temporal + reemplazo): una ejecución
+        interrumpida nunca deja una entrada a medio escribir.
+        
+        Args:
+            clave: Clave de la réplica (None = no cacheable, no se guarda)
+            resultados: Diccionario de resultados
+        """
+        if clave is None:
+            return
+        archivo = self._archivo(clave)
+        archivo.parent.mkdir(parents=True, exist_ok=True)
+        temporal = archivo.with_name(f"{archivo.name}.{os.getpid()}.tmp")
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, ensure_ascii=False, default=float)
+        os.replace(temporal, archivo)
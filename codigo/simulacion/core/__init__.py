@@ -2,10 +2,27 @@
 Módulo core: Clases base del sistema de simulación
 """
 
-from .evento import Evento
+from .evento import (
+    Evento,
+    LLEGADA,
+    INICIO_CONSULTA,
+    FIN_CONSULTA,
+    INICIO_PARTO,
+    FIN_PARTO,
+    FIN_REPOSO,
+    FIN_INCUBACION,
+    NOMBRES_EVENTOS
+)
 from .paciente import Paciente
+from .pool import PoolRecursos
+from .acumulador import AcumuladorTiempo
 from .estado import EstadoSistema
-from .tef import TablaEventosFuturos
+from .tef import TablaEventosFuturos, ColaCalendario, crear_tef
 
-__all__ = ['Evento', 'Paciente', 'EstadoSistema', 'TablaEventosFuturos']
+__all__ = [
+    'Evento', 'Paciente', 'EstadoSistema', 'PoolRecursos', 'AcumuladorTiempo',
+    'TablaEventosFuturos', 'ColaCalendario', 'crear_tef',
+    'LLEGADA', 'INICIO_CONSULTA', 'FIN_CONSULTA', 'INICIO_PARTO',
+    'FIN_PARTO', 'FIN_REPOSO', 'FIN_INCUBACION', 'NOMBRES_EVENTOS'
+]
 
@@ -0,0 +1,83 @@
+"""
+Acumulador Temporal: Integral en el tiempo de una magnitud escalonada
+"""
+
+
+class AcumuladorTiempo:
+    """
+    Acumula el área bajo la curva de una magnitud constante a tramos
+    (ej. largo de una cola), actualizándose solo cuando la magnitud cambia.
+    
+    Con el valor vigente y el instante del último cambio, la integral hasta
+    cualquier tiempo t es area + valor * (t - ultimo_cambio), por lo que no
+    hace falta muestrear el estado en cada evento.
+    """
+    
+    __slots__ = ('valor', 'area', '_ultimo_cambio', '_inicio')
+    
+    def __init__(self, tiempo_inicial: float = 0.0, valor: float = 0.0):
+        """
+        Inicializa el acumulador.
+        
+        Args:
+            tiempo_inicial: Inicio de la ventana de acumulación
+            valor: Valor inicial de la magnitud
+        """
+        self.valor = valor
+        self.area = 0.0
+        self._ultimo_cambio = tiempo_inicial
+        self._inicio = tiempo_inicial
+    
+    def actualizar(self, tiempo: float, valor: float):
+        """
+        Registra un cambio de la magnitud.
+        
+        Args:
+            tiempo: Instante del cambio
+            valor: Nuevo valor de la magnitud
+        """
+        self.area += self.valor * (tiempo - self._ultimo_cambio)
+        self.valor = valor
+        self._ultimo_cambio = tiempo
+    
+    def integral(self, tiempo: float) -> float:
+        """
+        Retorna la integral de la magnitud desde el inicio de la ventana.
+        
+        Args:
+            tiempo: Fin del intervalo de integración
+        
+        Returns:
+            Área bajo la curva
+        """
+        return self.area + self.valor * (tiempo - self._ultimo_cambio)
+    
+    def promedio(self, tiempo: float) -> float:
+        """
+        Retorna el promedio temporal de la magnitud desde el inicio de la ventana.
+        
+        Args:
+            tiempo: Fin del intervalo
+        
+        Returns:
+            Valor promedio ponderado por tiempo (0 si el intervalo es vacío)
+        """
+        duracion = tiempo - self._inicio
+        if duracion <= 0:
+            return 0.0
+        return self.integral(tiempo) / duracion
+    
+    def reiniciar(self, tiempo: float):
+        """
+        Descarta el área acumulada y comienza una nueva ventana en tiempo,
+        conservando el valor vigente (ej. al finalizar el calentamiento).
+        
+        Args:
+            tiempo: Inicio de la nueva ventana
+        """
+        self.area = 0.0
+        self._ultimo_cambio = tiempo
+        self._inicio = tiempo
+    
+    def __repr__(self):
+        return f"AcumuladorTiempo(valor={self.valor}, area={self.area:.2f})"
@@ -3,8 +3,10 @@ Clase EstadoSistema: Maneja el estado dinámico del sistema
 """
 
 from collections import deque
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import numpy as np
+from .pool import PoolRecursos
+from .acumulador import AcumuladorTiempo
 
 
 class EstadoSistema:
@@ -35,14 +37,11 @@ class EstadoSistema:
         # Recursos disponibles
         self.medicos_disponibles = G
         self.quirofano_disponible = True
-        self.consultorios_disponibles = SC
-        self.salas_recuperacion_libres = SR
-        self.incubadoras_libres = I
         
-        # Recursos ocupados
-        self.consultorios_ocupados = 0
-        self.salas_recuperacion_ocupadas = 0
-        self.incubadoras_ocupadas = 0
+        # Recursos individualizados: se asigna siempre la unidad libre de menor índice
+        self.consultorios = PoolRecursos(SC)
+        self.salas_recuperacion = PoolRecursos(SR)
+        self.incubadoras = PoolRecursos(I)
         
         # Reloj de simulación
         self.tiempo_actual = 0.0
@@ -65,64 +64,72 @@ class EstadoSistema:
         # Acumuladores de ocupación
         self.tiempo_ocupacion_medicos = 0.0
         self.tiempo_ocupacion_quirofano = 0.0
-        self.tiempo_ocupacion_consultorios = np.zeros(SC)  # Por consultorio
-        self.tiempo_ocupacion_sr = np.zeros(SR)  # Por sala
-        self.tiempo_inactividad_sr = np.zeros(SR)  # Por sala
-        self.tiempo_ocupacion_inc = np.zeros(I)  # Por incubadora
+        
+        # Tiempos de fin de parto, solo en modo descompuesto (None = modo completo)
+        self.registro_partos: Optional[List[float]] = None
+        
+        # Largo de cada cola integrado en el tiempo
+        self.largo_cola_consultas = AcumuladorTiempo()
+        self.largo_cola_partos_naturales = AcumuladorTiempo()
+        self.largo_cola_partos_cesarea = AcumuladorTiempo()
 
-        # Tiempo de última actualización de inactividad
-        self.tiempo_ultima_actualizacion_consultorios = np.zeros(SC)
-        self.tiempo_ultima_actualizacion_sr = np.zeros(SR)
-        self.tiempo_ultima_actualizacion_inc = np.zeros(I)
-        
-        # Inicializar tiempos de última actualización
-        for i in range(SC):
-            self.tiempo_ultima_actualizacion_consultorios[i] = 0.0
-        for i in range(SR):
-            self.tiempo_ultima_actualizacion_sr[i] = 0.0
-        for i in range(I):
-            self.tiempo_ultima_actualizacion_inc[i] = 0.0
+    @property
+    def consultorios_disponibles(self) -> int:
+        """Cantidad de consultorios libres."""
+        return self.consultorios.disponibles
+    
+    @property
+    def consultorios_ocupados(self) -> int:
+        """Cantidad de consultorios ocupados."""
+        return self.consultorios.ocupados
+    
+    @property
+    def salas_recuperacion_libres(self) -> int:
+        """Cantidad de salas de recuperación libres."""
+        return self.salas_recuperacion.disponibles
+    
+    @property
+    def salas_recuperacion_ocupadas(self) -> int:
+        """Cantidad de salas de recuperación ocupadas."""
+        return self.salas_recuperacion.ocupados
+    
+    @property
+    def incubadoras_libres(self) -> int:
+        """Cantidad de incubadoras libres."""
+        return self.incubadoras.disponibles
+    
+    @property
+    def incubadoras_ocupadas(self) -> int:
+        """Cantidad de incubadoras ocupadas."""
+        return self.incubadoras.ocupados
+    
+    @property
+    def tiempo_ocupacion_consultorios(self) -> np.ndarray:
+        """Tiempo ocupado por consultorio hasta el tiempo actual (en minutos)."""
+        return self.consultorios.ocupacion_por_unidad(self.tiempo_actual)
+    
+    @property
+    def tiempo_ocupacion_sr(self) -> np.ndarray:
+        """Tiempo ocupado por sala de recuperación hasta el tiempo actual (en minutos)."""
+        return self.salas_recuperacion.ocupacion_por_unidad(self.tiempo_actual)
+    
+    @property
+    def tiempo_inactividad_sr(self) -> np.ndarray:
+        """Tiempo libre por sala de recuperación hasta el tiempo actual (en minutos)."""
+        return self.salas_recuperacion.inactividad_por_unidad(self.tiempo_actual)
+    
+    @property
+    def tiempo_ocupacion_inc(self) -> np.ndarray:
+        """Tiempo ocupado por incubadora hasta el tiempo actual (en minutos)."""
+        return self.incubadoras.ocupacion_por_unidad(self.tiempo_actual)
 
     def asignar_consultorio(self) -> int:
         """Asigna un consultorio disponible."""
-        if self.consultorios_disponibles > 0:
-            for i in range(self.SC):
-                if self.tiempo_ocupacion_consultorios[i] == 0 or \
-                   (self.tiempo_actual - self.tiempo_ultima_actualizacion_consultorios[i]) >= 0:
-                    self.consultorios_disponibles -= 1
-                    self.consultorios_ocupados += 1
-                    self.tiempo_ultima_actualizacion_consultorios[i] = self.tiempo_actual
-                    return i
-        return -1
+        return self.consultorios.asignar(self.tiempo_actual)
 
-    def liberar_consultorio(self, consultorio_id: int, tiempo_ocupacion: float):
-        """Libera un consultorio y acumula su tiempo de uso."""
-        if consultorio_id < 0 or consultorio_id >= self.SC:
-            return
-        self.tiempo_ocupacion_consultorios[consultorio_id] += tiempo_ocupacion
-        self.consultorios_disponibles += 1
-        self.consultorios_ocupados -= 1
-        self.tiempo_ultima_actualizacion_consultorios[consultorio_id] = self.tiempo_actual
-    
-    def actualizar_inactividad_sr(self, sala_id: int):
-        """
-        Actualiza el tiempo de inactividad de una sala de recuperación.
-        
-        Args:
-            sala_id: ID de la sala
-        """
-        if sala_id < 0 or sala_id >= self.SR:
-            return
-        
-        tiempo_transcurrido = self.tiempo_actual - self.tiempo_ultima_actualizacion_sr[sala_id]
-        if tiempo_transcurrido > 0:
-            # Si la sala está libre, acumular inactividad
-            if self.salas_recuperacion_ocupadas < self.SR:
-                # Verificar si esta sala específica está libre
-                # (simplificado: asumimos que si hay salas libres, esta podría estar libre)
-                self.tiempo_inactividad_sr[sala_id] += tiempo_transcurrido
-        
-        self.tiempo_ultima_actualizacion_sr[sala_id] = self.tiempo_actual
+    def liberar_consultorio(self, consultorio_id: int):
+        """Libera un consultorio (su tiempo de uso se acumula en el pool)."""
+        self.consultorios.liberar(consultorio_id, self.tiempo_actual)
     
     def asignar_sala_recuperacion(self) -> int:
         """
@@ -131,34 +138,16 @@ class EstadoSistema:
         Returns:
             ID de la sala asignada, o -1 si no hay salas disponibles
         """
-        if self.salas_recuperacion_libres > 0:
-            # Encontrar primera sala libre
-            for i in range(self.SR):
-                if self.tiempo_ocupacion_sr[i] == 0 or \
-                   (self.tiempo_actual - self.tiempo_ultima_actualizacion_sr[i]) > 0:
-                    # Actualizar inactividad antes de asignar
-                    self.actualizar_inactividad_sr(i)
-                    self.salas_recuperacion_libres -= 1
-                    self.salas_recuperacion_ocupadas += 1
-                    return i
-        return -1
-    
-    def liberar_sala_recuperacion(self, sala_id: int, tiempo_ocupacion: float):
+        return self.salas_recuperacion.asignar(self.tiempo_actual)
+    
+    def liberar_sala_recuperacion(self, sala_id: int):
         """
         Libera una sala de recuperación.
         
         Args:
             sala_id: ID de la sala a liberar
-            tiempo_ocupacion: Tiempo que estuvo ocupada (en minutos)
         """
-        if sala_id < 0 or sala_id >= self.SR:
-            return
-        
-        self.actualizar_inactividad_sr(sala_id)
-        self.tiempo_ocupacion_sr[sala_id] += tiempo_ocupacion
-        self.salas_recuperacion_libres += 1
-        self.salas_recuperacion_ocupadas -= 1
-        self.tiempo_ultima_actualizacion_sr[sala_id] = self.tiempo_actual
+        self.salas_recuperacion.liberar(sala_id, self.tiempo_actual)
     
     def asignar_incubadora(self) -> int:
         """
@@ -167,30 +156,31 @@ class EstadoSistema:
         Returns:
             ID de la incubadora asignada, o -1 si no hay incubadoras disponibles
         """
-        if self.incubadoras_libres > 0:
-            for i in range(self.I):
-                if self.tiempo_ocupacion_inc[i] == 0 or \
-                   (self.tiempo_actual - self.tiempo_ultima_actualizacion_inc[i]) > 0:
-                    self.incubadoras_libres -= 1
-                    self.incubadoras_ocupadas += 1
-                    return i
-        return -1
-    
-    def liberar_incubadora(self, inc_id: int, tiempo_ocupacion: float):
+        return self.incubadoras.asignar(self.tiempo_actual)
+    
+    def liberar_incubadora(self, inc_id: int):
         """
         Libera una incubadora.
         
         Args:
             inc_id: ID de la incubadora a liberar
-            tiempo_ocupacion: Tiempo que estuvo ocupada (en minutos)
         """
-        if inc_id < 0 or inc_id >= self.I:
-            return
+        self.incubadoras.liberar(inc_id, self.tiempo_actual)
+    
+    def reiniciar_acumuladores_tiempo(self, tiempo: float):
+        """
+        Descarta las integrales de ocupación y de largo de cola acumuladas y
+        comienza una nueva ventana en tiempo (fin del calentamiento).
         
-        self.tiempo_ocupacion_inc[inc_id] += tiempo_ocupacion
-        self.incubadoras_libres += 1
-        self.incubadoras_ocupadas -= 1
-        self.tiempo_ultima_actualizacion_inc[inc_id] = self.tiempo_actual
+        Args:
+            tiempo: Inicio de la nueva ventana
+        """
+        self.consultorios.reiniciar_acumuladores(tiempo)
+        self.salas_recuperacion.reiniciar_acumuladores(tiempo)
+        self.incubadoras.reiniciar_acumuladores(tiempo)
+        self.largo_cola_consultas.reiniciar(tiempo)
+        self.largo_cola_partos_naturales.reiniciar(tiempo)
+        self.largo_cola_partos_cesarea.reiniciar(tiempo)
     
     def obtener_resumen(self) -> Dict[str, Any]:
         """
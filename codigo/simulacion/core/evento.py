@@ -2,26 +2,64 @@
 Clase Evento: Representa un evento en la simulación
 """
 
-from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from typing import Optional
+
+
+# Códigos de tipo de evento: enteros consecutivos que indexan la tabla de
+# despacho del simulador (ver Simulador._construir_tabla_rutinas)
+LLEGADA = 0
+INICIO_CONSULTA = 1
+FIN_CONSULTA = 2
+INICIO_PARTO = 3
+FIN_PARTO = 4
+FIN_REPOSO = 5
+FIN_INCUBACION = 6
+
+# Nombre legible de cada código (NOMBRES_EVENTOS[codigo])
+NOMBRES_EVENTOS = (
+    'llegada',
+    'inicio_consulta',
+    'fin_consulta',
+    'inicio_parto',
+    'fin_parto',
+    'fin_reposo',
+    'fin_incubacion'
+)
 
 
-@dataclass
 class Evento:
     """
     Representa un evento en la simulación de eventos discretos.
     
+    Usa __slots__ y campos tipados en lugar de un diccionario de datos extra:
+    cada réplica crea cientos de miles de eventos, y así se evita una
+    asignación de diccionario por evento.
+    
     Atributos:
-        tipo: Tipo de evento ('llegada', 'fin_consulta', 'inicio_parto', 
-              'fin_parto', 'fin_reposo', 'fin_incubacion')
+        tipo: Código del tipo de evento (LLEGADA, INICIO_CONSULTA, FIN_CONSULTA,
+              INICIO_PARTO, FIN_PARTO, FIN_REPOSO, FIN_INCUBACION)
         tiempo: Tiempo programado del evento (en minutos)
-        paciente_id: ID del paciente asociado (opcional)
-        datos_extra: Información adicional del evento
+        paciente: Paciente asociado (opcional)
+        recurso_id: ID del recurso asignado según el tipo de evento
+                    (consultorio, sala de recuperación o incubadora; -1 si no aplica)
+        duracion: Duración de la actividad que finaliza con el evento
+                  (TAC, TAP, TREP o TINC, en minutos)
     """
-    tipo: str
-    tiempo: float
-    paciente_id: Optional[int] = None
-    datos_extra: Optional[Dict[str, Any]] = None
+    
+    __slots__ = ('tipo', 'tiempo', 'paciente', 'recurso_id', 'duracion')
+    
+    def __init__(self, tipo: int, tiempo: float, paciente=None,
+                 recurso_id: int = -1, duracion: float = 0.0):
+        self.tipo = tipo
+        self.tiempo = tiempo
+        self.paciente = paciente
+        self.recurso_id = recurso_id
+        self.duracion = duracion
+    
+    @property
+    def paciente_id(self) -> Optional[int]:
+        """ID del paciente asociado (None si el evento no tiene paciente)."""
+        return self.paciente.id if self.paciente is not None else None
     
     def __lt__(self, other):
         """Permite ordenar eventos por tiempo (para cola de prioridad)"""
@@ -36,5 +74,4 @@ class Evento:
                 self.paciente_id == other.paciente_id)
     
     def __repr__(self):
-        return f"Evento(tipo='{self.tipo}', tiempo={self.tiempo:.2f}, paciente_id={self.paciente_id})"
-
+        return f"Evento(tipo='{NOMBRES_EVENTOS[self.tipo]}', tiempo={self.tiempo:.2f}, paciente_id={self.paciente_id})"
@@ -2,15 +2,16 @@
 Clase Paciente: Representa un paciente en el sistema
 """
 
-from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
 class Paciente:
     """
     Representa un paciente en el sistema de simulación.
     
+    Usa __slots__ para reducir memoria y presión sobre el recolector de basura
+    en corridas largas.
+    
     Atributos:
         id: Identificador único del paciente
         tipo: Tipo de atención ('consulta', 'parto_natural', 'parto_cesarea')
@@ -19,15 +20,29 @@ class Paciente:
         requiere_incubadora: Si el neonato requiere incubadora (solo para partos)
         sala_recuperacion_asignada: ID de la sala de recuperación asignada (si aplica)
         incubadora_asignada: ID de la incubadora asignada (si aplica)
+        consultorio_asignado: ID del consultorio asignado (si aplica)
     """
-    id: int
-    tipo: str
-    tiempo_llegada: float
-    tiempo_inicio_atencion: Optional[float] = None
-    requiere_incubadora: bool = False
-    sala_recuperacion_asignada: Optional[int] = None
-    incubadora_asignada: Optional[int] = None
-    consultorio_asignado: Optional[int] = None
+    
+    __slots__ = (
+        'id', 'tipo', 'tiempo_llegada', 'tiempo_inicio_atencion',
+        'requiere_incubadora', 'sala_recuperacion_asignada',
+        'incubadora_asignada', 'consultorio_asignado'
+    )
+    
+    def __init__(self, id: int, tipo: str, tiempo_llegada: float,
+                 tiempo_inicio_atencion: Optional[float] = None,
+                 requiere_incubadora: bool = False,
+                 sala_recuperacion_asignada: Optional[int] = None,
+                 incubadora_asignada: Optional[int] = None,
+                 consultorio_asignado: Optional[int] = None):
+        self.id = id
+        self.tipo = tipo
+        self.tiempo_llegada = tiempo_llegada
+        self.tiempo_inicio_atencion = tiempo_inicio_atencion
+        self.requiere_incubadora = requiere_incubadora
+        self.sala_recuperacion_asignada = sala_recuperacion_asignada
+        self.incubadora_asignada = incubadora_asignada
+        self.consultorio_asignado = consultorio_asignado
     
     def calcular_tiempo_espera(self, tiempo_actual: float) -> float:
         """
@@ -47,6 +62,13 @@ class Paciente:
         """Verifica si el paciente es un parto (natural o cesárea)"""
         return self.tipo in ['parto_natural', 'parto_cesarea']
     
+    def __eq__(self, other):
+        """Comparación de igualdad por valor de todos los campos"""
+        if not isinstance(other, Paciente):
+            return NotImplemented
+        return all(getattr(self, campo) == getattr(other, campo) for campo in self.__slots__)
+    
+    __hash__ = None
+    
     def __repr__(self):
         return f"Paciente(id={self.id}, tipo='{self.tipo}', llegada={self.tiempo_llegada:.2f})"
-
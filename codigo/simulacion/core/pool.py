@@ -0,0 +1,214 @@
+"""
+Pool de Recursos: Conjunto de unidades idénticas con lista de libres
+"""
+
+import heapq
+from typing import List, Sequence
+import numpy as np
+
+
+class PoolRecursos:
+    """
+    Administra un conjunto de unidades idénticas (consultorios, salas de
+    recuperación, incubadoras) identificadas por un índice 0..capacidad-1.
+    
+    Mantiene una marca de ocupación por unidad y la lista de unidades libres,
+    por lo que asignar y liberar no recorren todas las unidades:
+    - ordenado=True: la lista de libres es un min-heap y se asigna siempre la
+      unidad libre de menor índice ("primera libre"), en O(log capacidad).
+    - ordenado=False: la lista de libres es una pila (LIFO) y se asigna la
+      última unidad liberada, en O(1).
+    
+    Además integra el tiempo ocupado de cada unidad: al asignar se registra el
+    inicio del período ocupado y al liberar se acumula su duración, de modo que
+    las integrales de ocupación e inactividad son exactas y se actualizan solo
+    en los cambios de estado.
+    """
+    
+    __slots__ = ('capacidad', 'ordenado', 'ocupado', 'tiempo_ocupado', 'inicio_ventana',
+                 '_libres', '_inicio_ocupacion')
+    
+    def __init__(self, capacidad: int, ordenado: bool = True):
+        """
+        Inicializa el pool con todas las unidades libres.
+        
+        Args:
+            capacidad: Cantidad de unidades
+            ordenado: Si True, asignar siempre la unidad libre de menor índice
+        """
+        if capacidad < 0:
+            raise ValueError("La capacidad del pool no puede ser negativa")
+        self.capacidad = capacidad
+        self.ordenado = ordenado
+        self.reiniciar()
+    
+    @classmethod
+    def desde_acumuladores(
+        cls,
+        ocupado: Sequence[bool],
+        tiempo_ocupado: Sequence[float],
+        inicio_ocupacion: Sequence[float],
+        inicio_ventana: float
+    ) -> 'PoolRecursos':
+        """
+        Reconstruye un pool ordenado a partir de su estado y acumuladores
+        (ej. calculados fuera de una simulación, ver descomposicion.py).
+        
+        Args:
+            ocupado: Marca de ocupación por unidad
+            tiempo_ocupado: Tiempo ocupado ya cerrado por unidad
+            inicio_ocupacion: Inicio del período ocupado en curso por unidad
+            inicio_ventana: Inicio de la ventana de acumulación
+            
+        Returns:
+            PoolRecursos con ese estado
+        """
+        pool = cls(len(ocupado))
+        pool.ocupado = list(ocupado)
+        pool._libres = [unidad for unidad, esta in enumerate(pool.ocupado) if not esta]
+        pool.tiempo_ocupado = list(tiempo_ocupado)
+        pool._inicio_ocupacion = list(inicio_ocupacion)
+        pool.inicio_ventana = inicio_ventana
+        return pool
+    
+    @property
+    def disponibles(self) -> int:
+        """Cantidad de unidades libres."""
+        return len(self._libres)
+    
+    @property
+    def ocupados(self) -> int:
+        """Cantidad de unidades ocupadas."""
+        return self.capacidad - len(self._libres)
+    
+    def asignar(self, tiempo: float) -> int:
+        """
+        Asigna una unidad libre y la marca como ocupada.
+        
+        Args:
+            tiempo: Instante de la asignación
+        
+        Returns:
+            Índice de la unidad asignada, o -1 si no hay unidades libres
+        """
+        libres = self._libres
+        if not libres:
+            return -1
+        if self.ordenado:
+            unidad = heapq.heappop(libres)
+        else:
+            unidad = libres.pop()
+        self.ocupado[unidad] = True
+        self._inicio_ocupacion[unidad] = tiempo
+        return unidad
+    
+    def liberar(self, unidad: int, tiempo: float) -> bool:
+        """
+        Libera una unidad ocupada y acumula la duración del período ocupado.
+        
+        Args:
+            unidad: Índice de la unidad a liberar
+            tiempo: Instante de la liberación
+        
+        Returns:
+            True si se liberó, False si el índice es inválido o la unidad ya estaba libre
+        """
+        if unidad < 0 or unidad >= self.capacidad or not self.ocupado[unidad]:
+            return False
+        self.ocupado[unidad] = False
+        self.tiempo_ocupado[unidad] += tiempo - self._inicio_ocupacion[unidad]
+        if self.ordenado:
+            heapq.heappush(self._libres, unidad)
+        else:
+            self._libres.append(unidad)
+        return True
+    
+    def esta_ocupado(self, unidad: int) -> bool:
+        """
+        Indica si una unidad está ocupada.
+        
+        Args:
+            unidad: Índice de la unidad
+        
+        Returns:
+            True si está ocupada
+        """
+        return self.ocupado[unidad]
+    
+    def unidades_libres(self) -> List[int]:
+        """
+        Retorna los índices de las unidades libres, en orden creciente.
+        
+        Returns:
+            Lista de índices
+        """
+        return sorted(self._libres)
+    
+    def ocupacion_por_unidad(self, tiempo: float) -> np.ndarray:
+        """
+        Retorna el tiempo ocupado de cada unidad desde el inicio de la ventana,
+        incluyendo los períodos aún en curso hasta tiempo.
+        
+        Args:
+            tiempo: Fin del intervalo
+            
+        Returns:
+            Array con el tiempo ocupado por unidad (en minutos)
+        """
+        ocupado = np.array(self.ocupado, dtype=bool)
+        en_curso = tiempo - np.array(self._inicio_ocupacion, dtype=float)
+        return np.array(self.tiempo_ocupado, dtype=float) + np.where(ocupado, en_curso, 0.0)
+    
+    def inactividad_por_unidad(self, tiempo: float) -> np.ndarray:
+        """
+        Retorna el tiempo libre de cada unidad desde el inicio de la ventana.
+        
+        Args:
+            tiempo: Fin del intervalo
+            
+        Returns:
+            Array con el tiempo libre por unidad (en minutos)
+        """
+        return (tiempo - self.inicio_ventana) - self.ocupacion_por_unidad(tiempo)
+    
+    def utilizacion(self, tiempo: float) -> float:
+        """
+        Retorna la fracción de tiempo ocupado del conjunto de unidades.
+        
+        Args:
+            tiempo: Fin del intervalo
+            
+        Returns:
+            Utilización agregada (fracción 0-1)
+        """
+        duracion = (tiempo - self.inicio_ventana) * self.capacidad
+        if duracion <= 0:
+            return 0.0
+        return float(np.sum(self.ocupacion_por_unidad(tiempo))) / duracion
+    
+    def reiniciar_acumuladores(self, tiempo: float):
+        """
+        Descarta el tiempo ocupado acumulado y comienza una nueva ventana en
+        tiempo (ej. al finalizar el calentamiento). Los períodos en curso se
+        cuentan desde tiempo.
+        
+        Args:
+            tiempo: Inicio de la nueva ventana
+        """
+        self.inicio_ventana = tiempo
+        self.tiempo_ocupado = [0.0] * self.capacidad
+        self._inicio_ocupacion = [tiempo if ocupado else 0.0 for ocupado in self.ocupado]
+    
+    def reiniciar(self):
+        """Libera todas las unidades y reinicia los acumuladores."""
+        self.ocupado: List[bool] = [False] * self.capacidad
+        if self.ordenado:
+            # Lista creciente: ya cumple la propiedad de heap
+            self._libres = list(range(self.capacidad))
+        else:
+            # Pila invertida: la primera asignación devuelve la unidad 0
+            self._libres = list(range(self.capacidad - 1, -1, -1))
+        self.reiniciar_acumuladores(0.0)
+    
+    def __repr__(self):
+        return f"PoolRecursos(capacidad={self.capacidad}, ocupados={self.ocupados})"
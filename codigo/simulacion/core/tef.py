@@ -3,20 +3,56 @@ Tabla de Eventos Futuros (TEF): Cola de prioridad para eventos
 """
 
 import heapq
-from typing import List, Optional
+from bisect import insort
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
 from .evento import Evento
 
 
+# Entrada almacenada en la TEF: (tiempo, contador de desempate, evento).
+# Las cabezas de las colas monótonas llevan la cola como cuarto elemento.
+Entrada = Tuple[float, int, Evento]
+
+
 class TablaEventosFuturos:
     """
     Implementa la Tabla de Eventos Futuros como una cola de prioridad.
     Los eventos se ordenan por tiempo (el más próximo primero).
+    
+    La implementación base usa un heap binario. El almacenamiento de las
+    entradas está encapsulado en los métodos _insertar_entrada,
+    _extraer_entrada, _ver_entrada, _cantidad_entradas y _limpiar_entradas,
+    que las subclases redefinen para usar otras estructuras (ver ColaCalendario).
+    
+    Los eventos programados para el instante actual (demora cero, como los
+    inicios de consulta y de parto) no pasan por esa estructura: se guardan en
+    un carril de inmediatos (FIFO) que se atiende antes de avanzar el reloj.
+    El orden resultante es idéntico al del heap con contador de desempate.
+    
+    Además, los tipos de evento con demora constante (ej. fin de incubación,
+    4 días) se insertan en orden de tiempo no decreciente: para cada tipo
+    declarado en tipos_monotonos se usa una cola FIFO propia y solo su cabeza
+    se guarda en el almacenamiento general (marcada con la cola como cuarto
+    elemento). Al extraerla se promueve la siguiente de la cola, de modo que
+    el heap contiene una sola entrada por tipo monótono. Si un evento rompiera
+    la monotonía de su cola, se inserta en el almacenamiento general, por lo
+    que el orden sigue siendo correcto.
     """
     
-    def __init__(self):
-        """Inicializa la TEF vacía."""
-        self.eventos: List[Evento] = []
+    def __init__(self, tipos_monotonos: Iterable[int] = ()):
+        """
+        Inicializa la TEF vacía.
+        
+        Args:
+            tipos_monotonos: Tipos de evento que se programan con demora
+                constante (se insertan en orden de tiempo no decreciente)
+        """
         self.contador_tiebreak = 0  # Para desempatar eventos con mismo tiempo
+        self._inmediatos = deque()  # Carril de eventos de demora cero
+        self._tiempo_actual = 0.0  # Tiempo del último evento extraído
+        self._monotonas: Dict[int, Deque[Entrada]] = {tipo: deque() for tipo in tipos_monotonos}
+        self._pendientes_monotonos = 0  # Entradas en colas monótonas fuera del almacenamiento
+        self._limpiar_entradas()
     
     def insertar(self, evento: Evento):
         """
@@ -26,8 +62,25 @@ class TablaEventosFuturos:
             evento: Evento a insertar
         """
         # Usar contador como tiebreak para mantener orden estable
-        heapq.heappush(self.eventos, (evento.tiempo, self.contador_tiebreak, evento))
+        entrada = (evento.tiempo, self.contador_tiebreak, evento)
         self.contador_tiebreak += 1
+        if evento.tiempo == self._tiempo_actual:
+            # Demora cero: los inmediatos llegan en orden de contador
+            self._inmediatos.append(entrada)
+            return
+        if self._monotonas:
+            cola = self._monotonas.get(evento.tipo)
+            if cola is not None:
+                if not cola:
+                    # La cola estaba vacía: la entrada pasa a ser su cabeza
+                    cola.append(entrada)
+                    self._insertar_entrada(entrada + (cola,))
+                    return
+                if cola[-1][0] <= evento.tiempo:
+                    cola.append(entrada)
+                    self._pendientes_monotonos += 1
+                    return
+        self._insertar_entrada(entrada)
     
     def extraer_proximo(self) -> Optional[Evento]:
         """
@@ -36,11 +89,24 @@ class TablaEventosFuturos:
         Returns:
             El evento más próximo, o None si la TEF está vacía
         """
-        if len(self.eventos) == 0:
+        if self._inmediatos:
+            # El inmediato va primero salvo que haya una entrada pendiente del
+            # mismo instante insertada antes (menor contador)
+            siguiente = self._ver_entrada()
+            if siguiente is None or self._inmediatos[0] < siguiente:
+                return self._inmediatos.popleft()[2]
+        entrada = self._extraer_entrada()
+        if entrada is None:
             return None
-        
-        _, _, evento = heapq.heappop(self.eventos)
-        return evento
+        if len(entrada) == 4:
+            # Cabeza de una cola monótona: promover la siguiente
+            cola = entrada[3]
+            cola.popleft()
+            if cola:
+                self._pendientes_monotonos -= 1
+                self._insertar_entrada(cola[0] + (cola,))
+        self._tiempo_actual = entrada[0]
+        return entrada[2]
     
     def esta_vacia(self) -> bool:
         """
@@ -49,7 +115,7 @@ class TablaEventosFuturos:
         Returns:
             True si está vacía, False en caso contrario
         """
-        return len(self.eventos) == 0
+        return not self._inmediatos and self._cantidad_entradas() == 0
     
     def tamaño(self) -> int:
         """
@@ -58,7 +124,7 @@ class TablaEventosFuturos:
         Returns:
             Cantidad de eventos
         """
-        return len(self.eventos)
+        return len(self._inmediatos) + self._cantidad_entradas() + self._pendientes_monotonos
     
     def ver_proximo(self) -> Optional[Evento]:
         """
@@ -67,14 +133,215 @@ class TablaEventosFuturos:
         Returns:
             El evento más próximo, o None si la TEF está vacía
         """
-        if len(self.eventos) == 0:
+        entrada = self._ver_entrada()
+        if self._inmediatos and (entrada is None or self._inmediatos[0] < entrada):
+            entrada = self._inmediatos[0]
+        if entrada is None:
             return None
-        
-        _, _, evento = self.eventos[0]
-        return evento
+        return entrada[2]
     
     def limpiar(self):
         """Limpia todos los eventos de la TEF."""
-        self.eventos = []
+        self._limpiar_entradas()
+        self._inmediatos.clear()
+        for cola in self._monotonas.values():
+            cola.clear()
+        self._pendientes_monotonos = 0
+        self._tiempo_actual = 0.0
         self.contador_tiebreak = 0
+    
+    # Almacenamiento de entradas (heap binario)
+    
+    def _insertar_entrada(self, entrada: Entrada):
+        """Agrega una entrada al almacenamiento."""
+        heapq.heappush(self.eventos, entrada)
+    
+    def _extraer_entrada(self) -> Optional[Entrada]:
+        """Extrae la entrada mínima, o None si no hay entradas."""
+        if not self.eventos:
+            return None
+        return heapq.heappop(self.eventos)
+    
+    def _ver_entrada(self) -> Optional[Entrada]:
+        """Retorna la entrada mínima sin extraerla, o None si no hay entradas."""
+        if not self.eventos:
+            return None
+        return self.eventos[0]
+    
+    def _cantidad_entradas(self) -> int:
+        """Retorna la cantidad de entradas almacenadas."""
+        return len(self.eventos)
+    
+    def _limpiar_entradas(self):
+        """Elimina todas las entradas."""
+        self.eventos: List[Entrada] = []
 
+
+class ColaCalendario(TablaEventosFuturos):
+    """
+    TEF implementada como cola calendario (Brown, 1988).
+    
+    El tiempo se divide en "días" de ancho fijo que se reparten circularmente
+    entre una cantidad de cubetas (un "año" recorre todas las cubetas). Cada
+    cubeta es una lista ordenada y corta, por lo que insertar y extraer cuestan
+    O(1) amortizado. Cuando la cantidad de eventos se duplica o cae a la mitad
+    respecto de la cantidad de cubetas, el calendario se redimensiona y el
+    ancho de día se recalcula a partir de la separación entre los próximos
+    eventos.
+    
+    El orden de extracción es idéntico al del heap: por (tiempo, contador).
+    """
+    
+    CUBETAS_MINIMAS = 2
+    
+    # Cantidad mínima de eventos próximos usados para estimar el ancho de día
+    MUESTRA_ANCHO = 25
+    
+    def _limpiar_entradas(self):
+        """Reinicia el calendario con la cantidad mínima de cubetas."""
+        self._cantidad = 0
+        self._ancho = 1.0
+        self._ultimo_tiempo = 0.0
+        self._construir(self.CUBETAS_MINIMAS, self._ancho, [])
+    
+    @property
+    def eventos(self) -> List[Entrada]:
+        """Entradas almacenadas en el calendario (ordenadas por tiempo y contador)."""
+        return sorted(e for cubeta in self._cubetas for e in cubeta)
+    
+    def _construir(self, num_cubetas: int, ancho: float, entradas: List[Entrada]):
+        """
+        Reconstruye el calendario con una nueva cantidad de cubetas y ancho de día.
+        
+        Args:
+            num_cubetas: Cantidad de cubetas
+            ancho: Ancho de cada día (en minutos)
+            entradas: Entradas a redistribuir, ordenadas por (tiempo, contador)
+        """
+        self._num_cubetas = num_cubetas
+        self._ancho = ancho
+        self._cubetas = [[] for _ in range(num_cubetas)]
+        # Día actual: índice (entero) del día que contiene al último evento extraído
+        self._dia_actual = int(self._ultimo_tiempo / ancho)
+        self._umbral_crecer = 2 * num_cubetas
+        self._umbral_achicar = num_cubetas // 2 - 2
+        for entrada in entradas:
+            self._cubetas[int(entrada[0] / ancho) % num_cubetas].append(entrada)
+        if entradas:
+            self._dia_actual = min(self._dia_actual, int(entradas[0][0] / ancho))
+    
+    def _redimensionar(self, num_cubetas: int):
+        """Redimensiona el calendario recalculando el ancho de día."""
+        entradas = sorted(e for cubeta in self._cubetas for e in cubeta)
+        self._construir(num_cubetas, self._estimar_ancho(entradas), entradas)
+    
+    def _estimar_ancho(self, entradas: List[Entrada]) -> float:
+        """
+        Estima el ancho de día como 3 veces la separación media entre eventos
+        consecutivos.
+        
+        A diferencia de la regla original de Brown (solo los 25 eventos más
+        próximos), la separación se mide sobre la primera mitad de la
+        población: en este modelo los eventos más próximos son arribos y
+        consultas muy juntos, mientras que la mayoría de los pendientes son
+        fines de reposo e incubación separados por horas, y un ancho estimado
+        solo con los primeros obliga a recorrer muchos días vacíos.
+        
+        Args:
+            entradas: Entradas ordenadas por tiempo
+        
+        Returns:
+            Ancho de día (en minutos)
+        """
+        k = min(max(self.MUESTRA_ANCHO, len(entradas) // 2), len(entradas) - 1)
+        if k < 1:
+            return self._ancho
+        separacion = (entradas[k][0] - entradas[0][0]) / k
+        if separacion <= 0.0:
+            return self._ancho
+        return 3.0 * separacion
+    
+    def _insertar_entrada(self, entrada: Entrada):
+        """Agrega una entrada en la cubeta correspondiente a su día."""
+        dia = int(entrada[0] / self._ancho)
+        insort(self._cubetas[dia % self._num_cubetas], entrada)
+        if dia < self._dia_actual:
+            self._dia_actual = dia
+        self._cantidad += 1
+        if self._cantidad > self._umbral_crecer:
+            self._redimensionar(2 * self._num_cubetas)
+    
+    def _ubicar_minimo(self) -> int:
+        """
+        Avanza el día actual hasta el día del próximo evento.
+        
+        Returns:
+            Índice de la cubeta que contiene la entrada mínima
+        """
+        ancho = self._ancho
+        num_cubetas = self._num_cubetas
+        cubetas = self._cubetas
+        dia = self._dia_actual
+        
+        # Recorrer a lo sumo un año buscando un evento del día en curso
+        for _ in range(num_cubetas):
+            cubeta = cubetas[dia % num_cubetas]
+            if cubeta and int(cubeta[0][0] / ancho) <= dia:
+                self._dia_actual = dia
+                return dia % num_cubetas
+            dia += 1
+        
+        # Ningún evento en el próximo año: búsqueda directa del mínimo
+        minimo = min(cubeta[0] for cubeta in cubetas if cubeta)
+        dia = int(minimo[0] / ancho)
+        self._dia_actual = dia
+        return dia % num_cubetas
+    
+    def _extraer_entrada(self) -> Optional[Entrada]:
+        """Extrae la entrada mínima, o None si el calendario está vacío."""
+        if self._cantidad == 0:
+            return None
+        # Caso frecuente: el próximo evento está en la cubeta del día actual
+        cubeta = self._cubetas[self._dia_actual % self._num_cubetas]
+        if not cubeta or int(cubeta[0][0] / self._ancho) > self._dia_actual:
+            cubeta = self._cubetas[self._ubicar_minimo()]
+        entrada = cubeta.pop(0)
+        self._ultimo_tiempo = entrada[0]
+        self._cantidad -= 1
+        if self._cantidad < self._umbral_achicar:
+            self._redimensionar(max(self.CUBETAS_MINIMAS, self._num_cubetas // 2))
+        return entrada
+    
+    def _ver_entrada(self) -> Optional[Entrada]:
+        """Retorna la entrada mínima sin extraerla, o None si el calendario está vacío."""
+        if self._cantidad == 0:
+            return None
+        return self._cubetas[self._ubicar_minimo()][0]
+    
+    def _cantidad_entradas(self) -> int:
+        """Retorna la cantidad de entradas almacenadas."""
+        return self._cantidad
+
+
+# Implementaciones de TEF disponibles, por nombre
+IMPLEMENTACIONES_TEF = {
+    'heap': TablaEventosFuturos,
+    'calendario': ColaCalendario,
+}
+
+
+def crear_tef(tipo: str = 'heap', tipos_monotonos: Iterable[int] = ()) -> TablaEventosFuturos:
+    """
+    Crea una Tabla de Eventos Futuros de la implementación indicada.
+    
+    Args:
+        tipo: 'heap' (heap binario) o 'calendario' (cola calendario)
+        tipos_monotonos: Tipos de evento con demora constante (ver TablaEventosFuturos)
+    
+    Returns:
+        TEF vacía
+    """
+    if tipo not in IMPLEMENTACIONES_TEF:
+        raise ValueError(f"Tipo de TEF desconocido: {tipo!r} "
+                         f"(opciones: {', '.join(IMPLEMENTACIONES_TEF)})")
+    return IMPLEMENTACIONES_TEF[tipo](tipos_monotonos)
@@ -0,0 +1,376 @@
+"""
+Simulación Descompuesta: Simula el frente una vez por (G, SC) y reproduce
+las salas de recuperación e incubadoras para cada SR e I
+"""
+
+import copy
+import heapq
+from typing import Callable, Dict, Any, List, Optional, Tuple, Iterable
+import numpy as np
+
+from .simulador import Simulador
+from .core.pool import PoolRecursos
+from .generadores.variables_aleatorias import GeneradorVariablesAleatorias, Semilla
+
+
+class OcupacionOrdenada:
+    """
+    Resultado de reproducir un sistema de pérdida con infinitas unidades
+    asignadas por orden de índice (siempre la libre de menor índice).
+    
+    Con esa política, las unidades 0..c-1 evolucionan exactamente igual que un
+    sistema de capacidad c: una solicitud que en el sistema infinito recibe la
+    unidad j >= c encontró ocupadas las c primeras, y en el sistema finito se
+    deriva. Por eso una sola pasada da derivaciones, ocupación y cantidad de
+    liberaciones para cualquier capacidad.
+    """
+    
+    __slots__ = ('unidades', 'en_ventana', 'ocupado', 'tiempo_ocupado', 'inicio_ocupacion',
+                 'liberaciones_por_unidad', 'inicio_ventana', 'solicitudes', '_atendidas_acumuladas')
+    
+    def __init__(self, unidades: np.ndarray, en_ventana: np.ndarray, ocupado: List[bool],
+                 tiempo_ocupado: List[float], inicio_ocupacion: List[float],
+                 liberaciones_por_unidad: List[int], inicio_ventana: float):
+        """
+        Inicializa el resultado.
+        
+        Args:
+            unidades: Unidad asignada a cada solicitud (-1 si no solicita)
+            en_ventana: Si cada solicitud ocurre después del calentamiento
+            ocupado: Por unidad, si sigue ocupada en el horizonte
+            tiempo_ocupado: Por unidad, tiempo ocupado cerrado dentro de la ventana
+            inicio_ocupacion: Por unidad, inicio del período ocupado en curso
+            liberaciones_por_unidad: Por unidad, liberaciones hasta el horizonte
+            inicio_ventana: Inicio de la ventana de acumulación
+        """
+        self.unidades = unidades
+        self.en_ventana = en_ventana
+        self.ocupado = ocupado
+        self.tiempo_ocupado = tiempo_ocupado
+        self.inicio_ocupacion = inicio_ocupacion
+        self.liberaciones_por_unidad = liberaciones_por_unidad
+        self.inicio_ventana = inicio_ventana
+        
+        # Solicitudes atendidas dentro de la ventana por las unidades 0..j
+        atendidas = unidades[en_ventana & (unidades >= 0)]
+        self.solicitudes = len(atendidas)
+        self._atendidas_acumuladas = np.cumsum(np.bincount(atendidas, minlength=len(ocupado)))
+    
+    @property
+    def unidades_usadas(self) -> int:
+        """Cantidad de unidades que llegaron a usarse (capacidad sin derivaciones)."""
+        return len(self.ocupado)
+    
+    def derivaciones(self, capacidad: int) -> int:
+        """
+        Retorna la cantidad de solicitudes derivadas (después del calentamiento)
+        con la capacidad dada.
+        
+        Args:
+            capacidad: Cantidad de unidades
+        
+        Returns:
+            Cantidad de derivaciones
+        """
+        if capacidad <= 0:
+            return self.solicitudes
+        if capacidad >= self.unidades_usadas:
+            return 0
+        return self.solicitudes - int(self._atendidas_acumuladas[capacidad - 1])
+    
+    def liberaciones(self, capacidad: int) -> int:
+        """
+        Retorna la cantidad de liberaciones hasta el horizonte con la capacidad dada.
+        
+        Args:
+            capacidad: Cantidad de unidades
+        
+        Returns:
+            Cantidad de eventos de fin (reposo o incubación) procesados
+        """
+        return sum(self.liberaciones_por_unidad[:capacidad])
+    
+    def pool(self, capacidad: int) -> PoolRecursos:
+        """
+        Retorna el pool de la capacidad dada, con sus integrales de ocupación.
+        
+        Args:
+            capacidad: Cantidad de unidades
+        
+        Returns:
+            PoolRecursos en el estado del horizonte
+        """
+        faltantes = max(0, capacidad - self.unidades_usadas)
+        return PoolRecursos.desde_acumuladores(
+            self.ocupado[:capacidad] + [False] * faltantes,
+            self.tiempo_ocupado[:capacidad] + [0.0] * faltantes,
+            self.inicio_ocupacion[:capacidad] + [0.0] * faltantes,
+            self.inicio_ventana
+        )
+
+
+def reproducir_orden_infinito(
+    tiempos_solicitud: List[float],
+    duracion: Callable[[], float],
+    tiempo_calentamiento: float,
+    tiempo_simulacion: float,
+    solicita: Optional[List[bool]] = None
+) -> OcupacionOrdenada:
+    """
+    Reproduce un sistema de pérdida con infinitas unidades asignadas por orden
+    de índice sobre una secuencia de solicitudes registrada (ver OcupacionOrdenada).
+    
+    Args:
+        tiempos_solicitud: Instantes de las solicitudes, en orden no decreciente
+        duracion: Función que genera la duración de cada ocupación (se invoca
+            en cada solicitud, igual que en la simulación completa)
+        tiempo_calentamiento: Fin del período de calentamiento (en minutos)
+        tiempo_simulacion: Horizonte de simulación (en minutos)
+        solicita: Por cada instante, si efectivamente solicita una unidad
+            (None = todas solicitan)
+    
+    Returns:
+        OcupacionOrdenada con la unidad de cada solicitud y los acumuladores por unidad
+    """
+    # Ventana de acumulación: el reinicio ocurre solo si se alcanza el fin del calentamiento
+    inicio_ventana = tiempo_calentamiento if tiempo_simulacion >= tiempo_calentamiento else 0.0
+    
+    libres = []  # Heap de unidades liberadas
+    liberaciones_pendientes = []  # Heap de (tiempo, orden, unidad)
+    unidades = np.full(len(tiempos_solicitud), -1, dtype=np.int64)
+    ocupado: List[bool] = []
+    tiempo_ocupado: List[float] = []
+    inicio_ocupacion: List[float] = []
+    liberaciones_por_unidad: List[int] = []
+    
+    for k, tiempo in enumerate(tiempos_solicitud):
+        while liberaciones_pendientes and liberaciones_pendientes[0][0] <= tiempo:
+            heapq.heappush(libres, heapq.heappop(liberaciones_pendientes)[2])
+        
+        if solicita is not None and not solicita[k]:
+            continue
+        
+        if libres:
+            unidad = heapq.heappop(libres)
+        else:
+            # Primera vez que se usa esta unidad
+            unidad = len(ocupado)
+            ocupado.append(False)
+            tiempo_ocupado.append(0.0)
+            inicio_ocupacion.append(0.0)
+            liberaciones_por_unidad.append(0)
+        unidades[k] = unidad
+        
+        tiempo_fin = tiempo + duracion()
+        heapq.heappush(liberaciones_pendientes, (tiempo_fin, k, unidad))
+        
+        # Integrar el período ocupado recortado a la ventana [inicio_ventana, horizonte]
+        inicio = tiempo if tiempo >= inicio_ventana else inicio_ventana
+        if tiempo_fin <= tiempo_simulacion:
+            liberaciones_por_unidad[unidad] += 1
+            if tiempo_fin >= inicio_ventana:
+                tiempo_ocupado[unidad] += tiempo_fin - inicio
+        else:
+            ocupado[unidad] = True
+            inicio_ocupacion[unidad] = inicio
+    
+    en_ventana = np.asarray(tiempos_solicitud, dtype=float) >= inicio_ventana
+    return OcupacionOrdenada(unidades, en_ventana, ocupado, tiempo_ocupado, inicio_ocupacion,
+                             liberaciones_por_unidad, inicio_ventana)
+
+
+class SimuladorDescompuesto:
+    """
+    Simulación de una réplica descompuesta en frente y subsistemas de salida.
+    
+    Las salas de recuperación y las incubadoras no realimentan las colas de
+    médicos, quirófano y consultorios: en el fin de parto la madre y el
+    neonato se asignan o se derivan, y nada más depende de ello. Por eso el
+    frente se simula una sola vez por (G, SC, réplica), registrando los
+    instantes de fin de parto, y los subsistemas de SR e I se reproducen sobre
+    ese registro con infinitas unidades asignadas por orden de índice (ver
+    OcupacionOrdenada): una sola pasada por subsistema da los resultados de
+    todas las capacidades.
+    
+    La reproducción usa los mismos sub-flujos aleatorios ('reposo' e
+    'incubadora') y la misma política de asignación (unidad libre de menor
+    índice) que la simulación completa, por lo que los resultados coinciden
+    con los de Simulador(G, SR, I, SC, semilla).
+    """
+    
+    # Clase del simulador del frente (define horizonte y calentamiento)
+    SIMULADOR = Simulador
+    
+    def __init__(self, G: int, SC: int, semilla: Optional[Semilla] = None,
+                 tamano_bloque: Optional[int] = Simulador.TAMANO_BLOQUE,
+                 tipo_tef: str = 'heap', tiempo_simulacion: Optional[float] = None,
+                 tiempo_calentamiento: Optional[float] = None):
+        """
+        Inicializa el simulador descompuesto.
+        
+        Args:
+            G: Cantidad de médicos de guardia
+            SC: Cantidad de salas de consultorio
+            semilla: Entero o SeedSequence de la réplica (None = entropía del
+                sistema, fijada una vez para que frente y reproducciones coincidan)
+            tamano_bloque: Valores por bloque del generador
+            tipo_tef: Implementación de la TEF del frente
+            tiempo_simulacion: Horizonte en minutos (None = el de SIMULADOR)
+            tiempo_calentamiento: Calentamiento en minutos (None = el de SIMULADOR)
+        """
+        self.G = G
+        self.SC = SC
+        self.semilla = semilla if semilla is not None else np.random.SeedSequence()
+        self.tamano_bloque = tamano_bloque
+        self.tipo_tef = tipo_tef
+        self.tiempo_simulacion = tiempo_simulacion
+        self.tiempo_calentamiento = tiempo_calentamiento
+        
+        self._simulador = None
+        self._resultados_frente = None
+        self._requiere_incubadora = None
+        self._ocupacion_sr = None
+        self._ocupacion_inc = None
+    
+    def simular_frente(self) -> Dict[str, Any]:
+        """
+        Simula el frente (llegadas, médicos, quirófano y consultorios) y
+        registra los instantes de fin de parto.
+        
+        Returns:
+            Resultados de la simulación del frente
+        """
+        self._simulador = self.SIMULADOR(
+            G=self.G, SR=0, I=0, SC=self.SC, semilla=self.semilla,
+            tamano_bloque=self.tamano_bloque, tipo_tef=self.tipo_tef,
+            registrar_partos=True, tiempo_simulacion=self.tiempo_simulacion,
+            tiempo_calentamiento=self.tiempo_calentamiento
+        )
+        self._resultados_frente = self._simulador.ejecutar(mostrar_progreso=False)
+        tiempos_partos = self._simulador.estado.registro_partos
+        tiempo_calentamiento = self._simulador.TIEMPO_CALENTAMIENTO
+        tiempo_simulacion = self._simulador.TIEMPO_SIMULACION
+        
+        # Salas de recuperación: todas las madres solicitan sala
+        generador = self._nuevo_generador()
+        self._ocupacion_sr = reproducir_orden_infinito(
+            tiempos_partos, generador.generar_tiempo_reposo, tiempo_calentamiento, tiempo_simulacion
+        )
+        
+        # Incubadoras: el sorteo se hace en cada parto, sin importar SR e I
+        generador = self._nuevo_generador()
+        self._requiere_incubadora = [generador.requiere_incubadora() for _ in tiempos_partos]
+        self._ocupacion_inc = reproducir_orden_infinito(
+            tiempos_partos, generador.generar_tiempo_incubacion, tiempo_calentamiento,
+            tiempo_simulacion, solicita=self._requiere_incubadora
+        )
+        return self._resultados_frente
+    
+    @property
+    def tiempos_partos(self) -> List[float]:
+        """Instantes de fin de parto registrados por el frente."""
+        if self._simulador is None:
+            self.simular_frente()
+        return self._simulador.estado.registro_partos
+    
+    def _nuevo_generador(self) -> GeneradorVariablesAleatorias:
+        """Crea un generador con los sub-flujos de la réplica desde el inicio."""
+        return GeneradorVariablesAleatorias(semilla=self.semilla, tamano_bloque=self.tamano_bloque)
+    
+    @property
+    def ocupacion_sr(self) -> OcupacionOrdenada:
+        """Reproducción de las salas de recuperación con infinitas unidades."""
+        if self._simulador is None:
+            self.simular_frente()
+        return self._ocupacion_sr
+    
+    @property
+    def ocupacion_incubadoras(self) -> OcupacionOrdenada:
+        """Reproducción de las incubadoras con infinitas unidades."""
+        if self._simulador is None:
+            self.simular_frente()
+        return self._ocupacion_inc
+    
+    def reproducir(self, SR: int, I: int) -> Dict[str, Any]:
+        """
+        Obtiene los resultados de la réplica para la configuración (G, SR, I, SC).
+        
+        Args:
+            SR: Cantidad de salas de recuperación
+            I: Cantidad de incubadoras
+        
+        Returns:
+            Diccionario de resultados, con las mismas claves que Simulador.ejecutar
+        """
+        ocupacion_sr = self.ocupacion_sr
+        ocupacion_inc = self.ocupacion_incubadoras
+        
+        # Estado combinado: frente simulado + subsistemas con capacidades SR e I
+        estado = copy.copy(self._simulador.estado)
+        estado.SR = SR
+        estado.I = I
+        estado.salas_recuperacion = ocupacion_sr.pool(SR)
+        estado.incubadoras = ocupacion_inc.pool(I)
+        estado.total_derivaciones_sr = ocupacion_sr.derivaciones(SR)
+        estado.total_derivaciones_inc = ocupacion_inc.derivaciones(I)
+        estado.total_neonatos_requieren_inc = ocupacion_inc.solicitudes
+        
+        indicadores = self._simulador.calculadora_indicadores.calcular_todos(estado)
+        costos = self._simulador.calculadora_costos.calcular_costos(estado)
+        
+        return {
+            **indicadores,
+            **costos,
+            'eventos_procesados': (self._resultados_frente['eventos_procesados']
+                                   + ocupacion_sr.liberaciones(SR) + ocupacion_inc.liberaciones(I)),
+            'tiempo_simulacion': estado.tiempo_actual,
+            'G': self.G,
+            'SR': SR,
+            'I': I,
+            'SC': self.SC
+        }
+    
+    def reproducir_grilla(self, configuraciones: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], Dict[str, Any]]:
+        """
+        Obtiene los resultados para varias capacidades (SR, I) con un solo frente.
+        
+        Args:
+            configuraciones: Pares (SR, I) a evaluar
+        
+        Returns:
+            Diccionario {(SR, I): resultados}
+        """
+        return {(SR, I): self.reproducir(SR, I) for SR, I in configuraciones}
+    
+    def evaluar_capacidades(self, valores_SR: Iterable[int], valores_I: Iterable[int]) -> Dict[str, np.ndarray]:
+        """
+        Evalúa todas las combinaciones de capacidades con un solo frente y una
+        sola pasada por subsistema.
+        
+        Args:
+            valores_SR: Cantidades de salas de recuperación
+            valores_I: Cantidades de incubadoras
+        
+        Returns:
+            Diccionario con 'SR' e 'I' (vectores de capacidades) y, por cada
+            indicador escalar de Simulador.ejecutar, un array de forma
+            (len(valores_SR), len(valores_I)) indexado por [SR, I]. Los
+            indicadores de salas (PPDSR, PTOSR_promedio, UT_SR) varían solo a lo
+            largo de SR y los de incubadoras (PPDINC, UT_INC) solo a lo largo de I.
+        """
+        valores_SR = [int(SR) for SR in valores_SR]
+        valores_I = [int(I) for I in valores_I]
+        forma = (len(valores_SR), len(valores_I))
+        
+        arrays: Dict[str, np.ndarray] = {}
+        for i, SR in enumerate(valores_SR):
+            for j, I in enumerate(valores_I):
+                for clave, valor in self.reproducir(SR, I).items():
+                    if isinstance(valor, (int, float, np.integer, np.floating)):
+                        if clave not in arrays:
+                            arrays[clave] = np.zeros(forma)
+                        arrays[clave][i, j] = valor
+        
+        arrays['SR'] = np.array(valores_SR)
+        arrays['I'] = np.array(valores_I)
+        return arrays
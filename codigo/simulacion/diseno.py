@@ -0,0 +1,203 @@
+"""
+Diseño de Experimentos: Generación de puntos de diseño sobre los factores del modelo
+"""
+
+import itertools
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+
+# Niveles de la grilla actual (factorial completo 3 x 4 x 3 x 3), en el orden
+# en que se recorren: G (médicos), SC (consultorios), SR (salas de
+# recuperación) e I (incubadoras)
+NIVELES_ACTUALES = {
+    'G': [2, 3, 4],
+    'SC': [2, 3, 4, 5],
+    'SR': [15, 24, 30],
+    'I': [10, 15, 20]
+}
+
+# Tipos de diseño disponibles (ver generar_diseno)
+DISENOS = ('factorial', 'lhs', 'ortogonal', 'fraccionado')
+
+# Puntos de diseño: {factor: valor entero}
+Punto = Dict[str, int]
+
+
+def factorial_completo(niveles: Dict[str, Sequence[int]]) -> List[Punto]:
+    """
+    Genera el factorial completo: todas las combinaciones de niveles.
+    
+    Args:
+        niveles: Niveles de cada factor (el primer factor varía más lento)
+    
+    Returns:
+        Lista de puntos de diseño
+    """
+    factores = list(niveles)
+    return [dict(zip(factores, valores)) for valores in itertools.product(*niveles.values())]
+
+
+def hipercubo_latino(
+    rangos: Dict[str, Tuple[int, int]],
+    puntos: int,
+    semilla: Optional[int] = None,
+    candidatos: int = 50
+) -> List[Punto]:
+    """
+    Genera un hipercubo latino de valores enteros: el rango de cada factor se
+    divide en tantos estratos como puntos y cada estrato se usa una sola vez.
+    De varios hipercubos al azar se elige el de mayor distancia mínima entre
+    puntos (criterio maximin), que cubre el espacio de forma más pareja.
+    
+    Args:
+        rangos: Rango (mínimo, máximo) inclusivo de cada factor
+        puntos: Cantidad de puntos de diseño
+        semilla: Semilla del generador (None = entropía del sistema)
+        candidatos: Hipercubos al azar entre los que elegir
+    
+    Returns:
+        Lista de puntos de diseño (los repetidos al redondear se eliminan)
+    """
+    generador = np.random.default_rng(semilla)
+    k = len(rangos)
+    mejor, mejor_distancia = None, -1.0
+    for _ in range(candidatos):
+        # Un valor uniforme dentro de cada estrato, estratos permutados por factor
+        u = (np.argsort(generador.random((k, puntos)), axis=1).T + generador.random((puntos, k))) / puntos
+        if puntos > 1:
+            diferencias = u[:, None, :] - u[None, :, :]
+            distancias = np.sqrt((diferencias ** 2).sum(axis=2))
+            distancia = distancias[np.triu_indices(puntos, 1)].min()
+        else:
+            distancia = 0.0
+        if distancia > mejor_distancia:
+            mejor, mejor_distancia = u, distancia
+    
+    minimos = np.array([minimo for minimo, _ in rangos.values()])
+    amplitudes = np.array([maximo - minimo + 1 for minimo, maximo in rangos.values()])
+    valores = minimos + np.minimum(np.floor(mejor * amplitudes), amplitudes - 1).astype(int)
+    return _sin_repetidos([dict(zip(rangos, map(int, fila))) for fila in valores])
+
+
+def arreglo_ortogonal(rangos: Dict[str, Tuple[int, int]], niveles: int = 3) -> List[Punto]:
+    """
+    Genera un arreglo ortogonal de fuerza 2 (construcción de Bose): con q
+    niveles por factor (q primo), q² corridas en las que cada par de
+    factores recorre todas las combinaciones de niveles exactamente una vez.
+    Con 4 factores y 3 niveles es el arreglo L9 de Taguchi.
+    
+    Args:
+        rangos: Rango (mínimo, máximo) inclusivo de cada factor
+        niveles: Niveles por factor (se usa el menor primo q >= niveles que
+            admita la cantidad de factores, q + 1 >= factores)
+    
+    Returns:
+        Lista de puntos de diseño (niveles equiespaciados en cada rango)
+    """
+    k = len(rangos)
+    q = max(niveles, k - 1, 2)
+    while any(q % d == 0 for d in range(2, int(q ** 0.5) + 1)):
+        q += 1
+    
+    # Columnas a, b, a + b, a + 2b, ..., a + (q - 1) b (mod q)
+    a, b = np.divmod(np.arange(q * q), q)
+    columnas = [a, b] + [(a + j * b) % q for j in range(1, q)]
+    
+    puntos = []
+    for corrida in range(q * q):
+        punto = {}
+        for columna, (factor, (minimo, maximo)) in zip(columnas, rangos.items()):
+            punto[factor] = int(round(minimo + columna[corrida] * (maximo - minimo) / (q - 1)))
+        puntos.append(punto)
+    return _sin_repetidos(puntos)
+
+
+def factorial_fraccionado(rangos: Dict[str, Tuple[int, int]], centro: bool = True) -> List[Punto]:
+    """
+    Genera un factorial fraccionado 2^(k-1) en los extremos de cada rango: el
+    factorial completo de los primeros k - 1 factores, con el último en el
+    nivel dado por el producto de los demás (I = ABC...K, resolución k). Con
+    4 factores son 8 corridas de resolución IV en lugar de 16.
+    
+    Args:
+        rangos: Rango (mínimo, máximo) inclusivo de cada factor
+        centro: Si agregar el punto central (detecta curvatura)
+    
+    Returns:
+        Lista de puntos de diseño
+    """
+    factores = list(rangos)
+    puntos = []
+    for signos in itertools.product((-1, 1), repeat=len(factores) - 1):
+        signos = signos + (int(np.prod(signos)),)
+        puntos.append({factor: rangos[factor][0] if signo < 0 else rangos[factor][1]
+                       for factor, signo in zip(factores, signos)})
+    if centro:
+        puntos.append({factor: int(round((minimo + maximo) / 2))
+                       for factor, (minimo, maximo) in rangos.items()})
+    return _sin_repetidos(puntos)
+
+
+def generar_diseno(
+    tipo: str = 'factorial',
+    rangos: Optional[Dict[str, Tuple[int, int]]] = None,
+    puntos: int = 20,
+    niveles: int = 3,
+    semilla: Optional[int] = None
+) -> List[Punto]:
+    """
+    Genera un diseño de experimentos sobre G, SC, SR e I.
+    
+    Args:
+        tipo: 'factorial' (grilla actual, NIVELES_ACTUALES), 'lhs' (hipercubo
+            latino), 'ortogonal' (arreglo ortogonal) o 'fraccionado'
+            (factorial fraccionado 2^(k-1) con punto central)
+        rangos: Rango (mínimo, máximo) de cada factor (None = los de la grilla
+            actual); los factores que falten toman el rango de la grilla
+        puntos: Puntos del hipercubo latino
+        niveles: Niveles por factor del arreglo ortogonal
+        semilla: Semilla del hipercubo latino
+    
+    Returns:
+        Lista de puntos de diseño
+    """
+    if tipo == 'factorial':
+        return factorial_completo(NIVELES_ACTUALES)
+    rangos_completos = {factor: (min(valores), max(valores)) for factor, valores in NIVELES_ACTUALES.items()}
+    rangos_completos.update(rangos or {})
+    for factor, (minimo, maximo) in rangos_completos.items():
+        if not 1 <= minimo <= maximo:
+            raise ValueError(f"Rango inválido para {factor}: {minimo}-{maximo}")
+    if tipo == 'lhs':
+        return hipercubo_latino(rangos_completos, puntos, semilla)
+    if tipo == 'ortogonal':
+        return arreglo_ortogonal(rangos_completos, niveles)
+    if tipo == 'fraccionado':
+        return factorial_fraccionado(rangos_completos)
+    raise ValueError(f"Tipo de diseño desconocido: {tipo} (opciones: {', '.join(DISENOS)})")
+
+
+def a_escenarios(puntos: List[Punto]) -> List[Tuple[int, int, int, int]]:
+    """
+    Convierte puntos de diseño en escenarios del experimento.
+    
+    Args:
+        puntos: Puntos de diseño con los factores G, SR, I y SC
+    
+    Returns:
+        Lista de tuplas (G, SR, I, SC), en el orden de los puntos
+    """
+    return [(punto['G'], punto['SR'], punto['I'], punto['SC']) for punto in puntos]
+
+
+def _sin_repetidos(puntos: List[Punto]) -> List[Punto]:
+    """Elimina los puntos repetidos conservando el primero de cada uno."""
+    vistos = set()
+    unicos = []
+    for punto in puntos:
+        clave = tuple(punto.items())
+        if clave not in vistos:
+            vistos.add(clave)
+            unicos.append(punto)
+    return unicos
@@ -3,7 +3,7 @@ Rutinas de eventos: Inicio y fin de consulta
 """
 
 from ..core.estado import EstadoSistema
-from ..core.evento import Evento
+from ..core.evento import Evento, FIN_CONSULTA
 from ..generadores.variables_aleatorias import GeneradorVariablesAleatorias
 from ..recursos.asignacion import asignar_recursos
 
@@ -30,8 +30,8 @@ def procesar_inicio_consulta(
         tef: Tabla de Eventos Futuros
         generador: Generador de variables aleatorias
     """
-    paciente = evento.datos_extra['paciente']
-    consultorio_id = evento.datos_extra.get('consultorio_id', -1)
+    paciente = evento.paciente
+    consultorio_id = evento.recurso_id
     
     # Registrar tiempo de inicio de atención
     paciente.tiempo_inicio_atencion = estado.tiempo_actual
@@ -45,14 +45,11 @@ def procesar_inicio_consulta(
     
     # Programar fin de consulta
     evento_fin = Evento(
-        tipo='fin_consulta',
+        tipo=FIN_CONSULTA,
         tiempo=estado.tiempo_actual + tac,
-        paciente_id=paciente.id,
-        datos_extra={
-            'paciente': paciente,
-            'tac': tac,
-            'consultorio_id': consultorio_id
-        }
+        paciente=paciente,
+        recurso_id=consultorio_id,
+        duracion=tac
     )
     tef.insertar(evento_fin)
 
@@ -79,14 +76,13 @@ def procesar_fin_consulta(
         tef: Tabla de Eventos Futuros
         generador: Generador de variables aleatorias
     """
-    paciente = evento.datos_extra['paciente']
-    tac = evento.datos_extra['tac']
-    consultorio_id = evento.datos_extra.get('consultorio_id', -1)
+    tac = evento.duracion
+    consultorio_id = evento.recurso_id
     
     # Liberar médico y consultorio
     estado.medicos_disponibles += 1
     if consultorio_id >= 0:
-        estado.liberar_consultorio(consultorio_id, tac)
+        estado.liberar_consultorio(consultorio_id)
     
     # Actualizar contadores
     estado.total_consultas += 1
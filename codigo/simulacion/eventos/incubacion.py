@@ -26,12 +26,10 @@ def procesar_fin_incubacion(
         tef: Tabla de Eventos Futuros (no usado aquí)
         generador: Generador de variables aleatorias (no usado aquí)
     """
-    paciente = evento.datos_extra['paciente']
-    inc_id = evento.datos_extra['inc_id']
-    tinc = evento.datos_extra['tinc']
+    inc_id = evento.recurso_id
     
     # Liberar incubadora
-    estado.liberar_incubadora(inc_id, tinc)
+    estado.liberar_incubadora(inc_id)
     
     # El neonato es dado de alta (no se programa más eventos)
 
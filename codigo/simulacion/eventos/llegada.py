@@ -3,7 +3,7 @@ Rutina de evento: Llegada de paciente a la guardia
 """
 
 from ..core.estado import EstadoSistema
-from ..core.evento import Evento
+from ..core.evento import Evento, LLEGADA
 from ..core.paciente import Paciente
 from ..generadores.variables_aleatorias import GeneradorVariablesAleatorias
 from ..recursos.asignacion import asignar_recursos
@@ -11,6 +11,7 @@ from ..recursos.asignacion import asignar_recursos
 
 def procesar_llegada(
     estado: EstadoSistema,
+    evento: Evento,
     tef,
     generador: GeneradorVariablesAleatorias
 ):
@@ -26,6 +27,7 @@ def procesar_llegada(
     
     Args:
         estado: Estado actual del sistema
+        evento: Evento de llegada
         tef: Tabla de Eventos Futuros
         generador: Generador de variables aleatorias
     """
@@ -41,13 +43,18 @@ def procesar_llegada(
     
     estado.total_pacientes_llegados += 1
     
-    # 3. Encolar según tipo
+    # 3. Encolar según tipo (y registrar el nuevo largo de la cola)
     if tipo == 'consulta':
         estado.cola_consultas.append(paciente)
+        estado.largo_cola_consultas.actualizar(estado.tiempo_actual, len(estado.cola_consultas))
     elif tipo == 'parto_natural':
         estado.cola_partos_naturales.append(paciente)
+        estado.largo_cola_partos_naturales.actualizar(estado.tiempo_actual,
+                                                      len(estado.cola_partos_naturales))
     elif tipo == 'parto_cesarea':
         estado.cola_partos_cesarea.append(paciente)
+        estado.largo_cola_partos_cesarea.actualizar(estado.tiempo_actual,
+                                                    len(estado.cola_partos_cesarea))
     
     # 4. Intentar asignar recursos inmediatamente
     asignar_recursos(estado, tef, generador)
@@ -55,7 +62,7 @@ def procesar_llegada(
     # 5. Programar próxima llegada
     intervalo = generador.generar_intervalo_arribo()
     proxima_llegada = Evento(
-        tipo='llegada',
+        tipo=LLEGADA,
         tiempo=estado.tiempo_actual + intervalo
     )
     tef.insertar(proxima_llegada)
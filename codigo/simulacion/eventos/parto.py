@@ -3,7 +3,7 @@ Rutinas de eventos: Inicio y fin de parto
 """
 
 from ..core.estado import EstadoSistema
-from ..core.evento import Evento
+from ..core.evento import Evento, FIN_PARTO, FIN_REPOSO, FIN_INCUBACION
 from ..generadores.variables_aleatorias import GeneradorVariablesAleatorias
 from ..recursos.asignacion import asignar_recursos
 
@@ -30,8 +30,7 @@ def procesar_inicio_parto(
         tef: Tabla de Eventos Futuros
         generador: Generador de variables aleatorias
     """
-    paciente = evento.datos_extra['paciente']
-    tipo_parto = evento.datos_extra['tipo_parto']
+    paciente = evento.paciente
     
     # Registrar tiempo de inicio de atención
     paciente.tiempo_inicio_atencion = estado.tiempo_actual
@@ -40,7 +39,7 @@ def procesar_inicio_parto(
     tiempo_espera = paciente.calcular_tiempo_espera(estado.tiempo_actual)
     
     # Acumular tiempo de espera según tipo
-    if tipo_parto == 'natural':
+    if paciente.tipo == 'parto_natural':
         estado.tiempo_total_espera_partos_nat += tiempo_espera
     else:  # cesarea
         estado.tiempo_total_espera_partos_ces += tiempo_espera
@@ -50,14 +49,10 @@ def procesar_inicio_parto(
     
     # Programar fin de parto
     evento_fin = Evento(
-        tipo='fin_parto',
+        tipo=FIN_PARTO,
         tiempo=estado.tiempo_actual + tap,
-        paciente_id=paciente.id,
-        datos_extra={
-            'paciente': paciente,
-            'tipo_parto': tipo_parto,
-            'tap': tap
-        }
+        paciente=paciente,
+        duracion=tap
     )
     tef.insertar(evento_fin)
 
@@ -85,9 +80,8 @@ def procesar_fin_parto(
         tef: Tabla de Eventos Futuros
         generador: Generador de variables aleatorias
     """
-    paciente = evento.datos_extra['paciente']
-    tipo_parto = evento.datos_extra['tipo_parto']
-    tap = evento.datos_extra['tap']
+    paciente = evento.paciente
+    tap = evento.duracion
     
     # Liberar médico y quirófano (ambos tipos de partos usan quirófano)
     estado.medicos_disponibles += 1
@@ -97,7 +91,7 @@ def procesar_fin_parto(
     estado.tiempo_ocupacion_quirofano += tap
     
     # Actualizar contadores
-    if tipo_parto == 'natural':
+    if paciente.tipo == 'parto_natural':
         estado.total_partos_naturales += 1
     else:
         estado.total_partos_cesarea += 1
@@ -107,24 +101,31 @@ def procesar_fin_parto(
     # Actualizar tiempo de ocupación de médicos
     estado.tiempo_ocupacion_medicos += tap
     
+    # Modo descompuesto: solo registrar el fin del parto. Las salas de
+    # recuperación e incubadoras no influyen en el resto del sistema y se
+    # reproducen luego para cada SR e I (ver descomposicion.py)
+    if estado.registro_partos is not None:
+        estado.registro_partos.append(estado.tiempo_actual)
+        asignar_recursos(estado, tef, generador)
+        return
+    
     # PROCESAR MADRE: Asignar sala de recuperación
+    # El tiempo de reposo se genera para todas las madres (también las
+    # derivadas): así el k-ésimo parto usa el mismo TREP para cualquier SR
+    trep = generador.generar_tiempo_reposo()
     sala_id = estado.asignar_sala_recuperacion()
     
     if sala_id >= 0:
         # Hay sala disponible
         paciente.sala_recuperacion_asignada = sala_id
-        trep = generador.generar_tiempo_reposo()
         
         # Programar fin de reposo
         evento_reposo = Evento(
-            tipo='fin_reposo',
+            tipo=FIN_REPOSO,
             tiempo=estado.tiempo_actual + trep,
-            paciente_id=paciente.id,
-            datos_extra={
-                'paciente': paciente,
-                'sala_id': sala_id,
-                'trep': trep
-            }
+            paciente=paciente,
+            recurso_id=sala_id,
+            duracion=trep
         )
         tef.insertar(evento_reposo)
     else:
@@ -145,14 +146,11 @@ def procesar_fin_parto(
             
             # Programar fin de incubación
             evento_inc = Evento(
-                tipo='fin_incubacion',
+                tipo=FIN_INCUBACION,
                 tiempo=estado.tiempo_actual + tinc,
-                paciente_id=paciente.id,
-                datos_extra={
-                    'paciente': paciente,
-                    'inc_id': inc_id,
-                    'tinc': tinc
-                }
+                paciente=paciente,
+                recurso_id=inc_id,
+                duracion=tinc
             )
             tef.insertar(evento_inc)
         else:
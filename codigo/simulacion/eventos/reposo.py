@@ -26,12 +26,10 @@ def procesar_fin_reposo(
         tef: Tabla de Eventos Futuros (no usado aquí)
         generador: Generador de variables aleatorias (no usado aquí)
     """
-    paciente = evento.datos_extra['paciente']
-    sala_id = evento.datos_extra['sala_id']
-    trep = evento.datos_extra['trep']
+    sala_id = evento.recurso_id
     
     # Liberar sala de recuperación
-    estado.liberar_sala_recuperacion(sala_id, trep)
+    estado.liberar_sala_recuperacion(sala_id)
     
     # La madre es dada de alta (no se programa más eventos)
 
@@ -3,79 +3,313 @@ Diseño y Ejecución de Experimentos: Ejecuta múltiples escenarios y réplicas
 """
 
 import json
+import traceback
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Callable, Iterable, Iterator, Optional
 import numpy as np
 from multiprocessing import Pool, cpu_count
 from functools import partial
 import sys
 
 from .simulador import Simulador
+from .descomposicion import SimuladorDescompuesto
+from .cache import CacheResultados
+from .almacen import AlmacenResultados
+from .manifiesto import ManifiestoBarrido
+from .indicadores.estadisticas import AgregadorWelford, ReglaDetencion
+from .seleccion import (PESOS_SCORE, INDICADORES_CRIBADO, score_por_replica, asignacion_ocba,
+                        probabilidad_seleccion_correcta, repartir_incremento, ranking,
+                        dominados_pareto)
+from .diseno import NIVELES_ACTUALES, factorial_completo, a_escenarios
+from .optimizacion import FACTORES, muestrear_region, evaluar_solucion
+from .generadores.variables_aleatorias import semilla_replica
 
 
-def _ejecutar_replica_individual(args: Tuple[int, int, int, int, int, int, int, str]) -> Tuple[int, Dict[str, Any]]:
+# Indicadores resumidos por escenario
+INDICADORES_ESCENARIO = [
+    'PEC_consultas', 'PEC_partos_nat', 'PEC_partos_ces', 'PEC_general',
+    'UT_med', 'UT_Q', 'PTOSR_promedio',
+    'UT_SC', 'UT_SR', 'UT_INC',
+    'LPC_consultas', 'LPC_partos_nat', 'LPC_partos_ces',
+    'PPDSR', 'PPDINC',
+    'CTM', 'CII'
+]
+
+
+def _ejecutar_replica_individual(
+    args: Tuple[int, int, int, int, int, Any, str],
+    tiempo_simulacion: Optional[float] = None,
+    tiempo_calentamiento: Optional[float] = None
+) -> Tuple[int, Dict[str, Any]]:
     """
     Función auxiliar para ejecutar una réplica individual.
     Necesaria para multiprocessing (debe ser picklable).
     
+    El resultado no se guarda acá: lo guarda el proceso principal en el
+    almacén de resultados, en lotes.
+    
     Args:
-        args: Tupla con (replica, G, SR, I, SC, semilla, directorio_escenario_str, nombre_escenario)
+        args: Tupla con (replica, G, SR, I, SC, semilla, nombre_escenario)
+        tiempo_simulacion: Horizonte en minutos (None = el de Simulador)
+        tiempo_calentamiento: Calentamiento en minutos (None = el de Simulador)
         
     Returns:
         Tupla (replica, resultados)
     """
-    replica, G, SR, I, SC, semilla, directorio_escenario_str, nombre_escenario = args
-    directorio_escenario = Path(directorio_escenario_str)
+    replica, G, SR, I, SC, semilla, nombre_escenario = args
     
     # Crear y ejecutar simulador
-    simulador = Simulador(G=G, SR=SR, I=I, SC=SC, semilla=semilla)
+    simulador = Simulador(G=G, SR=SR, I=I, SC=SC, semilla=semilla,
+                          tiempo_simulacion=tiempo_simulacion,
+                          tiempo_calentamiento=tiempo_calentamiento)
     resultados = simulador.ejecutar(mostrar_progreso=False)
-    
-    # Guardar réplica individual
-    archivo_replica = directorio_escenario / f"replica_{replica:02d}.json"
-    with open(archivo_replica, 'w', encoding='utf-8') as f:
-        json.dump(resultados, f, indent=2, ensure_ascii=False)
+    resultados['replica'] = replica
     
     return (replica, resultados)
 
 
+def _ejecutar_frente_descompuesto(
+    args: Tuple[int, int, int, List[Tuple[int, int]], Any],
+    tiempo_simulacion: Optional[float] = None,
+    tiempo_calentamiento: Optional[float] = None
+) -> Tuple[int, int, int, Dict[Tuple[int, int], Dict[str, Any]]]:
+    """
+    Función auxiliar para ejecutar una réplica en modo descompuesto: simula el
+    frente de (G, SC) una vez y reproduce todas las capacidades (SR, I).
+    Necesaria para multiprocessing (debe ser picklable).
+    
+    Args:
+        args: Tupla con (replica, G, SC, configuraciones, semilla), donde
+            configuraciones es la lista de pares (SR, I)
+        tiempo_simulacion: Horizonte en minutos (None = el de Simulador)
+        tiempo_calentamiento: Calentamiento en minutos (None = el de Simulador)
+        
+    Returns:
+        Tupla (replica, G, SC, {(SR, I): resultados})
+    """
+    replica, G, SC, configuraciones, semilla = args
+    
+    simulador = SimuladorDescompuesto(G=G, SC=SC, semilla=semilla,
+                                      tiempo_simulacion=tiempo_simulacion,
+                                      tiempo_calentamiento=tiempo_calentamiento)
+    resultados_grilla = simulador.reproducir_grilla(configuraciones)
+    for resultados in resultados_grilla.values():
+        resultados['replica'] = replica
+    
+    return (replica, G, SC, resultados_grilla)
+
+
+def _id_replica(args: Tuple[int, int, int, int, int, Any, str]) -> str:
+    """Identificador en el manifiesto de una tarea de _ejecutar_replica_individual."""
+    replica, nombre_escenario = args[0], args[6]
+    return f"{nombre_escenario}/replica_{replica:02d}"
+
+
+def _id_frente(args: Tuple[int, int, int, List[Tuple[int, int]], Any]) -> str:
+    """Identificador en el manifiesto de una tarea de _ejecutar_frente_descompuesto."""
+    replica, G, SC = args[:3]
+    return f"G{G}_SC{SC}/replica_{replica:02d}"
+
+
+def _ejecutar_protegida(funcion: Callable[[Any], Any], args: Any) -> Tuple[bool, Any, Any]:
+    """
+    Ejecuta una tarea capturando sus errores, para que la falla de una tarea
+    no interrumpa al resto del pool. Con functools.partial es picklable.
+    
+    Args:
+        funcion: Función de la tarea
+        args: Argumentos de la tarea
+    
+    Returns:
+        Tupla (exito, args, resultado) o, si falla, (False, args, traceback)
+    """
+    try:
+        return True, args, funcion(args)
+    except Exception:
+        return False, args, traceback.format_exc()
+
+
+def _tamano_lote(num_tareas: int, num_procesos: int) -> int:
+    """
+    Calcula cuántas tareas enviar a cada proceso por vez.
+    
+    Lotes de ~num_tareas / (4 * num_procesos) tareas (el criterio de Pool.map)
+    amortizan la comunicación entre procesos sin dejar núcleos ociosos al
+    final: quedan al menos cuatro lotes por proceso para repartir.
+    
+    Args:
+        num_tareas: Cantidad total de tareas
+        num_procesos: Cantidad de procesos del pool
+    
+    Returns:
+        Tamaño de lote (al menos 1)
+    """
+    return max(1, num_tareas // (4 * num_procesos))
+
+
+def _ejecutar_en_pool(
+    funcion: Callable[[Any], Any],
+    tareas: List[Any],
+    num_procesos: int
+) -> Iterator[Any]:
+    """
+    Ejecuta todas las tareas en un único pool de procesos y entrega cada
+    resultado apenas termina (en cualquier orden).
+    
+    Args:
+        funcion: Función a aplicar a cada tarea (debe ser picklable)
+        tareas: Argumentos de cada tarea
+        num_procesos: Cantidad de procesos del pool
+    
+    Returns:
+        Iterador sobre los resultados, en orden de finalización
+    """
+    if not tareas:
+        return
+    with Pool(processes=num_procesos) as pool:
+        yield from pool.imap_unordered(funcion, tareas,
+                                       chunksize=_tamano_lote(len(tareas), num_procesos))
+
+
+class _AgregacionEscenario:
+    """
+    Agrega las réplicas de un escenario en orden de número de réplica aunque
+    terminen desordenadas: las que llegan antes de tiempo esperan a las
+    anteriores. Así el resumen no depende del orden de finalización y solo se
+    retienen las réplicas adelantadas.
+    """
+    
+    __slots__ = ('agregador', 'siguiente', 'adelantadas')
+    
+    def __init__(self):
+        self.agregador = AgregadorWelford(INDICADORES_ESCENARIO)
+        self.siguiente = 1
+        self.adelantadas: Dict[int, Dict[str, Any]] = {}
+    
+    def agregar(self, replica: int, resultados: Dict[str, Any]):
+        """
+        Recibe una réplica terminada.
+        
+        Args:
+            replica: Número de réplica
+            resultados: Resultados de la réplica
+        """
+        self.adelantadas[replica] = resultados
+        while self.siguiente in self.adelantadas:
+            self.agregador.agregar(self.adelantadas.pop(self.siguiente))
+            self.siguiente += 1
+
+
+def diferencias_pareadas(
+    replicas_a: List[Dict[str, Any]],
+    replicas_b: List[Dict[str, Any]],
+    indicadores: List[str]
+) -> Dict[str, Dict[str, float]]:
+    """
+    Calcula las diferencias pareadas (A - B) entre dos escenarios.
+    
+    Las réplicas se emparejan por su número de réplica. Con números aleatorios
+    comunes (CRN) la réplica k de ambos escenarios comparte los flujos
+    aleatorios, por lo que la varianza de la diferencia es mucho menor que la
+    de comparar escenarios independientes.
+    
+    Args:
+        replicas_a: Resultados de réplicas del escenario A (con clave 'replica')
+        replicas_b: Resultados de réplicas del escenario B (con clave 'replica')
+        indicadores: Indicadores a comparar
+        
+    Returns:
+        Diccionario {indicador: {media, desv, ic_inf, ic_sup, n}}
+    """
+    from scipy import stats
+    
+    por_replica_b = {r['replica']: r for r in replicas_b}
+    pares = [(r, por_replica_b[r['replica']]) for r in replicas_a if r['replica'] in por_replica_b]
+    
+    diferencias = {}
+    n = len(pares)
+    if n < 2:
+        return diferencias
+    t_critico = stats.t.ppf(0.975, n - 1)
+    
+    for indicador in indicadores:
+        valores = np.array([a[indicador] - b[indicador] for a, b in pares], dtype=float)
+        media = float(np.mean(valores))
+        desv_est = float(np.std(valores, ddof=1))
+        margen_error = float(t_critico * desv_est / np.sqrt(n))
+        diferencias[indicador] = {
+            'media': media,
+            'desv': desv_est,
+            'ic_inf': media - margen_error,
+            'ic_sup': media + margen_error,
+            'n': n
+        }
+    
+    return diferencias
+
+
 class Experimento:
     """
     Maneja el diseño y ejecución de experimentos de simulación.
     """
     
-    def __init__(self, directorio_resultados: str = "resultados_simulacion"):
+    def __init__(
+        self,
+        directorio_resultados: str = "resultados_simulacion",
+        usar_cache: bool = True,
+        max_reintentos: int = 2,
+        tiempo_simulacion: Optional[float] = None,
+        tiempo_calentamiento: Optional[float] = None,
+        escenarios: Optional[List[Tuple[int, int, int, int]]] = None
+    ):
         """
         Inicializa el experimento.
         
         Args:
             directorio_resultados: Directorio donde guardar resultados
+            usar_cache: Si reutilizar réplicas ya simuladas (ver CacheResultados),
+                guardadas en directorio_resultados/cache
+            max_reintentos: Veces que se reintenta cada tarea que falla
+            tiempo_simulacion: Horizonte de cada réplica en minutos (None =
+                Simulador.TIEMPO_SIMULACION, 10 años)
+            tiempo_calentamiento: Calentamiento de cada réplica en minutos
+                (None = Simulador.TIEMPO_CALENTAMIENTO, 30 días)
+            escenarios: Escenarios (G, SR, I, SC) a evaluar, ej. de un diseño
+                de diseno.py (None = grilla actual, ver generar_escenarios)
         """
         self.directorio_resultados = Path(directorio_resultados)
         self.directorio_resultados.mkdir(parents=True, exist_ok=True)
+        # Resultados de todas las réplicas (ver AlmacenResultados)
+        self.almacen = AlmacenResultados(self.directorio_resultados / "resultados.sqlite")
+        self.max_reintentos = max_reintentos
+        self.tiempo_simulacion = tiempo_simulacion
+        self.tiempo_calentamiento = tiempo_calentamiento
+        self.escenarios = escenarios
+        self.archivo_manifiesto = self.directorio_resultados / "manifiesto_barrido.json"
+        self.cache: Optional[CacheResultados] = (
+            CacheResultados(self.directorio_resultados / "cache") if usar_cache else None
+        )
+        # Agregación en curso de cada escenario (ver resumenes_en_curso)
+        self.agregaciones: Dict[Tuple[int, int, int, int], _AgregacionEscenario] = {}
     
     def generar_escenarios(self) -> List[Tuple[int, int, int, int]]:
         """
-        Genera todos los escenarios a evaluar.
+        Genera todos los escenarios a evaluar: los del diseño recibido o, si
+        no hay, la grilla actual (factorial completo de NIVELES_ACTUALES).
         Incluye escenarios con menos recursos que la dotación actual.
         
         Returns:
             Lista de tuplas (G, SR, I, SC)
         """
-        escenarios = []
+        if self.escenarios is not None:
+            return list(self.escenarios)
         
         # Grid ajustado según pedido
         # G (médicos): [2, 3, 4]
         # SC (consultorios): [2, 3, 4, 5]
         # SR (salas recuperación): [15, 24, 30]
         # I (incubadoras): [10, 15, 20]
-        for G in [2, 3, 4]:
-            for SC in [2, 3, 4, 5]:
-                for SR in [15, 24, 30]:
-                    for I in [10, 15, 20]:
-                        escenarios.append((G, SR, I, SC))
-        
-        return escenarios
+        return a_escenarios(factorial_completo(NIVELES_ACTUALES))
     
     def ejecutar_escenario(
         self,
@@ -86,11 +320,17 @@ class Experimento:
         num_replicas: int = 30,
         semilla_base: int = 42,
         mostrar_progreso: bool = False,
-        num_procesos: int = None
+        num_procesos: int = None,
+        crn: bool = True,
+        regla: Optional[ReglaDetencion] = None
     ) -> Dict[str, Any]:
         """
         Ejecuta un escenario completo con múltiples réplicas en paralelo.
         
+        Con una regla de detención la cantidad de réplicas es secuencial: se
+        simulan en lotes paralelos hasta alcanzar la precisión pedida (ver
+        _ejecutar_secuencial) y num_replicas se ignora.
+        
         Args:
             G: Cantidad de médicos
             SR: Cantidad de salas de recuperación
@@ -100,60 +340,991 @@ class Experimento:
             semilla_base: Semilla base para generar semillas únicas
             mostrar_progreso: Si mostrar progreso por consola
             num_procesos: Número de procesos paralelos (None = usar todos los núcleos)
+            crn: Si usar números aleatorios comunes (la réplica k usa los mismos
+                flujos aleatorios en todas las configuraciones)
+            regla: Regla de detención de la replicación secuencial (None =
+                exactamente num_replicas réplicas)
             
         Returns:
             Diccionario con resultados agregados del escenario
         """
         nombre_escenario = f"G{G}_SR{SR}_I{I}_SC{SC}"
-        directorio_escenario = self.directorio_resultados / nombre_escenario
-        directorio_escenario.mkdir(parents=True, exist_ok=True)
         
         # Determinar número de procesos
         # Limitar a un máximo razonable para evitar problemas de memoria en Windows
         if num_procesos is None:
             num_procesos = cpu_count()
         
+        if regla is not None:
+            return self._ejecutar_secuencial([(G, SR, I, SC)], regla, semilla_base,
+                                             mostrar_progreso, num_procesos, crn)[0]
+        
         # Preparar argumentos para cada réplica
-        args_replicas = []
-        for replica in range(1, num_replicas + 1):
-            semilla = semilla_base + replica * 1000 + G * 100 + SR * 10 + I + SC
-            args_replicas.append((
-                replica, G, SR, I, SC, semilla, 
-                str(directorio_escenario), nombre_escenario
-            ))
+        args_replicas = self._tareas_escenario(G, SR, I, SC, num_replicas, semilla_base, crn)
         
         # Ejecutar réplicas en paralelo
         if mostrar_progreso:
             print(f"  Ejecutando {num_replicas} réplicas en paralelo ({num_procesos} procesos)...")
         
-        replicas_dict = {}
+        # Agregar las réplicas a medida que terminan (las que fallan se
+        # reintentan individualmente, ver _ejecutar_tareas)
+        agregacion = self.agregaciones[(G, SR, I, SC)] = _AgregacionEscenario()
+        try:
+            for _, replica, resultados in self._ejecutar_replicas(args_replicas, num_procesos):
+                agregacion.agregar(replica, resultados)
+        finally:
+            self.almacen.confirmar()
+        
+        if mostrar_progreso:
+            print(f"  ✓ Réplicas completadas para {nombre_escenario}")
+        
+        return self._resumir_escenario((G, SR, I, SC), agregacion.agregador)
+    
+    def _ejecutar_secuencial(
+        self,
+        escenarios: List[Tuple[int, int, int, int]],
+        regla: ReglaDetencion,
+        semilla_base: int,
+        mostrar_progreso: bool,
+        num_procesos: int,
+        crn: bool
+    ) -> List[Dict[str, Any]]:
+        """
+        Ejecuta escenarios con replicación secuencial: en cada ronda se
+        simula un lote de réplicas de cada escenario que todavía no alcanzó
+        la precisión de la regla, todos en un único pool. Un escenario se da
+        por terminado al cumplir la regla o al llegar a regla.max_replicas,
+        por lo que el cómputo se concentra en los escenarios de mayor varianza.
+        
+        Las réplicas se numeran 1, 2, ... igual que con un número fijo de
+        réplicas, por lo que se mantienen los números aleatorios comunes.
+        
+        Args:
+            escenarios: Lista de tuplas (G, SR, I, SC)
+            regla: Regla de detención
+            semilla_base: Semilla base para generar semillas únicas
+            mostrar_progreso: Si mostrar progreso por consola
+            num_procesos: Número de procesos paralelos
+            crn: Si usar números aleatorios comunes entre escenarios
+            
+        Returns:
+            Lista con resultados de todos los escenarios (en el orden de
+            escenarios); cada resumen indica si alcanzó la precisión
+        """
+        lote = regla.lote or num_procesos
+        self.agregaciones = {escenario: _AgregacionEscenario() for escenario in escenarios}
+        simuladas = {escenario: 0 for escenario in escenarios}
+        resumenes: Dict[Tuple[int, int, int, int], Dict[str, Any]] = {}
+        activos = list(escenarios)
+        ronda = 0
+        
+        try:
+            while activos:
+                ronda += 1
+                tareas = []
+                for escenario in activos:
+                    hechas = simuladas[escenario]
+                    objetivo = regla.min_replicas if hechas == 0 else min(hechas + lote, regla.max_replicas)
+                    tareas.extend(self._tareas_escenario(*escenario, objetivo, semilla_base, crn)[hechas:])
+                    simuladas[escenario] = objetivo
+                if mostrar_progreso:
+                    print(f"Ronda {ronda}: {len(tareas)} réplicas de {len(activos)} escenarios")
+                
+                for escenario, replica, resultados in self._ejecutar_replicas(tareas, num_procesos):
+                    self.agregaciones[escenario].agregar(replica, resultados)
+                
+                siguen = []
+                for escenario in activos:
+                    agregador = self.agregaciones[escenario].agregador
+                    cumplida = regla.cumplida(agregador)
+                    if not cumplida and simuladas[escenario] < regla.max_replicas:
+                        siguen.append(escenario)
+                        continue
+                    resumen = self._estadisticas_agregador(escenario, agregador)
+                    resumen['precision_alcanzada'] = cumplida
+                    resumenes[escenario] = self._resumir_escenario(escenario, agregador, resumen)
+                    if mostrar_progreso:
+                        G, SR, I, SC = escenario
+                        semiamplitudes = ", ".join(f"{indicador} ±{valor:.3g}" for indicador, valor
+                                                   in regla.semiamplitudes(agregador).items())
+                        print(f"[{len(resumenes)}/{len(escenarios)}] {'✓' if cumplida else '⚠'} "
+                              f"Escenario: G={G}, SR={SR}, I={I}, SC={SC} - "
+                              f"{agregador.cantidad} réplicas ({semiamplitudes})")
+                activos = siguen
+        finally:
+            self.almacen.confirmar()
+        
+        return [resumenes[escenario] for escenario in escenarios]
+    
+    def _ejecutar_con_cribado(
+        self,
+        escenarios: List[Tuple[int, int, int, int]],
+        num_replicas: int,
+        cribado: List[int],
+        semilla_base: int,
+        mostrar_progreso: bool,
+        num_procesos: int,
+        crn: bool
+    ) -> List[Dict[str, Any]]:
+        """
+        Ejecuta escenarios por etapas, descartando los dominados: en cada
+        etapa los escenarios que siguen se llevan a la cantidad de réplicas
+        de la etapa (todos en un único pool) y se descartan los dominados en
+        sentido de Pareto con confianza en INDICADORES_CRIBADO (ver
+        dominados_pareto). Solo los que sobreviven a todas las etapas llegan
+        a num_replicas réplicas.
+        
+        Las réplicas se numeran 1, 2, ... igual que sin cribado, por lo que se
+        mantienen los números aleatorios comunes.
+        
+        Args:
+            escenarios: Lista de tuplas (G, SR, I, SC)
+            num_replicas: Réplicas finales de los escenarios no descartados
+            cribado: Réplicas al final de cada etapa de cribado (ej. [5, 10])
+            semilla_base: Semilla base para generar semillas únicas
+            mostrar_progreso: Si mostrar progreso por consola
+            num_procesos: Número de procesos paralelos
+            crn: Si usar números aleatorios comunes entre escenarios
+        
+        Returns:
+            Lista con resultados de todos los escenarios (en el orden de
+            escenarios); cada resumen indica en qué etapa se descartó el
+            escenario (etapa_descarte, vacío si no se descartó) y un escenario
+            que lo domina (dominado_por)
+        """
+        etapas = sorted({replicas for replicas in cribado if replicas < num_replicas}) + [num_replicas]
+        indices = [INDICADORES_ESCENARIO.index(indicador) for indicador in INDICADORES_CRIBADO]
+        self.agregaciones = {escenario: _AgregacionEscenario() for escenario in escenarios}
+        resumenes: Dict[Tuple[int, int, int, int], Dict[str, Any]] = {}
+        activos = list(escenarios)
+        simuladas = 0
+        
         try:
-            with Pool(processes=num_procesos) as pool:
-                resultados_paralelos = pool.map(_ejecutar_replica_individual, args_replicas)
-        except Exception as e:
+            for etapa, replicas_etapa in enumerate(etapas, 1):
+                tareas = []
+                for G, SR, I, SC in activos:
+                    tareas.extend(self._tareas_escenario(G, SR, I, SC, replicas_etapa,
+                                                         semilla_base, crn)[simuladas:])
+                simuladas = replicas_etapa
+                if mostrar_progreso:
+                    print(f"Etapa {etapa}: {len(activos)} escenarios hasta {replicas_etapa} réplicas "
+                          f"({len(tareas)} réplicas)")
+                for escenario, replica, resultados in self._ejecutar_replicas(tareas, num_procesos):
+                    self.agregaciones[escenario].agregar(replica, resultados)
+                if etapa == len(etapas):
+                    break
+                
+                # Descartar los dominados con confianza
+                agregadores = [self.agregaciones[escenario].agregador for escenario in activos]
+                medias = np.array([agregador.media[indices] for agregador in agregadores])
+                margenes = np.nan_to_num(np.array([agregador.margen_error()[indices]
+                                                   for agregador in agregadores]), nan=np.inf)
+                dominantes = dominados_pareto(medias - margenes, medias + margenes)
+                for escenario, agregador, dominante in zip(activos, agregadores, dominantes):
+                    if dominante < 0:
+                        continue
+                    resumen = self._estadisticas_agregador(escenario, agregador)
+                    resumen['etapa_descarte'] = etapa
+                    resumen['dominado_por'] = "G{}_SR{}_I{}_SC{}".format(*activos[dominante])
+                    resumenes[escenario] = self._resumir_escenario(escenario, agregador, resumen)
+                activos = [escenario for escenario, dominante in zip(activos, dominantes) if dominante < 0]
+                if mostrar_progreso:
+                    print(f"  Descartados: {len(agregadores) - len(activos)} - siguen: {len(activos)}")
+        finally:
+            self.almacen.confirmar()
+        
+        for escenario in activos:
+            agregador = self.agregaciones[escenario].agregador
+            resumen = self._estadisticas_agregador(escenario, agregador)
+            resumen['etapa_descarte'] = ''
+            resumen['dominado_por'] = ''
+            resumenes[escenario] = self._resumir_escenario(escenario, agregador, resumen)
             if mostrar_progreso:
-                print(f"  Error en paralelización: {e}")
-                print(f"  Reintentando con menos procesos...")
-            # Reintentar con menos procesos si falla
-            num_procesos_reducido = max(1, num_procesos // 2)
-            with Pool(processes=num_procesos_reducido) as pool:
-                resultados_paralelos = pool.map(_ejecutar_replica_individual, args_replicas)
+                G, SR, I, SC = escenario
+                print(f"✓ Escenario no dominado: G={G}, SR={SR}, I={I}, SC={SC}")
+        
+        return [resumenes[escenario] for escenario in escenarios]
+    
+    def seleccionar_ocba(
+        self,
+        presupuesto: int,
+        mejores: int = 4,
+        objetivo: str = 'score',
+        maximizar: bool = False,
+        replicas_iniciales: int = 5,
+        incremento: Optional[int] = None,
+        pcs_objetivo: Optional[float] = None,
+        semilla_base: int = 42,
+        mostrar_progreso: bool = True,
+        num_procesos: int = None,
+        crn: bool = True,
+        escenarios: Optional[List[Tuple[int, int, int, int]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Elige los mejores escenarios con asignación óptima del presupuesto de
+        cómputo (OCBA, ver seleccion.py): tras replicas_iniciales réplicas de
+        cada escenario, cada ronda reparte incremento réplicas más entre los
+        escenarios que todavía compiten por un lugar entre los mejores (medias
+        cercanas al corte o de mucha varianza), en lugar de dar a todos la
+        misma cantidad.
+        
+        Las réplicas se numeran 1, 2, ... en cada escenario, por lo que se
+        mantienen los números aleatorios comunes y se reutiliza la caché.
+        
+        Args:
+            presupuesto: Réplicas totales (incluidas las iniciales)
+            mejores: Cantidad de escenarios a seleccionar
+            objetivo: 'score' (score combinado, ver PESOS_SCORE) o el nombre
+                de un indicador de INDICADORES_ESCENARIO
+            maximizar: Si el indicador objetivo se maximiza (ej. PTOSR_promedio)
+            replicas_iniciales: Réplicas de cada escenario en la primera ronda
+            incremento: Réplicas por ronda (None = dos por proceso)
+            pcs_objetivo: Detenerse antes si la PCS aproximada lo alcanza
+            semilla_base: Semilla base para generar semillas únicas
+            mostrar_progreso: Si mostrar progreso por consola
+            num_procesos: Número de procesos paralelos (None = usar todos los núcleos)
+            crn: Si usar números aleatorios comunes entre escenarios
+            escenarios: Escenarios candidatos (None = generar_escenarios())
         
-        # Organizar resultados por número de réplica
-        for replica, resultados in resultados_paralelos:
-            replicas_dict[replica] = resultados
+        Returns:
+            Diccionario con los mejores escenarios, el ranking completo, la
+            PCS aproximada, las réplicas usadas y los resúmenes de todos los
+            escenarios (también guardados en seleccion_ocba.json y en
+            resumen_escenarios.csv)
+        """
+        if escenarios is None:
+            escenarios = self.generar_escenarios()
+        if num_procesos is None:
+            num_procesos = cpu_count()
+        incremento = incremento or 2 * num_procesos
+        if objetivo != 'score' and objetivo not in INDICADORES_ESCENARIO:
+            raise ValueError(f"Objetivo desconocido: {objetivo}")
+        if not 1 <= mejores < len(escenarios):
+            raise ValueError("Se requiere 1 <= mejores < cantidad de escenarios")
+        if replicas_iniciales < 2 or presupuesto < replicas_iniciales * len(escenarios):
+            raise ValueError("Se requieren al menos 2 réplicas iniciales por escenario dentro del presupuesto")
+        
+        columnas = list(PESOS_SCORE) if objetivo == 'score' else [objetivo]
+        signo = -1.0 if maximizar else 1.0
+        # Valores del objetivo de cada réplica, por escenario y número de réplica
+        valores: Dict[Tuple[int, int, int, int], Dict[int, List[float]]] = {e: {} for e in escenarios}
+        self.agregaciones = {escenario: _AgregacionEscenario() for escenario in escenarios}
+        simuladas = np.zeros(len(escenarios), dtype=int)
+        agregar = np.full(len(escenarios), replicas_iniciales)
         
-        # Convertir a lista ordenada
-        replicas = [replicas_dict[i] for i in range(1, num_replicas + 1)]
+        def estadisticas_objetivo() -> Tuple[np.ndarray, np.ndarray]:
+            """Media y varianza del objetivo (menor es mejor) de cada escenario."""
+            por_escenario = [
+                np.array([valores[e][r] for r in sorted(valores[e])], dtype=float) for e in escenarios
+            ]
+            if objetivo == 'score':
+                medias_indicadores = np.array([v.mean(axis=0) for v in por_escenario])
+                muestras = [score_por_replica(v, medias_indicadores) for v in por_escenario]
+            else:
+                muestras = [signo * v[:, 0] for v in por_escenario]
+            return (np.array([m.mean() for m in muestras]),
+                    np.array([m.var(ddof=1) for m in muestras]))
+        
+        print(f"\n{'='*80}")
+        print(f"SELECCIÓN DE LOS MEJORES ESCENARIOS (OCBA)")
+        print(f"{'='*80}")
+        print(f"Escenarios candidatos: {len(escenarios)} - a seleccionar: {mejores}")
+        print(f"Objetivo: {objetivo}{' (maximizar)' if maximizar else ''}")
+        print(f"Presupuesto: {presupuesto} réplicas ({replicas_iniciales} iniciales por escenario, "
+              f"{incremento} por ronda)")
+        print(f"Procesos paralelos: {num_procesos} (de {cpu_count()} núcleos disponibles)")
+        print(f"{'='*80}\n")
+        
+        ronda = 0
+        try:
+            while True:
+                ronda += 1
+                tareas = []
+                for i, escenario in enumerate(escenarios):
+                    if agregar[i] == 0:
+                        continue
+                    total = simuladas[i] + agregar[i]
+                    tareas.extend(self._tareas_escenario(*escenario, total, semilla_base, crn)[simuladas[i]:])
+                    simuladas[i] = total
+                for escenario, replica, resultados in self._ejecutar_replicas(tareas, num_procesos):
+                    self.agregaciones[escenario].agregar(replica, resultados)
+                    valores[escenario][replica] = [float(resultados.get(c, np.nan)) for c in columnas]
+                
+                medias, varianzas = estadisticas_objetivo()
+                pcs = probabilidad_seleccion_correcta(medias, varianzas, simuladas, mejores)
+                if mostrar_progreso:
+                    print(f"Ronda {ronda}: {len(tareas)} réplicas simuladas, "
+                          f"{simuladas.sum()}/{presupuesto} usadas - PCS aproximada: {pcs:.3f}")
+                
+                restante = presupuesto - simuladas.sum()
+                if restante <= 0 or (pcs_objetivo is not None and pcs >= pcs_objetivo):
+                    break
+                paso = min(incremento, restante)
+                asignacion = asignacion_ocba(medias, varianzas, simuladas.sum() + paso, mejores)
+                agregar = repartir_incremento(asignacion, simuladas, paso)
+        finally:
+            self.almacen.confirmar()
+        
+        resumenes = [self._resumir_escenario(e, self.agregaciones[e].agregador) for e in escenarios]
+        self._guardar_resumen_general(resumenes)
+        
+        filas = ranking(escenarios, medias, np.sqrt(varianzas), simuladas)
+        for fila in filas:
+            # Volver a las unidades del indicador si se maximiza
+            fila['media'] *= signo
+        seleccion = {
+            'objetivo': objetivo,
+            'maximizar': maximizar,
+            'mejores': filas[:mejores],
+            'pcs': pcs,
+            'replicas_totales': int(simuladas.sum()),
+            'rondas': ronda,
+            'ranking': filas
+        }
+        with open(self.directorio_resultados / "seleccion_ocba.json", 'w', encoding='utf-8') as f:
+            json.dump(seleccion, f, indent=2, ensure_ascii=False)
         
         if mostrar_progreso:
-            print(f"  ✓ Réplicas completadas para {nombre_escenario}")
+            print(f"\nMejores {mejores} escenarios ({objetivo}, PCS aproximada {pcs:.3f}, "
+                  f"{simuladas.sum()} réplicas):")
+            for posicion, fila in enumerate(filas[:mejores], 1):
+                print(f"  {posicion}. G={fila['G']}, SR={fila['SR']}, I={fila['I']}, SC={fila['SC']} - "
+                      f"{fila['media']:.4g} ± {fila['desv']:.3g} ({fila['num_replicas']} réplicas)")
         
+        seleccion['resumenes'] = resumenes
+        return seleccion
+    
+    def ejecutar_multifidelidad(
+        self,
+        num_replicas: int = 30,
+        replicas_cortas: int = 5,
+        tiempo_corto: float = 365 * 24 * 60,
+        fraccion: float = 0.25,
+        calibracion: int = 4,
+        objetivo: str = 'score',
+        semilla_base: int = 42,
+        mostrar_progreso: bool = True,
+        num_procesos: int = None,
+        crn: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Barrido multi-fidelidad: todas las configuraciones se evalúan con
+        réplicas cortas (tiempo_corto de horizonte) y solo la mejor fracción
+        según el objetivo se promueve al horizonte completo del experimento.
+        
+        Para estimar cuánto se parece el ranking corto al completo, además se
+        simulan con el horizonte completo calibracion configuraciones no
+        promovidas (repartidas a lo largo del ranking corto); la correlación
+        de Spearman entre ambos rankings se calcula sobre todas las
+        configuraciones con horizonte completo.
+        
+        Las réplicas cortas usan un experimento propio en
+        directorio_resultados/fidelidad_baja (almacén, caché y resúmenes
+        separados); el resumen general del experimento solo tiene
+        configuraciones con horizonte completo.
+        
+        Args:
+            num_replicas: Réplicas de horizonte completo por configuración promovida
+            replicas_cortas: Réplicas de horizonte corto por configuración
+            tiempo_corto: Horizonte de las réplicas cortas en minutos (default: 1 año)
+            fraccion: Fracción de configuraciones a promover
+            calibracion: Configuraciones no promovidas a simular también con
+                horizonte completo para estimar la correlación
+            objetivo: 'score' (score combinado, ver PESOS_SCORE) o el nombre
+                de un indicador a minimizar
+            semilla_base: Semilla base para generar semillas únicas
+            mostrar_progreso: Si mostrar progreso por consola
+            num_procesos: Número de procesos paralelos (None = usar todos los núcleos)
+            crn: Si usar números aleatorios comunes entre escenarios
+        
+        Returns:
+            Diccionario con las configuraciones promovidas, la correlación de
+            Spearman entre rankings, el ranking corto y los resúmenes con
+            horizonte completo (también guardado en multifidelidad.json)
+        """
+        from scipy import stats
+        
+        escenarios = self.generar_escenarios()
+        if num_procesos is None:
+            num_procesos = cpu_count()
+        if objetivo != 'score' and objetivo not in INDICADORES_ESCENARIO:
+            raise ValueError(f"Objetivo desconocido: {objetivo}")
+        if not 0 < fraccion <= 1:
+            raise ValueError("Se requiere 0 < fraccion <= 1")
+        calentamiento = (Simulador.TIEMPO_CALENTAMIENTO if self.tiempo_calentamiento is None
+                         else self.tiempo_calentamiento)
+        corto = Experimento(self.directorio_resultados / "fidelidad_baja",
+                            usar_cache=self.cache is not None,
+                            max_reintentos=self.max_reintentos,
+                            tiempo_simulacion=tiempo_corto,
+                            tiempo_calentamiento=min(calentamiento, tiempo_corto / 2))
+        
+        def valores_objetivo(resumenes: List[Dict[str, Any]]) -> np.ndarray:
+            """Objetivo de cada configuración (menor es mejor) a partir de sus medias."""
+            if objetivo != 'score':
+                return np.array([resumen[f'{objetivo}_media'] for resumen in resumenes])
+            medias = np.array([[resumen[f'{indicador}_media'] for indicador in PESOS_SCORE]
+                               for resumen in resumenes])
+            return score_por_replica(medias, medias)
+        
+        print(f"\n{'='*80}")
+        print(f"EJECUTANDO EXPERIMENTOS (MULTI-FIDELIDAD)")
+        print(f"{'='*80}")
+        print(f"Total de escenarios: {len(escenarios)}")
+        print(f"Fidelidad baja: {replicas_cortas} réplicas de {tiempo_corto / (24 * 60):.0f} días")
+        print(f"Fidelidad alta: {num_replicas} réplicas para el {fraccion:.0%} mejor según {objetivo} "
+              f"(+{calibracion} de calibración)")
+        print(f"Procesos paralelos: {num_procesos} (de {cpu_count()} núcleos disponibles)")
+        print(f"{'='*80}\n")
+        
+        # Fidelidad baja: todas las configuraciones
+        tareas = []
+        for G, SR, I, SC in escenarios:
+            tareas.extend(corto._tareas_escenario(G, SR, I, SC, replicas_cortas, semilla_base, crn))
+        try:
+            resumenes_cortos = corto._resumir_a_medida(escenarios, replicas_cortas,
+                                                       corto._ejecutar_replicas(tareas, num_procesos),
+                                                       mostrar_progreso)
+        finally:
+            corto.almacen.confirmar()
+        corto._guardar_resumen_general(resumenes_cortos)
+        
+        # Promover la mejor fracción y algunas configuraciones de calibración
+        objetivo_corto = valores_objetivo(resumenes_cortos)
+        orden = [int(i) for i in np.argsort(objetivo_corto, kind='stable')]
+        num_promovidos = max(1, int(np.ceil(fraccion * len(escenarios))))
+        promovidos = orden[:num_promovidos]
+        resto = orden[num_promovidos:]
+        calibrados = [resto[int(i)] for i in np.unique(
+            np.linspace(0, len(resto) - 1, min(calibracion, len(resto))).round().astype(int)
+        )] if resto and calibracion > 0 else []
+        completos = sorted(promovidos + calibrados)
+        
+        if mostrar_progreso:
+            print(f"\nPromovidas al horizonte completo: {len(promovidos)} configuraciones "
+                  f"(+{len(calibrados)} de calibración)\n")
+        
+        # Fidelidad alta: solo las configuraciones promovidas y de calibración
+        escenarios_completos = [escenarios[i] for i in completos]
+        tareas = []
+        for G, SR, I, SC in escenarios_completos:
+            tareas.extend(self._tareas_escenario(G, SR, I, SC, num_replicas, semilla_base, crn))
+        try:
+            resumenes = self._resumir_a_medida(escenarios_completos, num_replicas,
+                                               self._ejecutar_replicas(tareas, num_procesos),
+                                               mostrar_progreso)
+        finally:
+            self.almacen.confirmar()
+        for i, resumen in zip(completos, resumenes):
+            resumen['promovido'] = i in promovidos
+            resumen['posicion_corta'] = orden.index(i) + 1
+        self._guardar_resumen_general(resumenes)
+        
+        # Correlación entre el ranking corto y el completo
+        correlacion = None
+        if len(completos) >= 3:
+            # Ambos objetivos normalizados sobre las mismas configuraciones
+            cortos = valores_objetivo([resumenes_cortos[i] for i in completos])
+            correlacion = float(stats.spearmanr(cortos, valores_objetivo(resumenes)).correlation)
+        
+        multifidelidad = {
+            'objetivo': objetivo,
+            'tiempo_corto': tiempo_corto,
+            'replicas_cortas': replicas_cortas,
+            'promovidos': [list(escenarios[i]) for i in promovidos],
+            'calibracion': [list(escenarios[i]) for i in calibrados],
+            'spearman': correlacion,
+            'ranking_corto': [list(escenarios[i]) for i in orden]
+        }
+        with open(self.directorio_resultados / "multifidelidad.json", 'w', encoding='utf-8') as f:
+            json.dump(multifidelidad, f, indent=2, ensure_ascii=False)
+        
+        if mostrar_progreso and correlacion is not None:
+            print(f"\nCorrelación de Spearman entre el ranking corto y el completo "
+                  f"({len(completos)} configuraciones): {correlacion:.3f}")
+        
+        multifidelidad['resumenes'] = resumenes
+        return multifidelidad
+    
+    def optimizar(
+        self,
+        restricciones: Optional[Dict[str, float]] = None,
+        meses_amortizacion: float = 120,
+        rangos: Optional[Dict[str, Tuple[int, int]]] = None,
+        inicio: Optional[Tuple[int, int, int, int]] = None,
+        iteraciones: int = 20,
+        candidatos: Optional[int] = None,
+        replicas_iniciales: int = 5,
+        replicas_maximas: int = 30,
+        semilla_base: int = 42,
+        mostrar_progreso: bool = True,
+        num_procesos: int = None,
+        crn: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Busca la configuración (G, SR, I, SC) entera de menor costo mensual
+        (CTM + CII amortizado) que cumple las restricciones, con búsqueda por
+        vecindarios COMPASS (ver optimizacion.py): en cada iteración se
+        muestrean configuraciones nuevas del área más prometedora (las más
+        cercanas a la mejor que a cualquier otra visitada) y se simulan junto
+        con la mejor, todas en un único pool. La mejor suma una réplica por
+        iteración (hasta replicas_maximas), de modo que la búsqueda no se
+        queda con una configuración que pareció buena por azar. Cuando el área
+        no tiene configuraciones sin visitar, la mejor se lleva directamente a
+        replicas_maximas; si lo sigue siendo, la búsqueda convergió.
+        
+        Las configuraciones se comparan primero por la violación de las
+        restricciones (medias) y después por el objetivo, por lo que una
+        configuración factible siempre es mejor que una infactible. Las
+        réplicas se numeran 1, 2, ... en cada configuración, por lo que se
+        mantienen los números aleatorios comunes y se reutiliza la caché.
+        
+        Args:
+            restricciones: Cota superior de indicadores de INDICADORES_ESCENARIO
+                (ej. {'PPDSR': 0.05, 'PEC_general': 0.1})
+            meses_amortizacion: Meses en que se amortiza el costo inicial (CII)
+            rangos: Rango (mínimo, máximo) de cada factor (None = los de la
+                grilla actual); los factores que falten toman el de la grilla
+            inicio: Configuración inicial (None = centro de los rangos)
+            iteraciones: Iteraciones como máximo
+            candidatos: Configuraciones nuevas por iteración (None = una por proceso)
+            replicas_iniciales: Réplicas de cada configuración al visitarla
+            replicas_maximas: Réplicas de la mejor configuración como máximo
+            semilla_base: Semilla base para generar semillas únicas
+            mostrar_progreso: Si mostrar progreso por consola
+            num_procesos: Número de procesos paralelos (None = usar todos los núcleos)
+            crn: Si usar números aleatorios comunes entre escenarios
+        
+        Returns:
+            Diccionario con la mejor configuración, si es factible, si la
+            búsqueda convergió (el área más prometedora no tiene
+            configuraciones sin visitar), el historial de iteraciones y los
+            resúmenes de todas las configuraciones visitadas (también
+            guardados en optimizacion.json y en resumen_escenarios.csv)
+        """
+        restricciones = dict(restricciones or {})
+        if num_procesos is None:
+            num_procesos = cpu_count()
+        candidatos = candidatos or max(num_procesos, 2)
+        for indicador in restricciones:
+            if indicador not in INDICADORES_ESCENARIO:
+                raise ValueError(f"Indicador de restricción desconocido: {indicador}")
+        if meses_amortizacion <= 0:
+            raise ValueError("Los meses de amortización deben ser positivos")
+        if not 2 <= replicas_iniciales <= replicas_maximas:
+            raise ValueError("Se requiere 2 <= replicas_iniciales <= replicas_maximas")
+        
+        rangos_completos = {factor: (min(valores), max(valores)) for factor, valores in NIVELES_ACTUALES.items()}
+        rangos_completos.update(rangos or {})
+        minimos = np.array([rangos_completos[factor][0] for factor in FACTORES])
+        maximos = np.array([rangos_completos[factor][1] for factor in FACTORES])
+        if np.any(minimos < 1) or np.any(minimos > maximos):
+            raise ValueError(f"Rangos inválidos: {rangos_completos}")
+        if inicio is None:
+            inicio = tuple(int(v) for v in np.round((minimos + maximos) / 2))
+        if np.any(np.array(inicio) < minimos) or np.any(np.array(inicio) > maximos):
+            raise ValueError(f"La configuración inicial {inicio} está fuera de los rangos")
+        
+        generador = np.random.default_rng(semilla_base)
+        self.agregaciones = {}
+        evaluaciones: Dict[Tuple[int, int, int, int], Tuple[float, float]] = {}
+        visitados: List[Tuple[int, int, int, int]] = []
+        historial = []
+        mejor = inicio
+        convergencia = False
+        
+        def clave_orden(configuracion: Tuple[int, int, int, int]) -> Tuple[float, float]:
+            """Violación y objetivo de una configuración (menor es mejor)."""
+            objetivo, violacion = evaluaciones[configuracion]
+            return violacion, objetivo
+        
+        print(f"\n{'='*80}")
+        print(f"OPTIMIZACIÓN DE LA CONFIGURACIÓN (COMPASS)")
+        print(f"{'='*80}")
+        print(f"Objetivo: CTM + CII / {meses_amortizacion:g} meses")
+        print(f"Restricciones: {', '.join(f'{i} <= {v:g}' for i, v in restricciones.items()) or 'ninguna'}")
+        print(f"Rangos: {', '.join(f'{f}={rangos_completos[f][0]}-{rangos_completos[f][1]}' for f in FACTORES)}")
+        print(f"Iteraciones: {iteraciones} - {candidatos} configuraciones nuevas por iteración, "
+              f"{replicas_iniciales}-{replicas_maximas} réplicas")
+        print(f"Procesos paralelos: {num_procesos} (de {cpu_count()} núcleos disponibles)")
+        print(f"{'='*80}\n")
+        
+        try:
+            for iteracion in range(1, iteraciones + 1):
+                nuevos = [inicio] if not visitados else []
+                nuevos += muestrear_region(mejor, visitados + nuevos, minimos, maximos,
+                                           candidatos, generador)
+                objetivos_replicas = {configuracion: replicas_iniciales for configuracion in nuevos}
+                if visitados:
+                    replicas_mejor = self.agregaciones[mejor].agregador.cantidad
+                    if not nuevos and replicas_mejor >= replicas_maximas:
+                        convergencia = True
+                        break
+                    if nuevos:
+                        objetivos_replicas[mejor] = min(replicas_mejor + 1, replicas_maximas)
+                    else:
+                        # Área agotada: confirmar la mejor con todas sus réplicas
+                        objetivos_replicas[mejor] = replicas_maximas
+                
+                # Simular las configuraciones nuevas y completar la mejor, en un único pool
+                tareas = []
+                for configuracion, total in objetivos_replicas.items():
+                    agregacion = self.agregaciones.setdefault(configuracion, _AgregacionEscenario())
+                    simuladas = agregacion.agregador.cantidad
+                    tareas.extend(self._tareas_escenario(*configuracion, total, semilla_base, crn)[simuladas:])
+                for configuracion, replica, resultados in self._ejecutar_replicas(tareas, num_procesos):
+                    self.agregaciones[configuracion].agregar(replica, resultados)
+                
+                visitados.extend(nuevos)
+                for configuracion in objetivos_replicas:
+                    resumen = self._estadisticas_agregador(configuracion, self.agregaciones[configuracion].agregador)
+                    evaluaciones[configuracion] = evaluar_solucion(resumen, restricciones, meses_amortizacion)
+                mejor = min(visitados, key=clave_orden)
+                objetivo, violacion = evaluaciones[mejor]
+                historial.append({
+                    'iteracion': iteracion,
+                    'G': mejor[0], 'SR': mejor[1], 'I': mejor[2], 'SC': mejor[3],
+                    'objetivo': objetivo,
+                    'violacion': violacion,
+                    'num_replicas': self.agregaciones[mejor].agregador.cantidad,
+                    'visitadas': len(visitados)
+                })
+                if mostrar_progreso:
+                    G, SR, I, SC = mejor
+                    print(f"Iteración {iteracion}: {len(nuevos)} nuevas, {len(tareas)} réplicas - "
+                          f"mejor G={G}, SR={SR}, I={I}, SC={SC}: {objetivo:,.0f}/mes"
+                          f"{'' if violacion == 0 else f' (infactible, violación {violacion:.3g})'}")
+        finally:
+            self.almacen.confirmar()
+        
+        resumenes = []
+        for configuracion in visitados:
+            agregador = self.agregaciones[configuracion].agregador
+            resumen = self._estadisticas_agregador(configuracion, agregador)
+            resumen['objetivo_optimizacion'], violacion = evaluaciones[configuracion]
+            resumen['factible'] = violacion == 0
+            resumenes.append(self._resumir_escenario(configuracion, agregador, resumen))
+        self._guardar_resumen_general(resumenes)
+        
+        objetivo, violacion = evaluaciones[mejor]
+        resumen_mejor = resumenes[visitados.index(mejor)]
+        optimizacion = {
+            'mejor': {
+                'G': mejor[0], 'SR': mejor[1], 'I': mejor[2], 'SC': mejor[3],
+                'objetivo': objetivo,
+                'factible': violacion == 0,
+                'num_replicas': resumen_mejor['num_replicas'],
+                **{f'{indicador}_media': resumen_mejor[f'{indicador}_media']
+                   for indicador in ['CTM', 'CII'] + list(restricciones)}
+            },
+            'restricciones': restricciones,
+            'meses_amortizacion': meses_amortizacion,
+            'rangos': {factor: list(rangos_completos[factor]) for factor in FACTORES},
+            'convergencia': convergencia,
+            'iteraciones': len(historial),
+            'configuraciones_visitadas': len(visitados),
+            'replicas_totales': int(sum(resumen['num_replicas'] for resumen in resumenes)),
+            'historial': historial
+        }
+        with open(self.directorio_resultados / "optimizacion.json", 'w', encoding='utf-8') as f:
+            json.dump(optimizacion, f, indent=2, ensure_ascii=False)
+        
+        if mostrar_progreso:
+            G, SR, I, SC = mejor
+            estado = 'factible' if violacion == 0 else 'ninguna configuración visitada es factible'
+            print(f"\nMejor configuración: G={G}, SR={SR}, I={I}, SC={SC} - {objetivo:,.0f}/mes ({estado}, "
+                  f"{'convergió' if convergencia else 'sin convergencia'}, {len(visitados)} configuraciones, "
+                  f"{optimizacion['replicas_totales']} réplicas)")
+        
+        optimizacion['resumenes'] = resumenes
+        return optimizacion
+    
+    def _tareas_escenario(
+        self,
+        G: int,
+        SR: int,
+        I: int,
+        SC: int,
+        num_replicas: int,
+        semilla_base: int,
+        crn: bool
+    ) -> List[Tuple[int, int, int, int, int, Any, str]]:
+        """
+        Crea el directorio de un escenario y prepara los argumentos de sus réplicas.
+        
+        Args:
+            G, SR, I, SC: Configuración del escenario
+            num_replicas: Número de réplicas
+            semilla_base: Semilla base para generar semillas únicas
+            crn: Si usar números aleatorios comunes entre escenarios
+        
+        Returns:
+            Lista de argumentos para _ejecutar_replica_individual
+        """
+        nombre_escenario = f"G{G}_SR{SR}_I{I}_SC{SC}"
+        directorio_escenario = self.directorio_resultados / nombre_escenario
+        directorio_escenario.mkdir(parents=True, exist_ok=True)
+        
+        args_replicas = []
+        for replica in range(1, num_replicas + 1):
+            semilla = semilla_replica(semilla_base, replica, None if crn else (G, SR, I, SC))
+            args_replicas.append((replica, G, SR, I, SC, semilla, nombre_escenario))
+        return args_replicas
+    
+    def _consultar_cache(
+        self,
+        G: int,
+        SR: int,
+        I: int,
+        SC: int,
+        replica: int,
+        semilla: Any
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Busca una réplica en la caché. Si está, la guarda en el almacén de
+        resultados (puede provenir de una corrida con otra configuración).
+        
+        Args:
+            G, SR, I, SC: Configuración del escenario
+            replica: Número de réplica
+            semilla: Semilla de la réplica
+            
+        Returns:
+            Tupla (clave, resultados); resultados es None si hay que simularla
+        """
+        if self.cache is None:
+            return None, None
+        clave = self.cache.clave(G, SR, I, SC, semilla, tiempo_simulacion=self.tiempo_simulacion,
+                                 tiempo_calentamiento=self.tiempo_calentamiento)
+        resultados = self.cache.obtener(clave)
+        if resultados is not None:
+            resultados['replica'] = replica
+            self.almacen.guardar(resultados, semilla)
+        return clave, resultados
+    
+    def _ejecutar_replicas(
+        self,
+        args_replicas: List[Tuple[int, int, int, int, int, Any, str]],
+        num_procesos: int,
+        manifiesto: Optional[ManifiestoBarrido] = None
+    ) -> Iterator[Tuple[Tuple[int, int, int, int], int, Dict[str, Any]]]:
+        """
+        Obtiene los resultados de réplicas: primero las ya terminadas según el
+        manifiesto (leídas del almacén) y las que están en la caché, sin
+        simularlas, y luego las demás a medida que terminan en el pool
+        (guardándolas en el almacén y en la caché).
+        
+        Args:
+            args_replicas: Argumentos de _ejecutar_replica_individual de cada réplica
+            num_procesos: Número de procesos paralelos
+            manifiesto: Manifiesto del barrido (None = no registrar el estado)
+            
+        Returns:
+            Iterador de tuplas (escenario, replica, resultados)
+        """
+        pendientes = []
+        claves = {}
+        reanudadas = 0
+        for args in args_replicas:
+            replica, G, SR, I, SC, semilla, _ = args
+            if manifiesto is not None and manifiesto.terminada(_id_replica(args)):
+                resultados = self.almacen.obtener(G, SR, I, SC, replica, semilla)
+                if resultados is not None:
+                    reanudadas += 1
+                    yield (G, SR, I, SC), replica, resultados
+                    continue
+            clave, resultados = self._consultar_cache(G, SR, I, SC, replica, semilla)
+            if resultados is not None:
+                if manifiesto is not None:
+                    manifiesto.marcar_terminada(_id_replica(args))
+                yield (G, SR, I, SC), replica, resultados
+            else:
+                pendientes.append(args)
+                claves[(G, SR, I, SC), replica] = clave
+        
+        if manifiesto is not None or self.cache is not None:
+            print(f"Réplicas reanudadas: {reanudadas} - "
+                  f"en caché: {len(args_replicas) - len(pendientes) - reanudadas} - "
+                  f"a simular: {len(pendientes)}")
+        
+        for args, (replica, resultados) in self._ejecutar_tareas(
+                self._con_horizonte(_ejecutar_replica_individual), pendientes, _id_replica,
+                num_procesos, manifiesto):
+            escenario = (resultados['G'], resultados['SR'], resultados['I'], resultados['SC'])
+            self.almacen.guardar(resultados, args[5])
+            if self.cache is not None:
+                self.cache.guardar(claves[escenario, replica], resultados)
+            yield escenario, replica, resultados
+    
+    def _con_horizonte(self, funcion: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        """
+        Fija el horizonte y el calentamiento del experimento en una función
+        de réplica (functools.partial, picklable).
+        
+        Args:
+            funcion: _ejecutar_replica_individual o _ejecutar_frente_descompuesto
+        
+        Returns:
+            Función de un solo argumento (los args de la tarea)
+        """
+        return partial(funcion, tiempo_simulacion=self.tiempo_simulacion,
+                       tiempo_calentamiento=self.tiempo_calentamiento)
+    
+    def _ejecutar_tareas(
+        self,
+        funcion: Callable[[Any], Any],
+        tareas: List[Any],
+        id_tarea: Callable[[Any], str],
+        num_procesos: int,
+        manifiesto: Optional[ManifiestoBarrido] = None
+    ) -> Iterator[Tuple[Any, Any]]:
+        """
+        Ejecuta tareas en el pool registrando su estado en el manifiesto.
+        
+        Las tareas que fallan se reintentan individualmente (hasta
+        max_reintentos veces) en una nueva ronda, sin repetir las que ya
+        terminaron. Si falla el pool en sí, las tareas sin terminar se
+        reintentan con la mitad de los procesos.
+        
+        Args:
+            funcion: Función a aplicar a cada tarea (debe ser picklable)
+            tareas: Argumentos de cada tarea
+            id_tarea: Función que da el identificador de una tarea en el manifiesto
+            num_procesos: Número de procesos paralelos
+            manifiesto: Manifiesto del barrido (None = no registrar el estado)
+            
+        Returns:
+            Iterador de tuplas (args, resultado), en orden de finalización
+            
+        Raises:
+            RuntimeError: Si alguna tarea sigue fallando tras los reintentos
+        """
+        protegida = partial(_ejecutar_protegida, funcion)
+        pendientes = list(tareas)
+        intento = 0
+        while pendientes:
+            if intento > self.max_reintentos:
+                raise RuntimeError(
+                    f"{len(pendientes)} tareas fallaron tras {intento} intentos "
+                    f"(ver {self.archivo_manifiesto}; se pueden reanudar con --reanudar): "
+                    + ", ".join(id_tarea(args) for args in pendientes[:5])
+                )
+            if intento > 0:
+                print(f"Reintentando {len(pendientes)} tareas fallidas "
+                      f"(intento {intento + 1} de {self.max_reintentos + 1})...")
+            if manifiesto is not None:
+                manifiesto.marcar_en_curso(id_tarea(args) for args in pendientes)
+            
+            terminadas = set()
+            fallidas = {}
+            try:
+                for exito, args, salida in _ejecutar_en_pool(protegida, pendientes, num_procesos):
+                    identificador = id_tarea(args)
+                    if exito:
+                        terminadas.add(identificador)
+                        if manifiesto is not None:
+                            manifiesto.marcar_terminada(identificador)
+                        yield args, salida
+                    else:
+                        fallidas[identificador] = args
+                        print(f"  ✗ Falló la tarea {identificador}: {salida.strip().splitlines()[-1]}")
+                        if manifiesto is not None:
+                            manifiesto.marcar_fallida(identificador, salida)
+            except Exception as e:
+                # Falla del pool (no de una tarea): reintentar con menos procesos
+                print(f"  Error en paralelización: {e}")
+                print(f"  Reintentando las tareas sin terminar con menos procesos...")
+                num_procesos = max(1, num_procesos // 2)
+                for args in pendientes:
+                    identificador = id_tarea(args)
+                    if identificador not in terminadas and identificador not in fallidas:
+                        fallidas[identificador] = args
+                        if manifiesto is not None:
+                            manifiesto.marcar_fallida(identificador, repr(e))
+            
+            if manifiesto is not None:
+                manifiesto.guardar()
+            pendientes = list(fallidas.values())
+            intento += 1
+    
+    def _resumir_a_medida(
+        self,
+        escenarios: List[Tuple[int, int, int, int]],
+        num_replicas: int,
+        replicas_terminadas: Iterable[Tuple[Tuple[int, int, int, int], int, Dict[str, Any]]],
+        mostrar_progreso: bool
+    ) -> List[Dict[str, Any]]:
+        """
+        Agrega las réplicas a medida que terminan (ver AgregadorWelford): no
+        se retienen sus resultados individuales (ya guardados en el almacén) y
+        cuando un escenario reúne todas sus réplicas se resume de inmediato.
+        Mientras tanto, resumenes_en_curso da los resúmenes parciales.
+        
+        Args:
+            escenarios: Lista de tuplas (G, SR, I, SC)
+            num_replicas: Número de réplicas por escenario
+            replicas_terminadas: Tuplas (escenario, replica, resultados) en orden de finalización
+            mostrar_progreso: Si mostrar progreso por consola
+        
+        Returns:
+            Lista con resultados de todos los escenarios (en el orden de escenarios)
+        """
+        self.agregaciones = {escenario: _AgregacionEscenario() for escenario in escenarios}
+        resumenes: Dict[Tuple[int, int, int, int], Dict[str, Any]] = {}
+        
+        for escenario, replica, resultados in replicas_terminadas:
+            agregacion = self.agregaciones[escenario]
+            agregacion.agregar(replica, resultados)
+            if agregacion.siguiente <= num_replicas:
+                continue
+            
+            # Escenario completo
+            G, SR, I, SC = escenario
+            resumenes[escenario] = self._resumir_escenario(escenario, agregacion.agregador)
+            if mostrar_progreso:
+                print(f"[{len(resumenes)}/{len(escenarios)}] ✓ Escenario: G={G}, SR={SR}, I={I}, SC={SC}")
+        
+        return [resumenes[escenario] for escenario in escenarios]
+    
+    def resumenes_en_curso(self) -> List[Dict[str, Any]]:
+        """
+        Retorna los resúmenes parciales de los escenarios del barrido en
+        curso (o del último barrido), con las réplicas agregadas hasta ahora.
+        
+        Returns:
+            Lista de resúmenes (ver _estadisticas_agregador) de los escenarios
+            con al menos una réplica agregada
+        """
+        return [
+            self._estadisticas_agregador(escenario, agregacion.agregador)
+            for escenario, agregacion in list(self.agregaciones.items())
+            if agregacion.agregador.cantidad > 0
+        ]
+    
+    def _resumir_escenario(
+        self,
+        escenario: Tuple[int, int, int, int],
+        agregador: AgregadorWelford,
+        estadisticas: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Calcula y guarda las estadísticas agregadas de un escenario.
+        
+        Args:
+            escenario: Tupla (G, SR, I, SC)
+            agregador: Agregador con todas las réplicas del escenario
+            estadisticas: Estadísticas ya calculadas (None = calcularlas)
+            
+        Returns:
+            Diccionario con resultados agregados del escenario
+        """
         # Calcular estadísticas agregadas
-        estadisticas = self._calcular_estadisticas(replicas)
+        if estadisticas is None:
+            estadisticas = self._estadisticas_agregador(escenario, agregador)
         
         # Guardar resumen del escenario
-        archivo_resumen = directorio_escenario / "resumen_escenario.json"
+        G, SR, I, SC = escenario
+        archivo_resumen = self.directorio_resultados / f"G{G}_SR{SR}_I{I}_SC{SC}" / "resumen_escenario.json"
         with open(archivo_resumen, 'w', encoding='utf-8') as f:
             json.dump(estadisticas, f, indent=2, ensure_ascii=False)
         
@@ -164,58 +1335,347 @@ class Experimento:
         num_replicas: int = 30,
         semilla_base: int = 42,
         mostrar_progreso: bool = True,
-        num_procesos: int = None
+        num_procesos: int = None,
+        crn: bool = True,
+        descompuesto: bool = False,
+        reanudar: bool = False,
+        regla: Optional[ReglaDetencion] = None,
+        cribado: Optional[List[int]] = None
     ) -> List[Dict[str, Any]]:
         """
         Ejecuta todos los escenarios usando procesamiento paralelo.
         
+        El estado de cada tarea se registra en el manifiesto del barrido
+        (manifiesto_barrido.json); con reanudar=True solo se ejecutan las
+        tareas que no terminaron en la corrida anterior.
+        
         Args:
             num_replicas: Número de réplicas por escenario
             semilla_base: Semilla base para generar semillas únicas
             mostrar_progreso: Si mostrar progreso por consola
             num_procesos: Número de procesos paralelos (None = usar todos los núcleos)
+            crn: Si usar números aleatorios comunes entre escenarios
+            descompuesto: Si simular el frente una vez por (G, SC, réplica) y
+                reproducir salas de recuperación e incubadoras para cada SR e I
+                (ver SimuladorDescompuesto; requiere CRN)
+            reanudar: Si continuar el barrido interrumpido del manifiesto
+                existente (debe tener los mismos parámetros)
+            regla: Regla de detención de la replicación secuencial (None =
+                num_replicas réplicas por escenario; ver _ejecutar_secuencial).
+                No se combina con descompuesto ni reanudar: las tareas no se
+                conocen de antemano (la caché sí evita repetir réplicas)
+            cribado: Réplicas al final de cada etapa de cribado (ej. [5, 10]);
+                tras cada etapa se descartan los escenarios dominados con
+                confianza (ver _ejecutar_con_cribado). Tampoco se combina con
+                regla, descompuesto ni reanudar
             
         Returns:
             Lista con resultados de todos los escenarios
         """
         escenarios = self.generar_escenarios()
-        resultados_todos = []
+        if cribado:
+            if regla is not None or descompuesto or reanudar:
+                raise ValueError("El cribado no se combina con la replicación secuencial, el modo "
+                                 "descompuesto ni la reanudación")
+            if num_procesos is None:
+                num_procesos = cpu_count()
+            print(f"\n{'='*80}")
+            print(f"EJECUTANDO EXPERIMENTOS (CRIBADO)")
+            print(f"{'='*80}")
+            print(f"Total de escenarios: {len(escenarios)}")
+            print(f"Etapas de cribado: {', '.join(str(r) for r in sorted(cribado))} réplicas; "
+                  f"no dominados hasta {num_replicas}")
+            print(f"Objetivos (dominancia de Pareto con IC 95%): {', '.join(INDICADORES_CRIBADO)}")
+            print(f"Procesos paralelos: {num_procesos} (de {cpu_count()} núcleos disponibles)")
+            print(f"{'='*80}\n")
+            resultados_todos = self._ejecutar_con_cribado(escenarios, num_replicas, cribado, semilla_base,
+                                                          mostrar_progreso, num_procesos, crn)
+            self._guardar_resumen_general(resultados_todos)
+            return resultados_todos
+        if regla is not None:
+            if descompuesto or reanudar:
+                raise ValueError("La replicación secuencial no se combina con el modo descompuesto "
+                                 "ni con la reanudación")
+            if num_procesos is None:
+                num_procesos = cpu_count()
+            print(f"\n{'='*80}")
+            print(f"EJECUTANDO EXPERIMENTOS (SECUENCIAL)")
+            print(f"{'='*80}")
+            print(f"Total de escenarios: {len(escenarios)}")
+            print(f"Réplicas por escenario: {regla.min_replicas} a {regla.max_replicas}")
+            print(f"Indicadores controlados: {', '.join(regla.indicadores)}")
+            objetivos = []
+            if regla.relativa is not None:
+                objetivos.append(f"{regla.relativa:.1%} de la media")
+            if regla.absoluta is not None:
+                objetivos.append(f"{regla.absoluta:g}")
+            print(f"Semiamplitud objetivo del IC 95%: {' o '.join(objetivos)}")
+            print(f"Procesos paralelos: {num_procesos} (de {cpu_count()} núcleos disponibles)")
+            print(f"{'='*80}\n")
+            resultados_todos = self._ejecutar_secuencial(escenarios, regla, semilla_base,
+                                                         mostrar_progreso, num_procesos, crn)
+            self._guardar_resumen_general(resultados_todos)
+            return resultados_todos
+        parametros = {
+            'modo': 'descompuesto' if descompuesto else 'completo',
+            'escenarios': escenarios,
+            'num_replicas': num_replicas,
+            'semilla_base': semilla_base,
+            'crn': crn,
+            'tiempo_simulacion': self.tiempo_simulacion,
+            'tiempo_calentamiento': self.tiempo_calentamiento
+        }
+        if descompuesto:
+            return self._ejecutar_escenarios_descompuestos(
+                escenarios, num_replicas, semilla_base, mostrar_progreso, num_procesos, crn,
+                parametros, reanudar
+            )
         
         # Determinar número de procesos
         # Limitar a un máximo razonable para evitar problemas de memoria en Windows
         if num_procesos is None:
             num_procesos = cpu_count()
         
+        # Todas las réplicas de todos los escenarios van a un único pool: los
+        # núcleos no quedan ociosos esperando la última réplica de cada escenario
+        tareas = []
+        for G, SR, I, SC in escenarios:
+            tareas.extend(self._tareas_escenario(G, SR, I, SC, num_replicas, semilla_base, crn))
+        
         print(f"\n{'='*80}")
         print(f"EJECUTANDO EXPERIMENTOS (PARALELO)")
         print(f"{'='*80}")
         print(f"Total de escenarios: {len(escenarios)}")
         print(f"Réplicas por escenario: {num_replicas}")
-        print(f"Total de simulaciones: {len(escenarios) * num_replicas}")
+        print(f"Total de simulaciones: {len(tareas)}")
         print(f"Procesos paralelos: {num_procesos} (de {cpu_count()} núcleos disponibles)")
+        print(f"Réplicas por lote: {_tamano_lote(len(tareas), num_procesos)}")
+        print(f"Números aleatorios comunes (CRN): {'sí' if crn else 'no'}")
         print(f"{'='*80}\n")
         
-        for idx, (G, SR, I, SC) in enumerate(escenarios, 1):
-            print(f"\n[{idx}/{len(escenarios)}] Escenario: G={G}, SR={SR}, I={I}, SC={SC}")
-            
-            estadisticas = self.ejecutar_escenario(
-                G=G,
-                SR=SR,
-                I=I,
-                SC=SC,
-                num_replicas=num_replicas,
-                semilla_base=semilla_base,
-                mostrar_progreso=mostrar_progreso,
-                num_procesos=num_procesos
-            )
+        manifiesto = self._abrir_manifiesto(parametros, [_id_replica(args) for args in tareas], reanudar)
+        try:
+            resultados_todos = self._resumir_a_medida(escenarios, num_replicas,
+                                                      self._ejecutar_replicas(tareas, num_procesos, manifiesto),
+                                                      mostrar_progreso)
+        finally:
+            # Confirmar lo ya simulado aunque el barrido se interrumpa
+            self.almacen.confirmar()
+            manifiesto.guardar()
+        
+        # Guardar resumen general
+        self._guardar_resumen_general(resultados_todos)
+        
+        return resultados_todos
+    
+    def _ejecutar_escenarios_descompuestos(
+        self,
+        escenarios: List[Tuple[int, int, int, int]],
+        num_replicas: int,
+        semilla_base: int,
+        mostrar_progreso: bool,
+        num_procesos: int,
+        crn: bool,
+        parametros: Dict[str, Any],
+        reanudar: bool
+    ) -> List[Dict[str, Any]]:
+        """
+        Ejecuta los escenarios en modo descompuesto: una simulación del frente
+        por (G, SC, réplica), reproducida para todos los pares (SR, I) del grupo.
+        
+        Args:
+            escenarios: Lista de tuplas (G, SR, I, SC)
+            num_replicas: Número de réplicas por escenario
+            semilla_base: Semilla base para generar semillas únicas
+            mostrar_progreso: Si mostrar progreso por consola
+            num_procesos: Número de procesos paralelos (None = usar todos los núcleos)
+            crn: Debe ser True (el frente se comparte entre valores de SR e I)
+            parametros: Parámetros del barrido (para el manifiesto)
+            reanudar: Si continuar el barrido del manifiesto existente
             
-            resultados_todos.append(estadisticas)
+        Returns:
+            Lista con resultados de todos los escenarios (en el orden de escenarios)
+        """
+        if not crn:
+            raise ValueError("El modo descompuesto requiere números aleatorios comunes (crn=True): "
+                             "el frente de cada réplica se comparte entre todos los SR e I")
+        if num_procesos is None:
+            num_procesos = cpu_count()
+        
+        # Agrupar escenarios por (G, SC), conservando el orden
+        grupos: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        for G, SR, I, SC in escenarios:
+            grupos.setdefault((G, SC), []).append((SR, I))
+        
+        print(f"\n{'='*80}")
+        print(f"EJECUTANDO EXPERIMENTOS (DESCOMPUESTO)")
+        print(f"{'='*80}")
+        print(f"Total de escenarios: {len(escenarios)}")
+        print(f"Grupos (G, SC) simulados: {len(grupos)}")
+        print(f"Réplicas por escenario: {num_replicas}")
+        print(f"Simulaciones del frente: {len(grupos) * num_replicas} "
+              f"(en lugar de {len(escenarios) * num_replicas})")
+        print(f"Procesos paralelos: {num_procesos} (de {cpu_count()} núcleos disponibles)")
+        print(f"{'='*80}\n")
+        
+        manifiesto = self._abrir_manifiesto(
+            parametros,
+            [_id_frente((replica, G, SC)) for G, SC in grupos for replica in range(1, num_replicas + 1)],
+            reanudar
+        )
+        
+        # Los frentes ya terminados se leen del almacén y las configuraciones
+        # ya cacheadas no se reproducen; el frente de una réplica se simula
+        # solo si a su grupo le falta alguna configuración
+        args_tareas = []
+        previas = []
+        claves = {}
+        reanudados = 0
+        en_cache = 0
+        for (G, SC), configuraciones in grupos.items():
+            for replica in range(1, num_replicas + 1):
+                semilla = semilla_replica(semilla_base, replica)
+                id_frente = _id_frente((replica, G, SC))
+                for SR, I in configuraciones:
+                    (self.directorio_resultados / f"G{G}_SR{SR}_I{I}_SC{SC}").mkdir(parents=True, exist_ok=True)
+                
+                if manifiesto.terminada(id_frente):
+                    guardadas = {(SR, I): self.almacen.obtener(G, SR, I, SC, replica, semilla)
+                                 for SR, I in configuraciones}
+                    if all(resultados is not None for resultados in guardadas.values()):
+                        previas.extend(((G, SR, I, SC), replica, resultados)
+                                       for (SR, I), resultados in guardadas.items())
+                        reanudados += 1
+                        continue
+                
+                faltantes = []
+                for SR, I in configuraciones:
+                    clave, resultados = self._consultar_cache(G, SR, I, SC, replica, semilla)
+                    if resultados is not None:
+                        previas.append(((G, SR, I, SC), replica, resultados))
+                        en_cache += 1
+                    else:
+                        faltantes.append((SR, I))
+                        claves[(G, SR, I, SC), replica] = clave
+                if faltantes:
+                    args_tareas.append((replica, G, SC, faltantes, semilla))
+                else:
+                    manifiesto.marcar_terminada(id_frente)
+        
+        print(f"Frentes reanudados: {reanudados} - "
+              f"réplicas en caché: {en_cache} - "
+              f"frentes a simular: {len(args_tareas)}")
+        
+        def replicas_terminadas():
+            yield from previas
+            # Cada tarea devuelve la réplica de todos los (SR, I) faltantes de su grupo
+            for args, (replica, G, SC, resultados_grilla) in self._ejecutar_tareas(
+                    self._con_horizonte(_ejecutar_frente_descompuesto), args_tareas, _id_frente,
+                    num_procesos, manifiesto):
+                for (SR, I), resultados in resultados_grilla.items():
+                    self.almacen.guardar(resultados, args[4])
+                    if self.cache is not None:
+                        self.cache.guardar(claves[(G, SR, I, SC), replica], resultados)
+                    yield (G, SR, I, SC), replica, resultados
+        
+        try:
+            resultados_todos = self._resumir_a_medida(escenarios, num_replicas, replicas_terminadas(),
+                                                      mostrar_progreso)
+        finally:
+            # Confirmar lo ya simulado aunque el barrido se interrumpa
+            self.almacen.confirmar()
+            manifiesto.guardar()
         
         # Guardar resumen general
         self._guardar_resumen_general(resultados_todos)
         
         return resultados_todos
     
+    def _abrir_manifiesto(
+        self,
+        parametros: Dict[str, Any],
+        ids_tareas: List[str],
+        reanudar: bool
+    ) -> ManifiestoBarrido:
+        """
+        Crea el manifiesto del barrido, o recupera el del barrido interrumpido.
+        
+        Args:
+            parametros: Parámetros del barrido
+            ids_tareas: Identificadores de todas las tareas del barrido
+            reanudar: Si recuperar el estado del manifiesto existente
+            
+        Returns:
+            ManifiestoBarrido del barrido
+        """
+        manifiesto = ManifiestoBarrido.abrir(self.archivo_manifiesto, parametros, ids_tareas, reanudar)
+        if reanudar:
+            estados = manifiesto.resumen()
+            print("Reanudando barrido: " + ", ".join(f"{estado}: {n}" for estado, n in estados.items()))
+        return manifiesto
+    
+    def cargar_replicas(self, G: int, SR: int, I: int, SC: int, semilla_base: Optional[int] = None,
+                        crn: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """
+        Carga los resultados de réplicas guardados de un escenario.
+        
+        Args:
+            G, SR, I, SC: Configuración del escenario
+            semilla_base: Semilla base de las réplicas (None = la única guardada)
+            crn: Si las réplicas usan números aleatorios comunes (None = la
+                única serie guardada)
+            
+        Returns:
+            Lista de resultados de réplicas (ordenada por número de réplica)
+        
+        Raises:
+            ValueError: Si el escenario tiene réplicas de varias series de
+                semillas y no se indica cuál cargar
+        """
+        replicas = self.almacen.cargar_escenario(G, SR, I, SC, semilla_base, crn)
+        if replicas:
+            return replicas
+        
+        # Compatibilidad con resultados guardados como replica_XX.json
+        directorio_escenario = self.directorio_resultados / f"G{G}_SR{SR}_I{I}_SC{SC}"
+        for archivo in sorted(directorio_escenario.glob("replica_*.json")):
+            with open(archivo, 'r', encoding='utf-8') as f:
+                resultados = json.load(f)
+            # Compatibilidad con réplicas guardadas sin número de réplica
+            resultados.setdefault('replica', int(archivo.stem.split('_')[1]))
+            replicas.append(resultados)
+        return replicas
+    
+    def comparar_escenarios(
+        self,
+        escenario_a: Tuple[int, int, int, int],
+        escenario_b: Tuple[int, int, int, int],
+        indicadores: List[str] = None,
+        semilla_base: Optional[int] = None,
+        crn: Optional[bool] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Compara dos escenarios ya ejecutados mediante diferencias pareadas (A - B).
+        
+        Args:
+            escenario_a: Tupla (G, SR, I, SC) del escenario A
+            escenario_b: Tupla (G, SR, I, SC) del escenario B
+            indicadores: Indicadores a comparar (None = indicadores principales)
+            semilla_base: Semilla base de las réplicas (None = la única guardada)
+            crn: Si las réplicas usan números aleatorios comunes (None = la
+                única serie guardada)
+            
+        Returns:
+            Diccionario {indicador: {media, desv, ic_inf, ic_sup, n}}
+        """
+        if indicadores is None:
+            indicadores = ['PEC_general', 'PPDSR', 'PPDINC', 'CTM', 'CII']
+        return diferencias_pareadas(
+            self.cargar_replicas(*escenario_a, semilla_base=semilla_base, crn=crn),
+            self.cargar_replicas(*escenario_b, semilla_base=semilla_base, crn=crn),
+            indicadores
+        )
+    
     def _calcular_estadisticas(self, replicas: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Calcula estadísticas agregadas de múltiples réplicas.
@@ -224,52 +1684,52 @@ class Experimento:
             replicas: Lista de resultados de réplicas
             
         Returns:
-            Diccionario con estadísticas (media, desv. est., IC 95%)
+            Diccionario con estadísticas (media, desv. est., IC 95%, mín., máx.)
         """
         if len(replicas) == 0:
             return {}
         
-        # Obtener parámetros del primer resultado
+        agregador = AgregadorWelford(INDICADORES_ESCENARIO)
+        for resultados in replicas:
+            agregador.agregar(resultados)
+        
         primer_resultado = replicas[0]
-        G = primer_resultado['G']
-        SR = primer_resultado['SR']
-        I = primer_resultado['I']
-        SC = primer_resultado['SC']
-        
-        # Indicadores a analizar
-        indicadores = [
-            'PEC_consultas', 'PEC_partos_nat', 'PEC_partos_ces', 'PEC_general',
-            'UT_med', 'UT_Q', 'PTOSR_promedio',
-            'PPDSR', 'PPDINC',
-            'CTM', 'CII'
-        ]
+        escenario = tuple(primer_resultado[p] for p in ('G', 'SR', 'I', 'SC'))
+        return self._estadisticas_agregador(escenario, agregador)
+    
+    def _estadisticas_agregador(
+        self,
+        escenario: Tuple[int, int, int, int],
+        agregador: AgregadorWelford
+    ) -> Dict[str, Any]:
+        """
+        Arma las estadísticas de un escenario a partir de su agregador.
         
+        Args:
+            escenario: Tupla (G, SR, I, SC)
+            agregador: Agregador de las réplicas del escenario
+            
+        Returns:
+            Diccionario con estadísticas (media, desv. est., IC 95% t de
+            Student, mín. y máx. de cada indicador)
+        """
+        G, SR, I, SC = escenario
         estadisticas = {
             'G': G,
             'SR': SR,
             'I': I,
             'SC': SC,
-            'num_replicas': len(replicas)
+            'num_replicas': agregador.cantidad
         }
         
-        # Calcular estadísticas para cada indicador
-        for indicador in indicadores:
-            valores = [r[indicador] for r in replicas if indicador in r]
-            
-            if len(valores) > 0:
-                media = np.mean(valores)
-                desv_est = np.std(valores, ddof=1)
-                
-                # Intervalo de confianza al 95% (t-student)
-                from scipy import stats
-                n = len(valores)
-                t_critico = stats.t.ppf(0.975, n - 1)
-                margen_error = t_critico * (desv_est / np.sqrt(n))
-                
-                estadisticas[f'{indicador}_media'] = media
-                estadisticas[f'{indicador}_desv'] = desv_est
-                estadisticas[f'{indicador}_ic_inf'] = media - margen_error
-                estadisticas[f'{indicador}_ic_sup'] = media + margen_error
+        # Todos los indicadores se resumen a la vez (vectores del agregador)
+        for indicador, resumen in agregador.resumen().items():
+            estadisticas[f'{indicador}_media'] = resumen['media']
+            estadisticas[f'{indicador}_desv'] = resumen['desv']
+            estadisticas[f'{indicador}_ic_inf'] = resumen['ic_inf']
+            estadisticas[f'{indicador}_ic_sup'] = resumen['ic_sup']
+            estadisticas[f'{indicador}_min'] = resumen['min']
+            estadisticas[f'{indicador}_max'] = resumen['max']
         
         return estadisticas
     
@@ -286,19 +1746,18 @@ class Experimento:
         
         # Obtener todas las columnas
         columnas = ['G', 'SR', 'I', 'SC', 'num_replicas']
-        indicadores = [
-            'PEC_consultas', 'PEC_partos_nat', 'PEC_partos_ces', 'PEC_general',
-            'UT_med', 'UT_Q', 'PTOSR_promedio',
-            'PPDSR', 'PPDINC',
-            'CTM', 'CII'
-        ]
-        
-        for indicador in indicadores:
+        for columna in ('precision_alcanzada', 'etapa_descarte', 'dominado_por',
+                        'promovido', 'posicion_corta', 'objetivo_optimizacion', 'factible'):
+            if any(columna in resultado for resultado in resultados):
+                columnas.append(columna)
+        for indicador in INDICADORES_ESCENARIO:
             columnas.extend([
                 f'{indicador}_media',
                 f'{indicador}_desv',
                 f'{indicador}_ic_inf',
-                f'{indicador}_ic_sup'
+                f'{indicador}_ic_sup',
+                f'{indicador}_min',
+                f'{indicador}_max'
             ])
         
         # Escribir CSV
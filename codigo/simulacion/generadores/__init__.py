@@ -2,7 +2,7 @@
 Módulo generadores: Generadores de variables aleatorias (FDP)
 """
 
-from .variables_aleatorias import GeneradorVariablesAleatorias
+from .variables_aleatorias import GeneradorVariablesAleatorias, BloqueVariables, crear_flujos, semilla_replica, FLUJOS
 
-__all__ = ['GeneradorVariablesAleatorias']
+__all__ = ['GeneradorVariablesAleatorias', 'BloqueVariables', 'crear_flujos', 'semilla_replica', 'FLUJOS']
 
@@ -3,25 +3,145 @@ Generador de Variables Aleatorias: Implementa todas las FDP del modelo
 """
 
 import numpy as np
-from scipy import stats
-from typing import Optional
+from functools import partial
+from typing import Optional, Callable, Dict, Union, Tuple
+
+
+# Sub-flujos aleatorios independientes, uno por fuente de aleatoriedad del modelo.
+# El orden es parte de la definición de la semilla: no reordenar (solo agregar al final).
+FLUJOS = ('arribos', 'tipo_paciente', 'consulta', 'parto', 'reposo', 'incubadora')
+
+Semilla = Union[int, np.random.SeedSequence]
+
+
+def crear_flujos(semilla: Optional[Semilla] = None) -> Dict[str, np.random.Generator]:
+    """
+    Crea un Generator de NumPy por cada sub-flujo de FLUJOS.
+    
+    Cada sub-flujo se deriva de la SeedSequence base agregando su índice a la
+    spawn_key, por lo que es independiente de los demás y no depende del
+    estado global de NumPy ni de cuántos generadores existan en el proceso.
+    
+    Args:
+        semilla: Entero o SeedSequence base (None = entropía del sistema)
+    
+    Returns:
+        Diccionario {nombre_flujo: Generator}
+    """
+    if isinstance(semilla, np.random.SeedSequence):
+        base = semilla
+    else:
+        base = np.random.SeedSequence(semilla)
+    
+    flujos = {}
+    for indice, nombre in enumerate(FLUJOS):
+        secuencia = np.random.SeedSequence(
+            base.entropy,
+            spawn_key=tuple(base.spawn_key) + (indice,),
+            pool_size=base.pool_size
+        )
+        flujos[nombre] = np.random.Generator(np.random.PCG64(secuencia))
+    return flujos
+
+
+def semilla_replica(
+    semilla_base: int,
+    replica: int,
+    configuracion: Optional[Tuple[int, ...]] = None
+) -> np.random.SeedSequence:
+    """
+    Construye la SeedSequence de una réplica.
+    
+    Sin configuración (números aleatorios comunes, CRN), la réplica k de todas
+    las configuraciones usa la misma semilla y por lo tanto los mismos
+    sub-flujos de arribos, tipos de paciente y tiempos de servicio: las
+    diferencias entre escenarios se deben solo a la configuración.
+    Con configuración, cada (réplica, configuración) recibe flujos
+    independientes y sin colisiones entre configuraciones.
+    
+    Args:
+        semilla_base: Semilla base del experimento
+        replica: Número de réplica
+        configuracion: Tupla de parámetros (ej. (G, SR, I, SC)) o None para CRN
+        
+    Returns:
+        SeedSequence de la réplica
+    """
+    spawn_key = (replica,)
+    if configuracion is not None:
+        spawn_key += tuple(int(x) for x in configuracion)
+    return np.random.SeedSequence(semilla_base, spawn_key=spawn_key)
+
+
+class BloqueVariables:
+    """
+    Buffer de valores pre-generados para una distribución.
+    
+    Genera bloques completos con NumPy y entrega los valores de a uno,
+    regenerando el bloque cuando se agota.
+    """
+    
+    __slots__ = ('_generar', '_tamano', '_valores', '_posicion')
+    
+    def __init__(self, generar: Callable[[int], np.ndarray], tamano: int):
+        """
+        Inicializa el buffer.
+        
+        Args:
+            generar: Función que recibe un tamaño y devuelve un array de valores
+            tamano: Cantidad de valores por bloque
+        """
+        self._generar = generar
+        self._tamano = tamano
+        self._valores = []
+        self._posicion = 0
+    
+    def siguiente(self) -> float:
+        """
+        Retorna el próximo valor del bloque, regenerándolo si se agotó.
+        
+        Returns:
+            Valor generado
+        """
+        if self._posicion >= len(self._valores):
+            # tolist() convierte a float de Python: indexar es más rápido
+            self._valores = self._generar(self._tamano).tolist()
+            self._posicion = 0
+        valor = self._valores[self._posicion]
+        self._posicion += 1
+        return valor
+    
+    def descartar(self):
+        """Descarta los valores pendientes (se regeneran en la próxima extracción)."""
+        self._valores = []
+        self._posicion = 0
 
 
 class GeneradorVariablesAleatorias:
     """
     Generador de variables aleatorias según las FDP definidas en el modelo.
+    
+    Cada generador posee sus propios sub-flujos aleatorios (ver FLUJOS),
+    derivados de una SeedSequence. No usa el estado global de NumPy, por lo
+    que varios simuladores pueden convivir en un mismo proceso o hilo sin
+    interferir entre sí.
+    
+    Soporta dos modos de generación:
+    - Escalar (tamano_bloque=None): una llamada a NumPy por valor.
+    - Por bloques (tamano_bloque=N): cada distribución genera N valores por
+      llamada y los entrega desde un buffer. Los resultados son reproducibles
+      para una misma semilla y tamaño de bloque.
     """
     
-    def __init__(self, semilla: Optional[int] = None):
+    def __init__(self, semilla: Optional[Semilla] = None, tamano_bloque: Optional[int] = None):
         """
         Inicializa el generador.
         
         Args:
-            semilla: Semilla para reproducibilidad (opcional)
+            semilla: Entero o SeedSequence para reproducibilidad (opcional)
+            tamano_bloque: Cantidad de valores a generar por bloque
+                (None = modo escalar)
         """
-        if semilla is not None:
-            np.random.seed(semilla)
-        
         # Parámetros de FDP según el paper y análisis previo
         # Intervalo entre arribos: Lognormal
         self.iag_s = 1.362189
@@ -49,6 +169,64 @@ class GeneradorVariablesAleatorias:
         self.p_nat = 0.57  # Probabilidad de parto natural dado que es parto
         self.p_ces = 0.43  # Probabilidad de cesárea dado que es parto
         self.p_inc = 0.10  # Probabilidad de que neonato requiera incubadora
+        
+        if tamano_bloque is not None and tamano_bloque < 1:
+            raise ValueError("tamano_bloque debe ser un entero positivo")
+        self.tamano_bloque = tamano_bloque
+        self._bloques = None
+        
+        # Sub-flujos aleatorios (y buffers, si corresponde)
+        self.set_semilla(semilla)
+    
+    def _crear_bloques(self):
+        """Crea un buffer por cada distribución del modelo, cada uno sobre su sub-flujo."""
+        n = self.tamano_bloque
+        self._bloques = {
+            nombre: BloqueVariables(partial(self.generar_bloque, nombre), n)
+            for nombre in FLUJOS
+        }
+        # Accesos directos a los métodos de extracción (evita búsquedas en el dict)
+        self._siguiente_iag = self._bloques['arribos'].siguiente
+        self._siguiente_tac = self._bloques['consulta'].siguiente
+        self._siguiente_tap = self._bloques['parto'].siguiente
+        self._siguiente_trep = self._bloques['reposo'].siguiente
+        self._siguiente_tipo = self._bloques['tipo_paciente'].siguiente
+        self._siguiente_inc = self._bloques['incubadora'].siguiente
+    
+    def generar_bloque(self, flujo: str, k: int) -> np.ndarray:
+        """
+        Genera k valores de la distribución asociada a un sub-flujo.
+        
+        Es la única fuente de los buffers del modo por bloques: quien genere
+        bloques del mismo tamaño sobre los mismos sub-flujos obtiene exactamente
+        la misma secuencia de valores que este generador (ver
+        simulador_vectorizado.py).
+        
+        Args:
+            flujo: Nombre del sub-flujo (ver FLUJOS)
+            k: Cantidad de valores
+            
+        Returns:
+            Array con k valores (tipo_paciente e incubadora: uniformes en [0, 1))
+        """
+        if flujo == 'arribos':
+            return self._generar_bloque_arribos(k)
+        if flujo == 'consulta':
+            return self.flujos['consulta'].uniform(self.tac_min, self.tac_max, k)
+        if flujo == 'parto':
+            return self.flujos['parto'].uniform(self.tap_min, self.tap_max, k)
+        if flujo == 'reposo':
+            return self.flujos['reposo'].uniform(self.trep_min, self.trep_max, k)
+        return self.flujos[flujo].random(k)
+    
+    def _generar_bloque_arribos(self, k: int) -> np.ndarray:
+        """
+        Genera un bloque de intervalos entre arribos (lognormal).
+        
+        Equivale a stats.lognorm(s, loc, scale): exp(N(ln(scale), s)) + loc.
+        """
+        intervalos = self.flujos['arribos'].lognormal(np.log(self.iag_scale), self.iag_s, k) + self.iag_loc
+        return np.maximum(0.1, intervalos)
     
     def generar_intervalo_arribo(self) -> float:
         """
@@ -57,11 +235,9 @@ class GeneradorVariablesAleatorias:
         Returns:
             Intervalo en minutos
         """
-        intervalo = stats.lognorm.rvs(
-            s=self.iag_s,
-            scale=self.iag_scale,
-            loc=self.iag_loc
-        )
+        if self._bloques is not None:
+            return self._siguiente_iag()
+        intervalo = self.flujos['arribos'].lognormal(np.log(self.iag_scale), self.iag_s) + self.iag_loc
         # Asegurar que sea positivo
         return max(0.1, intervalo)
     
@@ -72,7 +248,9 @@ class GeneradorVariablesAleatorias:
         Returns:
             Tiempo en minutos
         """
-        return np.random.uniform(self.tac_min, self.tac_max)
+        if self._bloques is not None:
+            return self._siguiente_tac()
+        return self.flujos['consulta'].uniform(self.tac_min, self.tac_max)
     
     def generar_tiempo_atencion_parto(self) -> float:
         """
@@ -82,7 +260,9 @@ class GeneradorVariablesAleatorias:
         Returns:
             Tiempo en minutos
         """
-        return np.random.uniform(self.tap_min, self.tap_max)
+        if self._bloques is not None:
+            return self._siguiente_tap()
+        return self.flujos['parto'].uniform(self.tap_min, self.tap_max)
     
     def generar_tiempo_reposo(self) -> float:
         """
@@ -91,7 +271,9 @@ class GeneradorVariablesAleatorias:
         Returns:
             Tiempo en minutos
         """
-        return np.random.uniform(self.trep_min, self.trep_max)
+        if self._bloques is not None:
+            return self._siguiente_trep()
+        return self.flujos['reposo'].uniform(self.trep_min, self.trep_max)
     
     def generar_tiempo_incubacion(self) -> float:
         """
@@ -109,11 +291,16 @@ class GeneradorVariablesAleatorias:
         Returns:
             'consulta', 'parto_natural', o 'parto_cesarea'
         """
-        r = np.random.random()
+        if self._bloques is not None:
+            siguiente = self._siguiente_tipo
+        else:
+            siguiente = self.flujos['tipo_paciente'].random
+        
+        r = siguiente()
         
         if r < self.p_parto:
             # Es un parto
-            r2 = np.random.random()
+            r2 = siguiente()
             if r2 < self.p_nat:
                 return 'parto_natural'
             else:
@@ -129,14 +316,20 @@ class GeneradorVariablesAleatorias:
         Returns:
             True si requiere incubadora, False en caso contrario
         """
-        return np.random.random() < self.p_inc
+        if self._bloques is not None:
+            return self._siguiente_inc() < self.p_inc
+        return self.flujos['incubadora'].random() < self.p_inc
     
-    def set_semilla(self, semilla: int):
+    def set_semilla(self, semilla: Optional[Semilla]):
         """
         Establece una nueva semilla para reproducibilidad.
         
+        Recrea todos los sub-flujos a partir de la semilla y descarta los
+        valores ya generados en los buffers.
+        
         Args:
-            semilla: Semilla aleatoria
+            semilla: Entero o SeedSequence (None = entropía del sistema)
         """
-        np.random.seed(semilla)
-
+        self.flujos = crear_flujos(semilla)
+        if self.tamano_bloque is not None:
+            self._crear_bloques()
@@ -4,6 +4,7 @@ Módulo indicadores: Cálculo de indicadores de desempeño y costos
 
 from .calculadora import CalculadoraIndicadores
 from .costos import CalculadoraCostos
+from .estadisticas import AgregadorWelford, ReglaDetencion
 
-__all__ = ['CalculadoraIndicadores', 'CalculadoraCostos']
+__all__ = ['CalculadoraIndicadores', 'CalculadoraCostos', 'AgregadorWelford', 'ReglaDetencion']
 
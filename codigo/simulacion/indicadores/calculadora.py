@@ -45,10 +45,18 @@ class CalculadoraIndicadores:
         # Utilizaciones
         indicadores['UT_med'] = self._calcular_utilizacion_medicos(estado)
         indicadores['UT_Q'] = self._calcular_utilizacion_quirofano(estado)
+        indicadores['UT_SC'] = estado.consultorios.utilizacion(estado.tiempo_actual)
+        indicadores['UT_SR'] = estado.salas_recuperacion.utilizacion(estado.tiempo_actual)
+        indicadores['UT_INC'] = estado.incubadoras.utilizacion(estado.tiempo_actual)
         
         # Porcentaje de tiempo ocioso de salas de recuperación
         indicadores['PTOSR'] = self._calcular_ptosr(estado)
-        indicadores['PTOSR_promedio'] = np.mean(indicadores['PTOSR']) if len(indicadores['PTOSR']) > 0 else 0.0
+        indicadores['PTOSR_promedio'] = float(np.mean(indicadores['PTOSR'])) if len(indicadores['PTOSR']) > 0 else 0.0
+        
+        # Largo promedio de las colas (ponderado por tiempo)
+        indicadores['LPC_consultas'] = estado.largo_cola_consultas.promedio(estado.tiempo_actual)
+        indicadores['LPC_partos_nat'] = estado.largo_cola_partos_naturales.promedio(estado.tiempo_actual)
+        indicadores['LPC_partos_ces'] = estado.largo_cola_partos_cesarea.promedio(estado.tiempo_actual)
         
         # Porcentajes de derivación
         indicadores['PPDSR'] = self._calcular_ppdsr(estado)
@@ -110,14 +118,9 @@ class CalculadoraIndicadores:
     
     def _calcular_ptosr(self, estado: EstadoSistema) -> list:
         """Calcula porcentaje de tiempo ocioso por sala de recuperación (fracción 0-1)."""
-        ptosr = []
-        for i in range(estado.SR):
-            if self.tiempo_efectivo == 0:
-                ptosr.append(0.0)
-            else:
-                fraccion = estado.tiempo_inactividad_sr[i] / self.tiempo_efectivo
-                ptosr.append(fraccion)
-        return ptosr
+        if self.tiempo_efectivo == 0:
+            return [0.0] * estado.SR
+        return (estado.tiempo_inactividad_sr / self.tiempo_efectivo).tolist()
     
     def _calcular_ppdsr(self, estado: EstadoSistema) -> float:
         """Calcula porcentaje de pacientes derivados por falta de salas de recuperación (fracción 0-1)."""
@@ -0,0 +1,201 @@
+"""
+Estadísticas de Réplicas: Agregación en línea de indicadores entre réplicas
+"""
+
+from typing import Dict, Any, Optional, Sequence
+import numpy as np
+
+
+class AgregadorWelford:
+    """
+    Agrega las réplicas de un escenario a medida que llegan, sin guardarlas.
+    
+    Para todos los indicadores a la vez (vectores NumPy) mantiene la cantidad
+    de observaciones, la media, la suma de cuadrados de los desvíos (M2), el
+    mínimo y el máximo, actualizados con el algoritmo de Welford:
+    
+        n += 1;  delta = x - media;  media += delta / n;  M2 += delta * (x - media)
+    
+    La memoria no depende de la cantidad de réplicas y el resumen (media,
+    desvío, IC t de Student, mínimo y máximo) puede consultarse en cualquier
+    momento. Los indicadores ausentes o no numéricos de una réplica no se
+    cuentan para ese indicador.
+    """
+    
+    __slots__ = ('indicadores', 'confianza', 'cantidad', 'n', 'media', 'm2', 'minimo', 'maximo')
+    
+    def __init__(self, indicadores: Sequence[str], confianza: float = 0.95):
+        """
+        Inicializa el agregador sin observaciones.
+        
+        Args:
+            indicadores: Nombres de los indicadores a agregar
+            confianza: Nivel de confianza de los intervalos
+        """
+        self.indicadores = list(indicadores)
+        self.confianza = confianza
+        # Réplicas agregadas (n cuenta, por indicador, las que lo tenían)
+        self.cantidad = 0
+        k = len(self.indicadores)
+        self.n = np.zeros(k, dtype=np.int64)
+        self.media = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.minimo = np.full(k, np.inf)
+        self.maximo = np.full(k, -np.inf)
+    
+    def agregar(self, resultados: Dict[str, Any]):
+        """
+        Incorpora una réplica.
+        
+        Args:
+            resultados: Resultados de la réplica ({indicador: valor})
+        """
+        x = np.array([_valor(resultados.get(indicador)) for indicador in self.indicadores])
+        presentes = ~np.isnan(x)
+        self.cantidad += 1
+        if presentes.all():
+            self.n += 1
+            delta = x - self.media
+            self.media += delta / self.n
+            self.m2 += delta * (x - self.media)
+        else:
+            n = self.n[presentes] + 1
+            delta = x[presentes] - self.media[presentes]
+            media = self.media[presentes] + delta / n
+            self.m2[presentes] += delta * (x[presentes] - media)
+            self.media[presentes] = media
+            self.n[presentes] = n
+        self.minimo = np.fmin(self.minimo, x)
+        self.maximo = np.fmax(self.maximo, x)
+    
+    @property
+    def varianza(self) -> np.ndarray:
+        """Varianza muestral por indicador (NaN con menos de dos observaciones)."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.n > 1, self.m2 / (self.n - 1), np.nan)
+    
+    @property
+    def desviacion(self) -> np.ndarray:
+        """Desvío estándar muestral por indicador."""
+        return np.sqrt(self.varianza)
+    
+    def margen_error(self) -> np.ndarray:
+        """
+        Calcula la semiamplitud del IC t de Student de la media de cada indicador.
+        
+        Returns:
+            Array con t_{(1+confianza)/2, n-1} * desvío / sqrt(n)
+        """
+        from scipy import stats
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            t_critico = stats.t.ppf((1 + self.confianza) / 2, np.where(self.n > 1, self.n - 1, np.nan))
+            return t_critico * self.desviacion / np.sqrt(self.n)
+    
+    def resumen(self) -> Dict[str, Dict[str, float]]:
+        """
+        Resume los indicadores con al menos una observación.
+        
+        Returns:
+            Diccionario {indicador: {n, media, desv, ic_inf, ic_sup, min, max}}
+        """
+        desviacion = self.desviacion
+        margen = self.margen_error()
+        resumen = {}
+        for i, indicador in enumerate(self.indicadores):
+            if self.n[i] == 0:
+                continue
+            resumen[indicador] = {
+                'n': int(self.n[i]),
+                'media': float(self.media[i]),
+                'desv': float(desviacion[i]),
+                'ic_inf': float(self.media[i] - margen[i]),
+                'ic_sup': float(self.media[i] + margen[i]),
+                'min': float(self.minimo[i]),
+                'max': float(self.maximo[i])
+            }
+        return resumen
+
+
+def _valor(valor: Any) -> float:
+    """Convierte un indicador a float (NaN si falta o no es numérico)."""
+    if isinstance(valor, (int, float, np.number)) and not isinstance(valor, bool):
+        return float(valor)
+    return np.nan
+
+
+class ReglaDetencion:
+    """
+    Regla de detención de la replicación secuencial: se agregan réplicas
+    hasta que la semiamplitud del IC de cada indicador elegido quede por
+    debajo del objetivo, o hasta llegar a max_replicas.
+    
+    El objetivo de cada indicador es el mayor entre la precisión absoluta y
+    la relativa (fracción de |media|): alcanza con cumplir cualquiera de las
+    dos.
+    """
+    
+    def __init__(
+        self,
+        indicadores: Sequence[str] = ('PEC_general', 'PPDSR', 'CTM'),
+        relativa: Optional[float] = None,
+        absoluta: Optional[float] = None,
+        min_replicas: int = 5,
+        max_replicas: int = 100,
+        lote: Optional[int] = None
+    ):
+        """
+        Inicializa la regla.
+        
+        Args:
+            indicadores: Indicadores cuya precisión se controla
+            relativa: Semiamplitud objetivo como fracción de |media| (ej. 0.05)
+            absoluta: Semiamplitud objetivo en unidades del indicador
+            min_replicas: Réplicas de la primera ronda
+            max_replicas: Máximo de réplicas por escenario
+            lote: Réplicas a agregar por ronda (None = una por proceso)
+        """
+        if relativa is None and absoluta is None:
+            raise ValueError("La regla de detención necesita una precisión relativa o absoluta")
+        if not 2 <= min_replicas <= max_replicas:
+            raise ValueError("Se requiere 2 <= min_replicas <= max_replicas")
+        self.indicadores = list(indicadores)
+        self.relativa = relativa
+        self.absoluta = absoluta
+        self.min_replicas = min_replicas
+        self.max_replicas = max_replicas
+        self.lote = lote
+    
+    def semiamplitudes(self, agregador: AgregadorWelford) -> Dict[str, float]:
+        """
+        Obtiene la semiamplitud actual del IC de los indicadores controlados.
+        
+        Args:
+            agregador: Agregador de las réplicas del escenario
+        
+        Returns:
+            Diccionario {indicador: semiamplitud} (NaN con menos de dos réplicas)
+        """
+        margen = agregador.margen_error()
+        return {indicador: float(margen[agregador.indicadores.index(indicador)])
+                for indicador in self.indicadores}
+    
+    def cumplida(self, agregador: AgregadorWelford) -> bool:
+        """
+        Indica si todos los indicadores controlados alcanzaron la precisión.
+        
+        Args:
+            agregador: Agregador de las réplicas del escenario
+        
+        Returns:
+            True si ninguna semiamplitud supera su objetivo
+        """
+        if agregador.cantidad < self.min_replicas:
+            return False
+        for indicador, semiamplitud in self.semiamplitudes(agregador).items():
+            media = agregador.media[agregador.indicadores.index(indicador)]
+            objetivo = max(self.absoluta or 0.0, (self.relativa or 0.0) * abs(media))
+            # NaN (menos de dos observaciones) nunca cumple
+            if not semiamplitud <= objetivo:
+                return False
+        return True
@@ -17,6 +17,8 @@ if sys.platform == 'win32':
         pass  # Ya está configurado
 
 from simulacion.experimentos import Experimento
+from simulacion.diseno import DISENOS, generar_diseno, a_escenarios
+from simulacion.indicadores.estadisticas import ReglaDetencion
 from simulacion.analisis_resultados import AnalizadorResultados
 import argparse
 
@@ -31,15 +33,120 @@ def main():
     # Directorio de resultados
     directorio_resultados = Path(__file__).parent / "resultados_simulacion"
     
-    # Crear experimento
-    experimento = Experimento(directorio_resultados=str(directorio_resultados))
-    
     # Argumentos CLI
     parser = argparse.ArgumentParser(description="Simulación Guardia Gineco-Obstétrica")
     parser.add_argument("--replicas", type=int, default=5, help="Número de réplicas por escenario (default: 5)")
     parser.add_argument("--procesos", type=int, default=None, help="Número de procesos paralelos (default: todos los núcleos)")
     parser.add_argument("--yes", action="store_true", help="Saltar confirmación y ejecutar directamente")
+    parser.add_argument("--sin-crn", action="store_true",
+                        help="Usar flujos aleatorios independientes por escenario en lugar de números aleatorios comunes")
+    parser.add_argument("--descompuesto", action="store_true",
+                        help="Simular el frente una vez por (G, SC) y reproducir salas de recuperación "
+                             "e incubadoras para cada SR e I (requiere CRN)")
+    parser.add_argument("--sin-cache", action="store_true",
+                        help="Simular todas las réplicas aunque ya estén en la caché de resultados")
+    parser.add_argument("--reanudar", "--resume", action="store_true",
+                        help="Continuar el barrido interrumpido, ejecutando solo las tareas incompletas "
+                             "del manifiesto (mismos parámetros que la corrida original)")
+    parser.add_argument("--reintentos", type=int, default=2,
+                        help="Veces que se reintenta cada tarea que falla (default: 2)")
+    parser.add_argument("--precision-relativa", type=float, default=None,
+                        help="Replicación secuencial: agregar réplicas hasta que la semiamplitud del IC 95%% "
+                             "de PEC_general, PPDSR y CTM sea menor a esta fracción de la media (ej. 0.05); "
+                             "--replicas pasa a ser la cantidad inicial")
+    parser.add_argument("--precision-absoluta", type=float, default=None,
+                        help="Replicación secuencial con semiamplitud objetivo absoluta (alcanza con "
+                             "cumplir esta o --precision-relativa)")
+    parser.add_argument("--max-replicas", type=int, default=100,
+                        help="Máximo de réplicas por escenario en la replicación secuencial (default: 100)")
+    parser.add_argument("--cribado", type=int, nargs="+", default=None,
+                        help="Réplicas de cada etapa de cribado (ej. --cribado 5 10): tras cada etapa se "
+                             "descartan los escenarios dominados con confianza y solo los demás llegan "
+                             "a --replicas")
+    parser.add_argument("--diseno", choices=DISENOS, default="factorial",
+                        help="Diseño de escenarios: factorial (grilla actual), lhs (hipercubo latino), "
+                             "ortogonal (arreglo ortogonal) o fraccionado (2^(k-1) con punto central)")
+    parser.add_argument("--rango", action="append", default=[], metavar="FACTOR=MIN:MAX",
+                        help="Rango de un factor (G, SC, SR o I) para los diseños lhs, ortogonal y "
+                             "fraccionado y para --optimizar, ej. --rango G=1:6 --rango SR=10:40 "
+                             "(default: el de la grilla)")
+    parser.add_argument("--puntos", type=int, default=20,
+                        help="Puntos del hipercubo latino (default: 20)")
+    parser.add_argument("--niveles", type=int, default=3,
+                        help="Niveles por factor del arreglo ortogonal (default: 3)")
+    parser.add_argument("--semilla-diseno", type=int, default=42,
+                        help="Semilla del hipercubo latino (default: 42)")
+    parser.add_argument("--multifidelidad", action="store_true",
+                        help="Evaluar todas las configuraciones con réplicas cortas y simular el horizonte "
+                             "completo (10 años) solo para la mejor fracción")
+    parser.add_argument("--meses-cortos", type=float, default=12,
+                        help="Horizonte de las réplicas cortas en meses (default: 12)")
+    parser.add_argument("--replicas-cortas", type=int, default=5,
+                        help="Réplicas cortas por configuración (default: 5)")
+    parser.add_argument("--fraccion", type=float, default=0.25,
+                        help="Fracción de configuraciones promovidas al horizonte completo (default: 0.25)")
+    parser.add_argument("--ocba", action="store_true",
+                        help="Elegir los mejores escenarios asignando réplicas adicionales con OCBA a los "
+                             "que compiten por un lugar (--replicas pasa a ser la cantidad inicial)")
+    parser.add_argument("--presupuesto", type=int, default=None,
+                        help="Réplicas totales de la selección OCBA (default: 10 por escenario)")
+    parser.add_argument("--mejores", type=int, default=4,
+                        help="Escenarios a seleccionar con OCBA (default: 4)")
+    parser.add_argument("--objetivo", default="score",
+                        help="Objetivo de la selección OCBA: 'score' (score combinado) o un indicador "
+                             "a minimizar, ej. PEC_general (default: score)")
+    parser.add_argument("--pcs-objetivo", type=float, default=None,
+                        help="Detener la selección OCBA al alcanzar esta probabilidad de selección correcta")
+    parser.add_argument("--optimizar", action="store_true",
+                        help="Buscar la configuración de menor CTM + CII amortizado que cumpla las "
+                             "restricciones (búsqueda COMPASS dentro de --rango; --replicas pasa a ser "
+                             "la cantidad inicial por configuración y --max-replicas la de la mejor)")
+    parser.add_argument("--max-ppdsr", type=float, default=None,
+                        help="Restricción de la optimización: PPDSR medio máximo")
+    parser.add_argument("--max-pec", type=float, default=None,
+                        help="Restricción de la optimización: PEC_general medio máximo")
+    parser.add_argument("--meses-amortizacion", type=float, default=120,
+                        help="Meses en que se amortiza el costo inicial (CII) en la optimización (default: 120)")
+    parser.add_argument("--iteraciones", type=int, default=20,
+                        help="Iteraciones máximas de la optimización (default: 20)")
     args = parser.parse_args()
+    if args.descompuesto and args.sin_crn:
+        parser.error("--descompuesto requiere números aleatorios comunes (no combinar con --sin-crn)")
+    secuencial = args.precision_relativa is not None or args.precision_absoluta is not None
+    if secuencial and (args.descompuesto or args.reanudar):
+        parser.error("La replicación secuencial no se combina con --descompuesto ni con --reanudar")
+    if args.cribado and (secuencial or args.descompuesto or args.reanudar):
+        parser.error("--cribado no se combina con la replicación secuencial, --descompuesto ni --reanudar")
+    if args.ocba and (secuencial or args.cribado or args.descompuesto or args.reanudar):
+        parser.error("--ocba no se combina con la replicación secuencial, --cribado, --descompuesto "
+                     "ni --reanudar")
+    if args.multifidelidad and (secuencial or args.cribado or args.ocba or args.descompuesto
+                                or args.reanudar):
+        parser.error("--multifidelidad no se combina con los demás modos ni con --reanudar")
+    if args.optimizar and (secuencial or args.cribado or args.ocba or args.multifidelidad
+                           or args.descompuesto or args.reanudar):
+        parser.error("--optimizar no se combina con los demás modos ni con --reanudar")
+    rangos = {}
+    for rango in args.rango:
+        try:
+            factor, limites = rango.split("=")
+            minimo, maximo = (int(valor) for valor in limites.split(":"))
+        except ValueError:
+            parser.error(f"Rango inválido: {rango} (formato FACTOR=MIN:MAX, ej. G=1:6)")
+        if factor not in ("G", "SC", "SR", "I"):
+            parser.error(f"Factor desconocido en --rango: {factor} (G, SC, SR o I)")
+        rangos[factor] = (minimo, maximo)
+    try:
+        diseno = generar_diseno(args.diseno, rangos, puntos=args.puntos, niveles=args.niveles,
+                                semilla=args.semilla_diseno)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    # Crear experimento
+    experimento = Experimento(directorio_resultados=str(directorio_resultados),
+                              usar_cache=not args.sin_cache,
+                              max_reintentos=args.reintentos,
+                              escenarios=a_escenarios(diseno))
 
     # Mostrar información de escenarios
     escenarios = experimento.generar_escenarios()
@@ -54,12 +161,26 @@ def main():
     print(f"Réplicas por escenario: {replicas}")
     print(f"Total de simulaciones: {len(escenarios) * replicas}")
     print(f"Núcleos disponibles: {num_nucleos}")
-    print(f"Modo: PARALELO (usando todos los núcleos para réplicas)")
-    print(f"\nEscenarios incluyen:")
-    print(f"  - G (médicos): [2, 3, 4]")
-    print(f"  - SC (salas de consultorio): [2, 3, 4, 5]")
-    print(f"  - SR (salas recuperación): [15, 24, 30]")
-    print(f"  - I (incubadoras): [10, 15, 20]")
+    if args.optimizar:
+        print(f"Modo: OPTIMIZACIÓN (COMPASS, CTM + CII / {args.meses_amortizacion:g} meses)")
+    elif args.multifidelidad:
+        print(f"Modo: MULTI-FIDELIDAD ({args.replicas_cortas} réplicas de {args.meses_cortos:g} meses; "
+              f"{replicas} de 10 años para el {args.fraccion:.0%} mejor)")
+    elif args.ocba:
+        print(f"Modo: SELECCIÓN OCBA (los {args.mejores} mejores según {args.objetivo})")
+    elif args.cribado:
+        print(f"Modo: CRIBADO (etapas de {', '.join(map(str, args.cribado))} réplicas, "
+              f"descartando escenarios dominados)")
+    elif secuencial:
+        print(f"Modo: SECUENCIAL ({replicas} a {args.max_replicas} réplicas según la precisión alcanzada)")
+    elif args.descompuesto:
+        print(f"Modo: DESCOMPUESTO (un frente por (G, SC) y réplica, reproducido para cada SR e I)")
+    else:
+        print(f"Modo: PARALELO (usando todos los núcleos para réplicas)")
+    print(f"\nEscenarios incluyen (diseño {args.diseno}):")
+    for factor, descripcion in (("G", "médicos"), ("SC", "salas de consultorio"),
+                                ("SR", "salas recuperación"), ("I", "incubadoras")):
+        print(f"  - {factor} ({descripcion}): {sorted({punto[factor] for punto in diseno})}")
     print(f"{'='*80}")
     
     if not args.yes:
@@ -70,12 +191,66 @@ def main():
             print("Ejecución cancelada.")
             return
     
-    resultados = experimento.ejecutar_todos_escenarios(
-        num_replicas=replicas,
-        semilla_base=42,
-        mostrar_progreso=True,
-        num_procesos=(args.procesos or num_nucleos)
-    )
+    regla = None
+    if secuencial:
+        regla = ReglaDetencion(relativa=args.precision_relativa, absoluta=args.precision_absoluta,
+                               min_replicas=max(2, replicas), max_replicas=max(args.max_replicas, replicas))
+    
+    restricciones = {}
+    if args.max_ppdsr is not None:
+        restricciones['PPDSR'] = args.max_ppdsr
+    if args.max_pec is not None:
+        restricciones['PEC_general'] = args.max_pec
+    
+    try:
+        if args.optimizar:
+            experimento.optimizar(
+                restricciones=restricciones,
+                meses_amortizacion=args.meses_amortizacion,
+                rangos=rangos,
+                iteraciones=args.iteraciones,
+                replicas_iniciales=max(2, replicas),
+                replicas_maximas=max(args.max_replicas, replicas),
+                semilla_base=42,
+                num_procesos=(args.procesos or num_nucleos),
+                crn=not args.sin_crn
+            )
+        elif args.multifidelidad:
+            experimento.ejecutar_multifidelidad(
+                num_replicas=replicas,
+                replicas_cortas=args.replicas_cortas,
+                tiempo_corto=args.meses_cortos * 30 * 24 * 60,
+                fraccion=args.fraccion,
+                semilla_base=42,
+                num_procesos=(args.procesos or num_nucleos),
+                crn=not args.sin_crn
+            )
+        elif args.ocba:
+            experimento.seleccionar_ocba(
+                presupuesto=args.presupuesto or 10 * len(escenarios),
+                mejores=args.mejores,
+                objetivo=args.objetivo,
+                replicas_iniciales=replicas,
+                pcs_objetivo=args.pcs_objetivo,
+                semilla_base=42,
+                num_procesos=(args.procesos or num_nucleos),
+                crn=not args.sin_crn
+            )
+        else:
+            resultados = experimento.ejecutar_todos_escenarios(
+                num_replicas=replicas,
+                semilla_base=42,
+                mostrar_progreso=True,
+                num_procesos=(args.procesos or num_nucleos),
+                crn=not args.sin_crn,
+                descompuesto=args.descompuesto,
+                reanudar=args.reanudar,
+                regla=regla,
+                cribado=args.cribado
+            )
+    except (FileNotFoundError, ValueError, RuntimeError) as e:
+        print(f"Error: {e}")
+        return
     
     print(f"\n{'='*80}")
     print("✓ SIMULACIONES COMPLETADAS")
@@ -0,0 +1,184 @@
+"""
+Manifiesto de Barrido: Estado de las tareas de un barrido de escenarios
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Any, Iterable
+
+
+# Estados de una tarea
+PENDIENTE = 'pendiente'
+EN_CURSO = 'en_curso'
+TERMINADA = 'terminada'
+FALLIDA = 'fallida'
+
+
+class ManifiestoBarrido:
+    """
+    Registra el estado de cada tarea de un barrido (pendiente, en curso,
+    terminada o fallida) para poder reanudarlo ejecutando solo las tareas
+    incompletas.
+    
+    El archivo se reescribe de forma atómica (archivo temporal + reemplazo) a
+    medida que las tareas terminan, como mucho una vez cada intervalo_guardado
+    segundos y siempre al fallar una tarea o al cerrar una ronda del pool. Al
+    reanudar, una tarea terminada cuyo resultado no llegó a guardarse se
+    vuelve a ejecutar, por lo que una interrupción a lo sumo hace repetir las
+    últimas tareas.
+    """
+    
+    def __init__(
+        self,
+        archivo: str,
+        parametros: Dict[str, Any],
+        ids_tareas: Iterable[str],
+        intervalo_guardado: float = 2.0
+    ):
+        """
+        Inicializa el manifiesto con todas las tareas pendientes (no escribe
+        el archivo; ver abrir).
+        
+        Args:
+            archivo: Ruta del archivo JSON del manifiesto
+            parametros: Parámetros que identifican el barrido (escenarios,
+                réplicas, semilla, modo); deben ser serializables
+            ids_tareas: Identificadores de las tareas del barrido
+            intervalo_guardado: Segundos mínimos entre escrituras del archivo
+        """
+        self.archivo = Path(archivo)
+        # Normalizar (ej. tuplas -> listas) para comparar con el archivo leído
+        self.parametros = json.loads(json.dumps(parametros))
+        self.intervalo_guardado = intervalo_guardado
+        self.tareas: Dict[str, Dict[str, Any]] = {
+            id_tarea: {'estado': PENDIENTE, 'intentos': 0} for id_tarea in ids_tareas
+        }
+        self._ultimo_guardado = 0.0
+    
+    @classmethod
+    def abrir(
+        cls,
+        archivo: str,
+        parametros: Dict[str, Any],
+        ids_tareas: Iterable[str],
+        reanudar: bool = False,
+        intervalo_guardado: float = 2.0
+    ) -> 'ManifiestoBarrido':
+        """
+        Crea el manifiesto de un barrido nuevo, o recupera el estado de las
+        tareas de un barrido interrumpido, y lo escribe en disco.
+        
+        Args:
+            archivo: Ruta del archivo JSON del manifiesto
+            parametros: Parámetros que identifican el barrido
+            ids_tareas: Identificadores de las tareas del barrido
+            reanudar: Si recuperar el estado del manifiesto existente
+            intervalo_guardado: Segundos mínimos entre escrituras del archivo
+        
+        Returns:
+            ManifiestoBarrido listo para usar
+        
+        Raises:
+            FileNotFoundError: Si se pide reanudar y no hay manifiesto
+            ValueError: Si el manifiesto existente es de otro barrido
+        """
+        manifiesto = cls(archivo, parametros, ids_tareas, intervalo_guardado)
+        if reanudar:
+            if not manifiesto.archivo.exists():
+                raise FileNotFoundError(f"No hay un barrido para reanudar: falta {manifiesto.archivo}")
+            with open(manifiesto.archivo, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+            distintos = sorted(
+                nombre for nombre in set(datos['parametros']) | set(manifiesto.parametros)
+                if datos['parametros'].get(nombre) != manifiesto.parametros.get(nombre)
+            )
+            if distintos:
+                raise ValueError(f"El manifiesto {manifiesto.archivo} corresponde a otro barrido "
+                                 f"(difiere en: {', '.join(distintos)})")
+            for id_tarea, tarea in datos['tareas'].items():
+                if id_tarea in manifiesto.tareas:
+                    manifiesto.tareas[id_tarea] = tarea
+        manifiesto.guardar()
+        return manifiesto
+    
+    def terminada(self, id_tarea: str) -> bool:
+        """
+        Indica si una tarea ya terminó.
+        
+        Args:
+            id_tarea: Identificador de la tarea
+        
+        Returns:
+            True si su estado es terminada
+        """
+        return self.tareas[id_tarea]['estado'] == TERMINADA
+    
+    def marcar_en_curso(self, ids_tareas: Iterable[str]):
+        """
+        Marca tareas como enviadas al pool y cuenta un intento más de cada una.
+        
+        Args:
+            ids_tareas: Identificadores de las tareas
+        """
+        for id_tarea in ids_tareas:
+            tarea = self.tareas[id_tarea]
+            tarea['estado'] = EN_CURSO
+            tarea['intentos'] += 1
+        self.guardar()
+    
+    def marcar_terminada(self, id_tarea: str):
+        """
+        Marca una tarea como terminada (su resultado ya debe estar en disco).
+        
+        Args:
+            id_tarea: Identificador de la tarea
+        """
+        tarea = self.tareas[id_tarea]
+        tarea['estado'] = TERMINADA
+        tarea.pop('error', None)
+        self.guardar(forzar=False)
+    
+    def marcar_fallida(self, id_tarea: str, error: str):
+        """
+        Marca una tarea como fallida.
+        
+        Args:
+            id_tarea: Identificador de la tarea
+            error: Descripción del error (ej. traceback)
+        """
+        tarea = self.tareas[id_tarea]
+        tarea['estado'] = FALLIDA
+        tarea['error'] = error
+        self.guardar()
+    
+    def resumen(self) -> Dict[str, int]:
+        """
+        Cuenta las tareas en cada estado.
+        
+        Returns:
+            Diccionario {estado: cantidad}
+        """
+        conteo = {estado: 0 for estado in (PENDIENTE, EN_CURSO, TERMINADA, FALLIDA)}
+        for tarea in self.tareas.values():
+            conteo[tarea['estado']] += 1
+        return conteo
+    
+    def guardar(self, forzar: bool = True):
+        """
+        Escribe el manifiesto de forma atómica.
+        
+        Args:
+            forzar: Si False, no escribe si la última escritura fue hace menos
+                de intervalo_guardado segundos
+        """
+        ahora = time.monotonic()
+        if not forzar and ahora - self._ultimo_guardado < self.intervalo_guardado:
+            return
+        self.archivo.parent.mkdir(parents=True, exist_ok=True)
+        temporal = self.archivo.with_name(f"{self.archivo.name}.{os.getpid()}.tmp")
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump({'parametros': self.parametros, 'tareas': self.tareas}, f, ensure_ascii=False)
+        os.replace(temporal, self.archivo)
+        self._ultimo_guardado = ahora
@@ -0,0 +1,310 @@
+"""
+Metamodelo: Proceso gaussiano sobre los resultados simulados para consultas instantáneas
+"""
+
+import itertools
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+from .almacen import AlmacenResultados
+
+
+# Indicadores que predice el metamodelo por defecto
+INDICADORES_METAMODELO = ('PEC_general', 'PPDSR', 'PPDINC', 'UT_med', 'CTM')
+
+# Factores de entrada, en el orden de las configuraciones (G, SR, I, SC)
+FACTORES = ('G', 'SR', 'I', 'SC')
+
+
+class _ProcesoGaussiano:
+    """
+    Proceso gaussiano de una salida con núcleo Matérn 5/2 de escalas por
+    factor (ARD) y ruido heterocedástico conocido (kriging estocástico): el
+    ruido de cada configuración es la varianza de la media de sus réplicas,
+    más un ruido común estimado.
+    
+    Las entradas se escalan a [0, 1] y la salida se estandariza; los
+    hiperparámetros maximizan la verosimilitud marginal.
+    """
+    
+    def __init__(self, x: np.ndarray, y: np.ndarray, ruido: np.ndarray):
+        """
+        Ajusta el proceso.
+        
+        Args:
+            x: Array (configuraciones, factores) ya escalado a [0, 1]
+            y: Media simulada de cada configuración
+            ruido: Varianza de cada media (varianza de réplica / réplicas)
+        """
+        from scipy import optimize
+        
+        self.x = x
+        self.media_y = float(np.mean(y))
+        self.escala_y = float(np.std(y)) or 1.0
+        self.y = (y - self.media_y) / self.escala_y
+        self.ruido = ruido / self.escala_y ** 2
+        
+        k = x.shape[1]
+        limites = [(np.log(0.05), np.log(20.0))] * k + [(np.log(1e-3), np.log(10.0)), (np.log(1e-8), 0.0)]
+        mejor = None
+        for escala in (0.3, 1.0, 3.0):
+            inicial = np.array([np.log(escala)] * k + [0.0, np.log(1e-4)])
+            resultado = optimize.minimize(self._menos_log_verosimilitud, inicial,
+                                          method='L-BFGS-B', bounds=limites)
+            if mejor is None or resultado.fun < mejor.fun:
+                mejor = resultado
+        self._fijar(mejor.x)
+    
+    def _fijar(self, parametros: np.ndarray):
+        """Guarda los hiperparámetros y factoriza la matriz de covarianza."""
+        self.escalas = np.exp(parametros[:-2])
+        self.varianza = float(np.exp(parametros[-2]))
+        self.pepita = float(np.exp(parametros[-1]))
+        self._cholesky = np.linalg.cholesky(self._covarianza_entrenamiento(self.x, self.ruido))
+        self._alfa = _resolver_cholesky(self._cholesky, self.y)
+    
+    def _nucleo(self, a: np.ndarray, b: np.ndarray, escalas: np.ndarray, varianza: float) -> np.ndarray:
+        """Núcleo Matérn 5/2 entre las filas de a y de b."""
+        r = np.sqrt(np.maximum(
+            (((a[:, None, :] - b[None, :, :]) / escalas) ** 2).sum(axis=2), 0.0
+        ))
+        raiz5r = np.sqrt(5.0) * r
+        return varianza * (1.0 + raiz5r + raiz5r ** 2 / 3.0) * np.exp(-raiz5r)
+    
+    def _covarianza_entrenamiento(self, x: np.ndarray, ruido: np.ndarray) -> np.ndarray:
+        """Covarianza de las observaciones: núcleo + ruido de cada media + pepita."""
+        return (self._nucleo(x, x, self.escalas, self.varianza)
+                + np.diag(ruido + self.pepita + 1e-10))
+    
+    def _menos_log_verosimilitud(self, parametros: np.ndarray) -> float:
+        """Menos la log-verosimilitud marginal de los datos."""
+        escalas = np.exp(parametros[:-2])
+        varianza = np.exp(parametros[-2])
+        pepita = np.exp(parametros[-1])
+        covarianza = self._nucleo(self.x, self.x, escalas, varianza) + np.diag(self.ruido + pepita + 1e-10)
+        try:
+            cholesky = np.linalg.cholesky(covarianza)
+        except np.linalg.LinAlgError:
+            return 1e10
+        alfa = _resolver_cholesky(cholesky, self.y)
+        return float(0.5 * self.y @ alfa + np.log(np.diag(cholesky)).sum()
+                     + 0.5 * len(self.y) * np.log(2 * np.pi))
+    
+    def predecir(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Predice la media (sin ruido de simulación) en nuevas configuraciones.
+        
+        Args:
+            x: Array (configuraciones, factores) ya escalado
+        
+        Returns:
+            Tupla (media, desvío) en las unidades del indicador
+        """
+        from scipy.linalg import solve_triangular
+        
+        cruzada = self._nucleo(x, self.x, self.escalas, self.varianza)
+        media = cruzada @ self._alfa
+        v = solve_triangular(self._cholesky, cruzada.T, lower=True)
+        varianza = np.maximum(self.varianza - (v ** 2).sum(axis=0), 0.0)
+        return self.media_y + self.escala_y * media, self.escala_y * np.sqrt(varianza)
+    
+    def varianza_posterior(self, x: np.ndarray, x_extra: np.ndarray, ruido_extra: float) -> np.ndarray:
+        """
+        Calcula la varianza (estandarizada) que quedaría en x si además se
+        simularan las configuraciones x_extra. No depende de los resultados
+        que se obtendrían, solo de dónde se simula.
+        
+        Args:
+            x: Array de configuraciones donde medir la varianza
+            x_extra: Array de configuraciones a simular
+            ruido_extra: Varianza estandarizada de la media de cada una
+        
+        Returns:
+            Array con la varianza posterior en cada fila de x
+        """
+        from scipy.linalg import solve_triangular
+        
+        x_total = np.vstack([self.x, x_extra])
+        ruido_total = np.concatenate([self.ruido, np.full(len(x_extra), ruido_extra)])
+        cholesky = np.linalg.cholesky(self._covarianza_entrenamiento(x_total, ruido_total))
+        v = solve_triangular(cholesky, self._nucleo(x, x_total, self.escalas, self.varianza).T, lower=True)
+        return np.maximum(self.varianza - (v ** 2).sum(axis=0), 0.0)
+
+
+def _resolver_cholesky(cholesky: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Resuelve K x = b a partir del factor de Cholesky inferior de K."""
+    from scipy.linalg import cho_solve
+    
+    return cho_solve((cholesky, True), b)
+
+
+class Metamodelo:
+    """
+    Metamodelo de los indicadores sobre las configuraciones (G, SR, I, SC):
+    un proceso gaussiano por indicador, entrenado con la media y la varianza
+    de las réplicas de cada configuración simulada. Predice cada indicador
+    con su incertidumbre en configuraciones nunca simuladas (dentro del
+    rango entrenado) en milisegundos, e indica dónde conviene simular para
+    reducir más la incertidumbre.
+    """
+    
+    def __init__(
+        self,
+        replicas,
+        indicadores: Sequence[str] = INDICADORES_METAMODELO
+    ):
+        """
+        Entrena el metamodelo.
+        
+        Args:
+            replicas: DataFrame con una fila por réplica (columnas G, SR, I,
+                SC y los indicadores), ej. AlmacenResultados.cargar_tabla()
+            indicadores: Indicadores a modelar
+        """
+        grupos = replicas.groupby(list(FACTORES))
+        medias = grupos[list(indicadores)].mean()
+        varianzas = grupos[list(indicadores)].var(ddof=1)
+        cantidades = grupos.size()
+        
+        self.indicadores = list(indicadores)
+        self.configuraciones = np.array(medias.index.tolist(), dtype=float)
+        self.minimos = self.configuraciones.min(axis=0)
+        self.maximos = self.configuraciones.max(axis=0)
+        self.replicas = cantidades.to_numpy()
+        
+        x = self._escalar(self.configuraciones)
+        self._procesos: Dict[str, _ProcesoGaussiano] = {}
+        for indicador in self.indicadores:
+            ruido = (varianzas[indicador] / cantidades).to_numpy(dtype=float)
+            # Configuraciones con una sola réplica: ruido típico de las demás
+            ruido = np.where(np.isnan(ruido), np.nanmedian(ruido) if np.isfinite(ruido).any() else 0.0, ruido)
+            self._procesos[indicador] = _ProcesoGaussiano(x, medias[indicador].to_numpy(dtype=float), ruido)
+    
+    @classmethod
+    def desde_almacen(
+        cls,
+        almacen: Union[AlmacenResultados, str, Path],
+        indicadores: Sequence[str] = INDICADORES_METAMODELO,
+        semilla_base: Optional[int] = None,
+        crn: Optional[bool] = None
+    ) -> 'Metamodelo':
+        """
+        Entrena el metamodelo con todas las réplicas de una serie de semillas
+        de un almacén.
+        
+        Args:
+            almacen: AlmacenResultados o ruta de resultados.sqlite
+            indicadores: Indicadores a modelar
+            semilla_base: Semilla base de las réplicas (None = la única guardada)
+            crn: Si las réplicas usan números aleatorios comunes (None = la
+                única serie guardada)
+        
+        Returns:
+            Metamodelo entrenado
+        """
+        if isinstance(almacen, AlmacenResultados):
+            return cls(almacen.cargar_tabla(semilla_base=semilla_base, crn=crn), indicadores)
+        with AlmacenResultados(almacen) as abierto:
+            return cls(abierto.cargar_tabla(semilla_base=semilla_base, crn=crn), indicadores)
+    
+    def _escalar(self, configuraciones: np.ndarray) -> np.ndarray:
+        """Escala las configuraciones al cubo [0, 1] del rango entrenado."""
+        amplitud = np.where(self.maximos > self.minimos, self.maximos - self.minimos, 1.0)
+        return (np.asarray(configuraciones, dtype=float) - self.minimos) / amplitud
+    
+    def predecir(
+        self,
+        configuraciones: Sequence[Tuple[int, int, int, int]]
+    ) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Predice los indicadores de configuraciones (simuladas o no).
+        
+        Args:
+            configuraciones: Tuplas (G, SR, I, SC)
+        
+        Returns:
+            Diccionario {indicador: {'media': array, 'desv': array}}; desv es
+            el desvío de la predicción de la media del indicador
+        """
+        x = self._escalar(np.atleast_2d(np.array(configuraciones, dtype=float)))
+        predicciones = {}
+        for indicador, proceso in self._procesos.items():
+            media, desvio = proceso.predecir(x)
+            predicciones[indicador] = {'media': media, 'desv': desvio}
+        return predicciones
+    
+    def consultar(self, G: int, SR: int, I: int, SC: int) -> Dict[str, Dict[str, float]]:
+        """
+        Predice los indicadores de una configuración.
+        
+        Args:
+            G, SR, I, SC: Configuración
+        
+        Returns:
+            Diccionario {indicador: {media, desv, ic_inf, ic_sup}} (IC 95%)
+        """
+        consulta = {}
+        for indicador, prediccion in self.predecir([(G, SR, I, SC)]).items():
+            media, desvio = float(prediccion['media'][0]), float(prediccion['desv'][0])
+            consulta[indicador] = {'media': media, 'desv': desvio,
+                                   'ic_inf': media - 1.96 * desvio, 'ic_sup': media + 1.96 * desvio}
+        return consulta
+    
+    def candidatos(self) -> List[Tuple[int, int, int, int]]:
+        """
+        Genera todas las configuraciones enteras dentro del rango entrenado.
+        
+        Returns:
+            Lista de tuplas (G, SR, I, SC)
+        """
+        return list(itertools.product(*(range(int(minimo), int(maximo) + 1)
+                                        for minimo, maximo in zip(self.minimos, self.maximos))))
+    
+    def proximas_simulaciones(
+        self,
+        cantidad: int = 5,
+        candidatos: Optional[Sequence[Tuple[int, int, int, int]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Elige las configuraciones cuya simulación más reduciría la
+        incertidumbre del metamodelo: de a una, la que más baja la suma de las
+        varianzas (estandarizadas, de todos los indicadores) sobre los
+        candidatos, suponiendo que cada una se simula con la cantidad típica
+        de réplicas.
+        
+        Args:
+            cantidad: Configuraciones a elegir
+            candidatos: Configuraciones posibles (None = todas las enteras
+                del rango entrenado, ver candidatos)
+        
+        Returns:
+            Lista de diccionarios {G, SR, I, SC, reduccion}, con reduccion la
+            fracción de la varianza total que elimina cada elección
+        """
+        candidatos = self.candidatos() if candidatos is None else list(candidatos)
+        x = self._escalar(np.array(candidatos, dtype=float))
+        # Ruido de una configuración nueva: el típico de las simuladas
+        ruidos = {indicador: float(np.median(proceso.ruido)) for indicador, proceso in self._procesos.items()}
+        
+        def varianza_total(elegidas: List[int]) -> np.ndarray:
+            """Varianza estandarizada, por candidato, tras simular las elegidas."""
+            return sum(proceso.varianza_posterior(x, x[elegidas], ruidos[indicador])
+                       for indicador, proceso in self._procesos.items())
+        
+        elegidas: List[int] = []
+        actual = varianza_total(elegidas)
+        total_inicial = actual.sum()
+        seleccion = []
+        for _ in range(min(cantidad, len(candidatos))):
+            # Preseleccionar los de mayor varianza y medir la reducción total
+            # que logra cada uno sobre todos los candidatos
+            preseleccion = [i for i in np.argsort(-actual, kind='stable') if i not in elegidas][:20]
+            reducciones = [actual.sum() - varianza_total(elegidas + [i]).sum() for i in preseleccion]
+            mejor = preseleccion[int(np.argmax(reducciones))]
+            elegidas.append(mejor)
+            G, SR, I, SC = candidatos[mejor]
+            seleccion.append({'G': G, 'SR': SR, 'I': I, 'SC': SC,
+                              'reduccion': float(max(reducciones) / total_inicial) if total_inicial > 0 else 0.0})
+            actual = varianza_total(elegidas)
+        return seleccion
@@ -0,0 +1,134 @@
+"""
+Optimización: Búsqueda por vecindarios (COMPASS) en el espacio entero de configuraciones
+"""
+
+from typing import Dict, Any, List, Sequence, Tuple
+import numpy as np
+
+
+# Configuración (G, SR, I, SC)
+Configuracion = Tuple[int, int, int, int]
+
+# Factores de las configuraciones, en orden
+FACTORES = ('G', 'SR', 'I', 'SC')
+
+
+def en_region_compass(
+    puntos: np.ndarray,
+    mejor: np.ndarray,
+    visitados: np.ndarray,
+    escala: np.ndarray
+) -> np.ndarray:
+    """
+    Indica qué puntos pertenecen al área más prometedora de COMPASS (Hong y
+    Nelson, 2006): los que están al menos tan cerca de la mejor solución
+    como de cualquier otra solución visitada. Las distancias se miden con
+    cada factor dividido por la amplitud de su rango.
+    
+    Args:
+        puntos: Array (puntos, factores)
+        mejor: Mejor solución actual
+        visitados: Array (visitados, factores) con las demás soluciones visitadas
+        escala: Amplitud del rango de cada factor
+    
+    Returns:
+        Array booleano, True para los puntos del área
+    """
+    p = puntos / escala
+    distancia_mejor = ((p - mejor / escala) ** 2).sum(axis=1)
+    if len(visitados) == 0:
+        return np.ones(len(puntos), dtype=bool)
+    distancias = ((p[:, None, :] - (visitados / escala)[None, :, :]) ** 2).sum(axis=2)
+    return (distancia_mejor[:, None] <= distancias).all(axis=1)
+
+
+def muestrear_region(
+    mejor: Configuracion,
+    visitados: Sequence[Configuracion],
+    minimos: np.ndarray,
+    maximos: np.ndarray,
+    cantidad: int,
+    generador: np.random.Generator,
+    intentos: int = 2000
+) -> List[Configuracion]:
+    """
+    Muestrea configuraciones nuevas (no visitadas) del área más prometedora.
+    
+    Se proponen puntos al azar en una caja alrededor de la mejor solución
+    que se achica cada 100 rechazos, de modo que se encuentran puntos aunque
+    el área sea chica. Si no se encuentra ninguno, se prueban los vecinos
+    inmediatos (±1 en un factor) de la mejor solución.
+    
+    Args:
+        mejor: Mejor solución actual
+        visitados: Todas las soluciones visitadas (incluida la mejor)
+        minimos: Mínimo de cada factor
+        maximos: Máximo de cada factor
+        cantidad: Configuraciones a muestrear
+        generador: Generador aleatorio
+        intentos: Propuestas al azar como máximo
+    
+    Returns:
+        Lista de configuraciones (vacía si el área no tiene puntos sin
+        visitar: la mejor solución es un óptimo local)
+    """
+    centro = np.array(mejor)
+    escala = np.maximum(maximos - minimos, 1)
+    vistos = set(map(tuple, visitados))
+    otros = np.array([v for v in visitados if tuple(v) != tuple(mejor)], dtype=float).reshape(-1, len(centro))
+    elegidos: List[Configuracion] = []
+    
+    radio = escala.astype(float)
+    for intento in range(intentos):
+        if len(elegidos) >= cantidad:
+            break
+        if intento > 0 and intento % 100 == 0:
+            radio = np.maximum(radio / 2, 1.0)
+        propuesta = np.clip(centro + np.round(generador.uniform(-radio, radio)).astype(int), minimos, maximos)
+        clave = tuple(int(v) for v in propuesta)
+        if clave in vistos:
+            continue
+        if en_region_compass(propuesta[None, :].astype(float), centro.astype(float), otros, escala)[0]:
+            elegidos.append(clave)
+            vistos.add(clave)
+    
+    if not elegidos:
+        for factor in range(len(centro)):
+            for paso in (-1, 1):
+                vecino = centro.copy()
+                vecino[factor] += paso
+                clave = tuple(int(v) for v in vecino)
+                if (minimos[factor] <= vecino[factor] <= maximos[factor] and clave not in vistos
+                        and en_region_compass(vecino[None, :].astype(float), centro.astype(float),
+                                              otros, escala)[0]):
+                    elegidos.append(clave)
+                    vistos.add(clave)
+        elegidos = elegidos[:cantidad]
+    return elegidos
+
+
+def evaluar_solucion(
+    resumen: Dict[str, Any],
+    restricciones: Dict[str, float],
+    meses_amortizacion: float
+) -> Tuple[float, float]:
+    """
+    Calcula el objetivo y la violación de restricciones de una configuración.
+    
+    Args:
+        resumen: Estadísticas de la configuración (claves {indicador}_media)
+        restricciones: Cota superior de cada indicador ({indicador: máximo})
+        meses_amortizacion: Meses en que se amortiza el costo inicial
+    
+    Returns:
+        Tupla (objetivo, violacion): objetivo = CTM + CII / meses_amortizacion
+        (costo mensual) y violacion = suma de los excesos relativos sobre las
+        cotas (0 si es factible)
+    """
+    objetivo = resumen['CTM_media'] + resumen['CII_media'] / meses_amortizacion
+    violacion = 0.0
+    for indicador, maximo in restricciones.items():
+        exceso = resumen[f'{indicador}_media'] - maximo
+        if exceso > 0:
+            violacion += exceso / max(abs(maximo), 1e-9)
+    return float(objetivo), float(violacion)
@@ -4,7 +4,7 @@ Lógica de asignación de recursos según prioridades
 
 from typing import Optional
 from ..core.estado import EstadoSistema
-from ..core.evento import Evento
+from ..core.evento import Evento, INICIO_CONSULTA, INICIO_PARTO
 from ..core.paciente import Paciente
 from ..generadores.variables_aleatorias import GeneradorVariablesAleatorias
 
@@ -51,15 +51,16 @@ def asignar_recursos(
             estado.quirofano_disponible):
             
             paciente = estado.cola_partos_naturales.popleft()
+            estado.largo_cola_partos_naturales.actualizar(estado.tiempo_actual,
+                                                          len(estado.cola_partos_naturales))
             estado.medicos_disponibles -= 1
             estado.quirofano_disponible = False
             
             # Programar inicio de parto (inmediato)
             evento = Evento(
-                tipo='inicio_parto',
+                tipo=INICIO_PARTO,
                 tiempo=estado.tiempo_actual,
-                paciente_id=paciente.id,
-                datos_extra={'tipo_parto': 'natural', 'paciente': paciente}
+                paciente=paciente
             )
             tef.insertar(evento)
             recursos_asignados = True
@@ -73,15 +74,16 @@ def asignar_recursos(
             estado.quirofano_disponible):
             
             paciente = estado.cola_partos_cesarea.popleft()
+            estado.largo_cola_partos_cesarea.actualizar(estado.tiempo_actual,
+                                                        len(estado.cola_partos_cesarea))
             estado.medicos_disponibles -= 1
             estado.quirofano_disponible = False
             
             # Programar inicio de parto (inmediato)
             evento = Evento(
-                tipo='inicio_parto',
+                tipo=INICIO_PARTO,
                 tiempo=estado.tiempo_actual,
-                paciente_id=paciente.id,
-                datos_extra={'tipo_parto': 'cesarea', 'paciente': paciente}
+                paciente=paciente
             )
             tef.insertar(evento)
             recursos_asignados = True
@@ -98,16 +100,18 @@ def asignar_recursos(
             # Verificar que no haya partos esperando (respeto estricto de prioridades)
             if len(estado.cola_partos_naturales) == 0 and len(estado.cola_partos_cesarea) == 0:
                 paciente = estado.cola_consultas.popleft()
+                estado.largo_cola_consultas.actualizar(estado.tiempo_actual,
+                                                       len(estado.cola_consultas))
                 estado.medicos_disponibles -= 1
                 consultorio_id = estado.asignar_consultorio()
                 paciente.consultorio_asignado = consultorio_id
                 
                 # Programar inicio de consulta (inmediato)
                 evento = Evento(
-                    tipo='inicio_consulta',
+                    tipo=INICIO_CONSULTA,
                     tiempo=estado.tiempo_actual,
-                    paciente_id=paciente.id,
-                    datos_extra={'paciente': paciente, 'consultorio_id': consultorio_id}
+                    paciente=paciente,
+                    recurso_id=consultorio_id
                 )
                 tef.insertar(evento)
                 recursos_asignados = True
@@ -0,0 +1,214 @@
+"""
+Selección del Mejor Escenario: Asignación óptima del presupuesto de cómputo (OCBA)
+"""
+
+from typing import Dict, Any, List, Sequence
+import numpy as np
+
+
+# Pesos del score combinado (los mismos que
+# AnalizadorResultados.identificar_mejores_4_escenarios)
+PESOS_SCORE = {
+    'PEC_general': 0.30,
+    'PPDSR': 0.25,
+    'CTM': 0.25,
+    'CII': 0.10,
+    'PTOSR_promedio': 0.10
+}
+
+# Objetivos del cribado por dominancia de Pareto (todos se minimizan)
+INDICADORES_CRIBADO = ['PEC_general', 'PPDSR', 'PPDINC', 'CTM', 'CII']
+
+# Piso de desvíos y diferencias de medias (evita divisiones por cero con
+# indicadores deterministas, como CII, o medias empatadas)
+_EPSILON = 1e-12
+
+
+def score_por_replica(valores: np.ndarray, medias: np.ndarray) -> np.ndarray:
+    """
+    Calcula el score combinado de cada réplica (menor es mejor).
+    
+    Cada indicador se normaliza con el rango de las medias de los escenarios
+    (y PTOSR con su distancia a la mediana), igual que en
+    AnalizadorResultados.identificar_mejores_4_escenarios, pero réplica por
+    réplica para poder estimar la varianza del score de cada escenario.
+    
+    Args:
+        valores: Array (réplicas, indicadores) con las columnas de PESOS_SCORE
+        medias: Array (escenarios, indicadores) con las medias actuales de
+            todos los escenarios (definen la normalización)
+    
+    Returns:
+        Array con el score de cada réplica
+    """
+    minimo = medias.min(axis=0)
+    rango = medias.max(axis=0) - minimo + 1e-10
+    normalizados = (valores - minimo) / rango
+    ptosr = list(PESOS_SCORE).index('PTOSR_promedio')
+    normalizados[:, ptosr] = np.abs(valores[:, ptosr] - np.median(medias[:, ptosr])) / rango[ptosr]
+    return normalizados @ np.array(list(PESOS_SCORE.values()))
+
+
+def asignacion_ocba(
+    medias: np.ndarray,
+    varianzas: np.ndarray,
+    presupuesto: float,
+    m: int = 1
+) -> np.ndarray:
+    """
+    Reparte un presupuesto total de réplicas entre escenarios según OCBA
+    (minimización).
+    
+    Con m = 1 usa la regla clásica de Chen et al. (2000): para i, j distintos
+    del mejor b, n_i / n_j = (σ_i / δ_i)² / (σ_j / δ_j)² con δ_i = μ_i - μ_b,
+    y n_b = σ_b · sqrt(Σ n_i² / σ_i²). Con m > 1 usa OCBA-m (Chen et al.,
+    2008): n_i ∝ (σ_i / (μ_i - c))², con c entre la m-ésima y la (m+1)-ésima
+    media.
+    
+    Args:
+        medias: Media actual del objetivo de cada escenario
+        varianzas: Varianza (de una réplica) del objetivo de cada escenario
+        presupuesto: Réplicas totales a repartir
+        m: Cantidad de escenarios a seleccionar
+    
+    Returns:
+        Array con la cantidad (no entera) de réplicas de cada escenario
+    """
+    medias = np.asarray(medias, dtype=float)
+    desvios = np.sqrt(np.maximum(np.asarray(varianzas, dtype=float), _EPSILON ** 2))
+    orden = np.argsort(medias, kind='stable')
+    
+    if m == 1:
+        mejor = orden[0]
+        delta = np.maximum(np.abs(medias - medias[mejor]), _EPSILON)
+        pesos = (desvios / delta) ** 2
+        otros = np.arange(len(medias)) != mejor
+        pesos[mejor] = desvios[mejor] * np.sqrt(np.sum(pesos[otros] ** 2 / desvios[otros] ** 2))
+    else:
+        c = (medias[orden[m - 1]] + medias[orden[m]]) / 2
+        pesos = (desvios / np.maximum(np.abs(medias - c), _EPSILON)) ** 2
+    
+    return presupuesto * pesos / pesos.sum()
+
+
+def probabilidad_seleccion_correcta(
+    medias: np.ndarray,
+    varianzas: np.ndarray,
+    replicas: np.ndarray,
+    m: int = 1
+) -> float:
+    """
+    Aproxima la probabilidad de selección correcta (PCS) con la cota de
+    Bonferroni (APCS): con m = 1, 1 - Σ P(μ_i < μ_b); con m > 1, 1 menos la
+    probabilidad de que algún escenario quede del lado equivocado de c.
+    
+    Supone escenarios independientes: con números aleatorios comunes las
+    diferencias tienen menos varianza, por lo que la PCS real es mayor.
+    
+    Args:
+        medias: Media del objetivo de cada escenario
+        varianzas: Varianza (de una réplica) del objetivo de cada escenario
+        replicas: Réplicas simuladas de cada escenario
+        m: Cantidad de escenarios seleccionados
+    
+    Returns:
+        Probabilidad aproximada (cota inferior) de que los m escenarios de
+        menor media sean realmente los m mejores
+    """
+    from scipy import stats
+    
+    medias = np.asarray(medias, dtype=float)
+    varianzas_media = np.asarray(varianzas, dtype=float) / np.asarray(replicas, dtype=float)
+    orden = np.argsort(medias, kind='stable')
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if m == 1:
+            mejor = orden[0]
+            otros = np.arange(len(medias)) != mejor
+            delta = medias[otros] - medias[mejor]
+            desvio = np.sqrt(varianzas_media[otros] + varianzas_media[mejor])
+            errores = stats.norm.cdf(-delta / desvio)
+        else:
+            c = (medias[orden[m - 1]] + medias[orden[m]]) / 2
+            errores = stats.norm.cdf(-np.abs(medias - c) / np.sqrt(varianzas_media))
+    # Desvío nulo: sin error si las medias difieren
+    errores = np.nan_to_num(errores, nan=0.5)
+    return float(max(0.0, 1.0 - errores.sum()))
+
+
+def repartir_incremento(objetivo: np.ndarray, actuales: np.ndarray, incremento: int) -> np.ndarray:
+    """
+    Convierte una asignación OCBA en réplicas enteras a agregar en una ronda:
+    a cada escenario le faltan max(0, objetivo - actuales); si en total faltan
+    más que el incremento, se reparten proporcionalmente (restos mayores).
+    
+    Args:
+        objetivo: Réplicas totales asignadas a cada escenario (ver asignacion_ocba)
+        actuales: Réplicas ya simuladas de cada escenario
+        incremento: Réplicas a agregar en la ronda
+    
+    Returns:
+        Array de enteros con las réplicas a agregar a cada escenario
+    """
+    faltantes = np.maximum(np.asarray(objetivo, dtype=float) - actuales, 0.0)
+    if faltantes.sum() <= 0:
+        faltantes = np.asarray(objetivo, dtype=float)
+    cuota = faltantes * incremento / faltantes.sum()
+    agregar = np.floor(cuota).astype(int)
+    restantes = incremento - agregar.sum()
+    if restantes > 0:
+        agregar[np.argsort(-(cuota - agregar), kind='stable')[:restantes]] += 1
+    return agregar
+
+
+def ranking(
+    escenarios: Sequence[tuple],
+    medias: np.ndarray,
+    desvios: np.ndarray,
+    replicas: np.ndarray
+) -> List[Dict[str, Any]]:
+    """
+    Ordena los escenarios por media del objetivo (menor es mejor).
+    
+    Args:
+        escenarios: Tuplas (G, SR, I, SC)
+        medias: Media del objetivo de cada escenario
+        desvios: Desvío del objetivo de cada escenario
+        replicas: Réplicas simuladas de cada escenario
+    
+    Returns:
+        Lista de diccionarios {G, SR, I, SC, media, desv, num_replicas}
+    """
+    filas = []
+    for i in np.argsort(medias, kind='stable'):
+        G, SR, I, SC = escenarios[i]
+        filas.append({
+            'G': G, 'SR': SR, 'I': I, 'SC': SC,
+            'media': float(medias[i]),
+            'desv': float(desvios[i]),
+            'num_replicas': int(replicas[i])
+        })
+    return filas
+
+
+def dominados_pareto(ic_inf: np.ndarray, ic_sup: np.ndarray) -> np.ndarray:
+    """
+    Busca los escenarios dominados con confianza (todos los objetivos se
+    minimizan): j está dominado por i si el IC de i queda por debajo del de
+    j en todos los objetivos (ic_sup_i <= ic_inf_j) y estrictamente en
+    alguno. Como los IC no se superponen, la dominancia no se debe al ruido
+    de las pocas réplicas simuladas.
+    
+    Args:
+        ic_inf: Array (escenarios, objetivos) con los extremos inferiores de los IC
+        ic_sup: Array (escenarios, objetivos) con los extremos superiores de los IC
+    
+    Returns:
+        Array con el índice de un escenario que domina a cada escenario, o -1
+        si no está dominado
+    """
+    # comparacion[i, j, k]: i es mejor que j en el objetivo k, con confianza
+    no_peor = ic_sup[:, None, :] <= ic_inf[None, :, :]
+    mejor = ic_sup[:, None, :] < ic_inf[None, :, :]
+    domina = no_peor.all(axis=2) & mejor.any(axis=2)
+    return np.where(domina.any(axis=0), domina.argmax(axis=0), -1)
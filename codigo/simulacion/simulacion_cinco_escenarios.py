@@ -31,14 +31,35 @@ if sys.platform == 'win32':
         pass
 
 from simulacion.simulador import Simulador
+from simulacion.generadores.variables_aleatorias import semilla_replica
+from simulacion.experimentos import diferencias_pareadas, INDICADORES_ESCENARIO as INDICADORES_BASE
+from simulacion.cache import CacheResultados
+from simulacion.almacen import AlmacenResultados
+from simulacion.indicadores.estadisticas import AgregadorWelford
+
+
+# Indicadores resumidos por escenario: los del experimento más los totales de pacientes
+INDICADORES_ESCENARIO = INDICADORES_BASE + [
+    'total_pacientes_llegados', 'total_pacientes_atendidos',
+    'total_derivaciones_sr', 'total_derivaciones_inc'
+]
+
+# Indicadores de las comparaciones pareadas contra la referencia
+INDICADORES_PAREADOS = ['PEC_general', 'PPDSR', 'PPDINC', 'CTM', 'CII']
 
 
 class ComparadorCincoEscenarios:
     """Ejecuta y compara cinco escenarios de configuración."""
     
-    def __init__(self, directorio_resultados: str = "resultados_cinco_escenarios"):
+    def __init__(self, directorio_resultados: str = "resultados_cinco_escenarios", usar_cache: bool = True):
         self.directorio_resultados = Path(directorio_resultados)
         self.directorio_resultados.mkdir(parents=True, exist_ok=True)
+        # Réplicas ya simuladas (ver CacheResultados)
+        self.cache = CacheResultados(self.directorio_resultados / "cache") if usar_cache else None
+        # Resultados de todas las réplicas (ver AlmacenResultados)
+        self.almacen = AlmacenResultados(self.directorio_resultados / "resultados.sqlite")
+        # Indicadores pareados de cada réplica por escenario (para comparaciones pareadas)
+        self.replicas_por_escenario = {}
         
     def definir_escenarios(self):
         """
@@ -87,7 +108,7 @@ class ComparadorCincoEscenarios:
         return escenarios
     
     def ejecutar_escenario(self, nombre: str, config: dict, num_replicas: int = 30, 
-                          semilla_base: int = 42):
+                          semilla_base: int = 42, crn: bool = True):
         """
         Ejecuta un escenario con múltiples réplicas.
         
@@ -96,6 +117,8 @@ class ComparadorCincoEscenarios:
             config: Configuración (G, SC, SR, I)
             num_replicas: Número de réplicas
             semilla_base: Semilla base
+            crn: Si usar números aleatorios comunes (la réplica k usa los mismos
+                flujos aleatorios en todos los escenarios)
             
         Returns:
             Estadísticas agregadas del escenario
@@ -117,35 +140,50 @@ class ComparadorCincoEscenarios:
         dir_escenario.mkdir(parents=True, exist_ok=True)
         
         # Ejecutar réplicas
+        agregador = AgregadorWelford(INDICADORES_ESCENARIO)
         replicas = []
         for replica in range(1, num_replicas + 1):
-            semilla = semilla_base + replica * 1000 + config['G'] * 100
-            
-            # Crear y ejecutar simulador
-            simulador = Simulador(
-                G=config['G'],
-                SR=config['SR'],
-                I=config['I'],
-                SC=config['SC'],
-                semilla=semilla
-            )
+            configuracion = None if crn else (config['G'], config['SR'], config['I'], config['SC'])
+            semilla = semilla_replica(semilla_base, replica, configuracion)
             
-            resultados = simulador.ejecutar(mostrar_progreso=False)
-            replicas.append(resultados)
+            # Reutilizar la réplica si ya fue simulada con el mismo modelo
+            clave = None
+            resultados = None
+            if self.cache is not None:
+                clave = self.cache.clave(config['G'], config['SR'], config['I'], config['SC'], semilla)
+                resultados = self.cache.obtener(clave)
             
-            # Guardar réplica individual
-            archivo_replica = dir_escenario / f"replica_{replica:02d}.json"
-            with open(archivo_replica, 'w', encoding='utf-8') as f:
-                json.dump(resultados, f, indent=2, ensure_ascii=False)
+            if resultados is None:
+                # Crear y ejecutar simulador
+                simulador = Simulador(
+                    G=config['G'],
+                    SR=config['SR'],
+                    I=config['I'],
+                    SC=config['SC'],
+                    semilla=semilla
+                )
+                
+                resultados = simulador.ejecutar(mostrar_progreso=False)
+                if self.cache is not None:
+                    self.cache.guardar(clave, resultados)
+            resultados['replica'] = replica
+            agregador.agregar(resultados)
+            replicas.append({indicador: resultados[indicador]
+                             for indicador in ['replica'] + INDICADORES_PAREADOS})
+            
+            # Guardar réplica individual (el almacén escribe en lotes)
+            self.almacen.guardar(resultados, semilla)
             
             # Progreso
             if replica % 5 == 0 or replica == num_replicas:
                 print(f"  Progreso: {replica}/{num_replicas} réplicas completadas")
         
+        self.almacen.confirmar()
         print(f"\n✓ Escenario {nombre} completado\n")
+        self.replicas_por_escenario[nombre] = replicas
         
         # Calcular estadísticas
-        estadisticas = self._calcular_estadisticas(nombre, config, replicas)
+        estadisticas = self._calcular_estadisticas(nombre, config, agregador)
         
         # Guardar resumen
         archivo_resumen = dir_escenario / "resumen.json"
@@ -154,56 +192,38 @@ class ComparadorCincoEscenarios:
         
         return estadisticas
     
-    def _calcular_estadisticas(self, nombre: str, config: dict, 
-                               replicas: list) -> dict:
-        """Calcula estadísticas agregadas de las réplicas."""
-        
-        # Indicadores a analizar
-        indicadores = [
-            'PEC_consultas', 'PEC_partos_nat', 'PEC_partos_ces', 'PEC_general',
-            'UT_med', 'UT_Q', 'PTOSR_promedio',
-            'PPDSR', 'PPDINC',
-            'CTM', 'CII',
-            'total_pacientes_llegados', 'total_pacientes_atendidos',
-            'total_derivaciones_sr', 'total_derivaciones_inc'
-        ]
+    def _calcular_estadisticas(self, nombre: str, config: dict,
+                               agregador: AgregadorWelford) -> dict:
+        """Arma las estadísticas agregadas de las réplicas (ver AgregadorWelford)."""
         
         estadisticas = {
             'nombre': nombre,
             'configuracion': config,
-            'num_replicas': len(replicas),
+            'num_replicas': agregador.cantidad,
             'indicadores': {}
         }
         
-        # Calcular media, desv.est. e IC 95% para cada indicador
-        for indicador in indicadores:
-            valores = [r[indicador] for r in replicas]
-            media = np.mean(valores)
-            std = np.std(valores, ddof=1)
-            
-            # Intervalo de confianza 95%
-            n = len(valores)
-            error_est = 1.96 * std / np.sqrt(n)
-            ic_inf = media - error_est
-            ic_sup = media + error_est
-            
+        # Media, desv.est., IC 95% (t de Student), mínimo y máximo de cada indicador
+        for indicador, resumen in agregador.resumen().items():
             estadisticas['indicadores'][indicador] = {
-                'media': float(media),
-                'std': float(std),
-                'ic_95': [float(ic_inf), float(ic_sup)],
-                'min': float(np.min(valores)),
-                'max': float(np.max(valores))
+                'media': resumen['media'],
+                'std': resumen['desv'],
+                'ic_95': [resumen['ic_inf'], resumen['ic_sup']],
+                'min': resumen['min'],
+                'max': resumen['max']
             }
         
         return estadisticas
     
-    def ejecutar_comparacion(self, num_replicas: int = 30, semilla_base: int = 42):
+    def ejecutar_comparacion(self, num_replicas: int = 30, semilla_base: int = 42,
+                             crn: bool = True):
         """
         Ejecuta la comparación completa de los cinco escenarios.
         
         Args:
             num_replicas: Número de réplicas por escenario
             semilla_base: Semilla base
+            crn: Si usar números aleatorios comunes entre escenarios
         """
         print("\n" + "="*80)
         print("SIMULACIÓN DE 10 AÑOS - HOSPITAL EURNEKIAN")
@@ -220,9 +240,12 @@ class ComparadorCincoEscenarios:
         # Ejecutar cada escenario
         resultados_escenarios = {}
         for nombre, config in escenarios.items():
-            estadisticas = self.ejecutar_escenario(nombre, config, num_replicas, semilla_base)
+            estadisticas = self.ejecutar_escenario(nombre, config, num_replicas, semilla_base, crn)
             resultados_escenarios[nombre] = estadisticas
         
+        # Diferencias pareadas respecto de la configuración actual
+        self._agregar_diferencias_pareadas(resultados_escenarios)
+        
         # Guardar resultados consolidados
         archivo_consolidado = self.directorio_resultados / "comparacion_escenarios.json"
         with open(archivo_consolidado, 'w', encoding='utf-8') as f:
@@ -238,6 +261,24 @@ class ComparadorCincoEscenarios:
         
         return resultados_escenarios
     
+    def _agregar_diferencias_pareadas(self, resultados: dict, referencia: str = 'ACTUAL'):
+        """
+        Agrega a cada escenario sus diferencias pareadas respecto del escenario de referencia.
+        
+        Con CRN, la réplica k de cada escenario comparte flujos aleatorios con la
+        réplica k de la referencia, por lo que los intervalos de las diferencias
+        son mucho más estrechos que los de comparar las medias por separado.
+        """
+        if referencia not in self.replicas_por_escenario:
+            return
+        replicas_ref = self.replicas_por_escenario[referencia]
+        for nombre, estadisticas in resultados.items():
+            if nombre == referencia or nombre not in self.replicas_por_escenario:
+                continue
+            estadisticas[f'diferencias_vs_{referencia}'] = diferencias_pareadas(
+                self.replicas_por_escenario[nombre], replicas_ref, INDICADORES_PAREADOS
+            )
+    
     def _generar_reporte_comparativo(self, resultados: dict):
         """Genera reporte comparativo en formato texto."""
         
@@ -4,9 +4,19 @@ Motor Principal de Simulación: Ejecuta la simulación de eventos discretos
 
 from typing import Dict, Any, Optional
 from .core.estado import EstadoSistema
-from .core.tef import TablaEventosFuturos
-from .core.evento import Evento
-from .generadores.variables_aleatorias import GeneradorVariablesAleatorias
+from .core.tef import crear_tef
+from .core.evento import (
+    Evento,
+    LLEGADA,
+    INICIO_CONSULTA,
+    FIN_CONSULTA,
+    INICIO_PARTO,
+    FIN_PARTO,
+    FIN_REPOSO,
+    FIN_INCUBACION,
+    NOMBRES_EVENTOS
+)
+from .generadores.variables_aleatorias import GeneradorVariablesAleatorias, Semilla
 from .indicadores.calculadora import CalculadoraIndicadores
 from .indicadores.costos import CalculadoraCostos
 
@@ -33,7 +43,17 @@ class Simulador:
     # Período de calentamiento: 1 mes = 30 × 24 × 60 = 43,200 minutos
     TIEMPO_CALENTAMIENTO = 30 * 24 * 60
     
-    def __init__(self, G: int, SR: int, I: int, SC: int = 1, semilla: Optional[int] = None):
+    # Valores generados por bloque en el generador de variables aleatorias
+    TAMANO_BLOQUE = 4096
+    
+    # Eventos programados con demora constante (TINC determinístico = 4 días):
+    # se insertan en orden de tiempo y la TEF los mantiene en una cola FIFO
+    TIPOS_DEMORA_CONSTANTE = (FIN_INCUBACION,)
+    
+    def __init__(self, G: int, SR: int, I: int, SC: int = 1, semilla: Optional[Semilla] = None,
+                 tamano_bloque: Optional[int] = TAMANO_BLOQUE, tipo_tef: str = 'heap',
+                 registrar_partos: bool = False, tiempo_simulacion: Optional[float] = None,
+                 tiempo_calentamiento: Optional[float] = None):
         """
         Inicializa el simulador.
         
@@ -41,18 +61,37 @@ class Simulador:
             G: Cantidad de médicos de guardia
             SR: Cantidad de salas de recuperación
             I: Cantidad de incubadoras
-            semilla: Semilla para reproducibilidad (opcional)
+            semilla: Entero o SeedSequence para reproducibilidad (opcional)
+            tamano_bloque: Valores por bloque del generador (None = generación escalar)
+            tipo_tef: Implementación de la TEF: 'heap' o 'calendario'
+            registrar_partos: Si True, simula solo el frente (médicos, quirófano y
+                consultorios): los fines de parto se registran en
+                estado.registro_partos sin asignar salas ni incubadoras
+            tiempo_simulacion: Horizonte en minutos (None = TIEMPO_SIMULACION)
+            tiempo_calentamiento: Calentamiento en minutos (None = TIEMPO_CALENTAMIENTO)
         """
+        # Horizonte y calentamiento de esta instancia (por defecto, los de la clase)
+        if tiempo_simulacion is not None:
+            self.TIEMPO_SIMULACION = tiempo_simulacion
+        if tiempo_calentamiento is not None:
+            self.TIEMPO_CALENTAMIENTO = tiempo_calentamiento
+        if not 0 <= self.TIEMPO_CALENTAMIENTO < self.TIEMPO_SIMULACION:
+            raise ValueError("Se requiere 0 <= tiempo_calentamiento < tiempo_simulacion")
         self.G = G
         self.SR = SR
         self.I = I
         self.SC = SC
         self.semilla = semilla
+        self.tipo_tef = tipo_tef
+        self.registrar_partos = registrar_partos
         
         # Inicializar componentes
         self.estado = EstadoSistema(G, SR, I, SC)
-        self.tef = TablaEventosFuturos()
-        self.generador = GeneradorVariablesAleatorias(semilla=semilla)
+        self.tef = crear_tef(tipo_tef, self.TIPOS_DEMORA_CONSTANTE)
+        self.generador = GeneradorVariablesAleatorias(semilla=semilla, tamano_bloque=tamano_bloque)
+        
+        # Tabla de despacho: rutina de cada tipo de evento, indexada por código
+        self._rutinas = self._construir_tabla_rutinas()
         
         # Calculadoras
         self.calculadora_indicadores = CalculadoraIndicadores(
@@ -63,11 +102,33 @@ class Simulador:
             tiempo_simulacion=self.TIEMPO_SIMULACION
         )
     
+    @staticmethod
+    def _construir_tabla_rutinas() -> tuple:
+        """
+        Construye la tabla de despacho de rutinas de eventos.
+        
+        Todas las rutinas comparten la firma (estado, evento, tef, generador).
+        
+        Returns:
+            Tupla donde la posición i contiene la rutina del evento de código i
+        """
+        rutinas = [None] * len(NOMBRES_EVENTOS)
+        rutinas[LLEGADA] = procesar_llegada
+        rutinas[INICIO_CONSULTA] = procesar_inicio_consulta
+        rutinas[FIN_CONSULTA] = procesar_fin_consulta
+        rutinas[INICIO_PARTO] = procesar_inicio_parto
+        rutinas[FIN_PARTO] = procesar_fin_parto
+        rutinas[FIN_REPOSO] = procesar_fin_reposo
+        rutinas[FIN_INCUBACION] = procesar_fin_incubacion
+        return tuple(rutinas)
+    
     def inicializar(self):
         """Inicializa la simulación."""
         # Resetear estado
         self.estado = EstadoSistema(self.G, self.SR, self.I, self.SC)
-        self.tef = TablaEventosFuturos()
+        self.tef = crear_tef(self.tipo_tef, self.TIPOS_DEMORA_CONSTANTE)
+        if self.registrar_partos:
+            self.estado.registro_partos = []
         
         # Resetear generador si hay semilla
         if self.semilla is not None:
@@ -76,7 +137,7 @@ class Simulador:
         # Programar primera llegada
         intervalo = self.generador.generar_intervalo_arribo()
         primera_llegada = Evento(
-            tipo='llegada',
+            tipo=LLEGADA,
             tiempo=intervalo
         )
         self.tef.insertar(primera_llegada)
@@ -97,34 +158,53 @@ class Simulador:
         # Contador de eventos procesados
         eventos_procesados = 0
         
+        # Referencias locales para el ciclo principal (evita búsquedas de atributos)
+        estado = self.estado
+        tef = self.tef
+        generador = self.generador
+        rutinas = self._rutinas
+        extraer_proximo = tef.extraer_proximo
+        tiempo_calentamiento = self.TIEMPO_CALENTAMIENTO
+        tiempo_simulacion = self.TIEMPO_SIMULACION
+        
+        en_calentamiento = tiempo_calentamiento > 0
+        
         # Ciclo principal
-        while not self.tef.esta_vacia():
+        while True:
             # Extraer próximo evento
-            evento = self.tef.extraer_proximo()
+            evento = extraer_proximo()
             
             if evento is None:
                 break
             
-            # Avanzar reloj
-            self.estado.tiempo_actual = evento.tiempo
+            # Verificar condición de término: los eventos posteriores al
+            # horizonte no se procesan
+            tiempo = evento.tiempo
+            if tiempo > tiempo_simulacion:
+                break
+            
+            # Al cruzar el fin del calentamiento, resetear acumuladores en ese instante exacto
+            if en_calentamiento and tiempo >= tiempo_calentamiento:
+                estado.tiempo_actual = tiempo_calentamiento
+                self._resetear_acumuladores()
+                en_calentamiento = False
             
-            # Verificar si estamos en período de calentamiento
-            en_calentamiento = self.estado.tiempo_actual < self.TIEMPO_CALENTAMIENTO
+            # Avanzar reloj
+            estado.tiempo_actual = tiempo
             
-            # Procesar evento según tipo
-            self._procesar_evento(evento, en_calentamiento)
+            # Procesar evento según tipo (despacho por tabla)
+            rutinas[evento.tipo](estado, evento, tef, generador)
             
             eventos_procesados += 1
             
             # Mostrar progreso cada 10000 eventos
             if mostrar_progreso and eventos_procesados % 10000 == 0:
-                progreso = (self.estado.tiempo_actual / self.TIEMPO_SIMULACION) * 100
+                progreso = (tiempo / tiempo_simulacion) * 100
                 print(f"Progreso: {progreso:.1f}% - Eventos: {eventos_procesados:,} - "
-                      f"Tiempo: {self.estado.tiempo_actual:.0f} min")
-            
-            # Verificar condición de término
-            if self.estado.tiempo_actual >= self.TIEMPO_SIMULACION:
-                break
+                      f"Tiempo: {tiempo:.0f} min")
+        
+        # Cerrar las integrales de tiempo exactamente en el horizonte
+        estado.tiempo_actual = tiempo_simulacion
         
         # Calcular indicadores y costos
         indicadores = self.calculadora_indicadores.calcular_todos(self.estado)
@@ -144,45 +224,23 @@ class Simulador:
         
         return resultados
     
-    def _procesar_evento(self, evento: Evento, en_calentamiento: bool):
+    def _procesar_evento(self, evento: Evento):
         """
         Procesa un evento según su tipo.
         
         Args:
             evento: Evento a procesar
-            en_calentamiento: Si estamos en período de calentamiento
         """
-        tipo = evento.tipo
-        
-        # Diccionario de rutinas de eventos
-        rutinas = {
-            'llegada': procesar_llegada,
-            'inicio_consulta': procesar_inicio_consulta,
-            'fin_consulta': procesar_fin_consulta,
-            'inicio_parto': procesar_inicio_parto,
-            'fin_parto': procesar_fin_parto,
-            'fin_reposo': procesar_fin_reposo,
-            'fin_incubacion': procesar_fin_incubacion
-        }
-        
-        # Ejecutar rutina correspondiente
-        if tipo in rutinas:
-            rutina = rutinas[tipo]
-            
-            # Algunas rutinas necesitan el evento, otras no
-            if tipo in ['inicio_consulta', 'fin_consulta', 'inicio_parto', 
-                       'fin_parto', 'fin_reposo', 'fin_incubacion']:
-                rutina(self.estado, evento, self.tef, self.generador)
-            else:  # llegada
-                rutina(self.estado, self.tef, self.generador)
-        
-        # Si estamos en calentamiento, resetear contadores acumulados
-        if en_calentamiento and self.estado.tiempo_actual >= self.TIEMPO_CALENTAMIENTO:
-            # Al finalizar calentamiento, resetear acumuladores
-            self._resetear_acumuladores()
+        # Ejecutar rutina correspondiente (todas comparten la misma firma)
+        self._rutinas[evento.tipo](self.estado, evento, self.tef, self.generador)
     
     def _resetear_acumuladores(self):
-        """Resetea los acumuladores al finalizar el período de calentamiento."""
+        """
+        Resetea los acumuladores al finalizar el período de calentamiento.
+        
+        Se invoca con el reloj en TIEMPO_CALENTAMIENTO: las integrales de
+        ocupación y de largo de cola comienzan una nueva ventana en ese instante.
+        """
         # No resetear contadores de llegadas (para calcular derivaciones correctamente)
         # Solo resetear acumuladores de tiempo
         self.estado.tiempo_total_espera_consultas = 0.0
@@ -190,10 +248,7 @@ class Simulador:
         self.estado.tiempo_total_espera_partos_ces = 0.0
         self.estado.tiempo_ocupacion_medicos = 0.0
         self.estado.tiempo_ocupacion_quirofano = 0.0
-        self.estado.tiempo_ocupacion_consultorios = self.estado.tiempo_ocupacion_consultorios * 0.0
-        self.estado.tiempo_ocupacion_sr = self.estado.tiempo_ocupacion_sr * 0.0
-        self.estado.tiempo_inactividad_sr = self.estado.tiempo_inactividad_sr * 0.0
-        self.estado.tiempo_ocupacion_inc = self.estado.tiempo_ocupacion_inc * 0.0
+        self.estado.reiniciar_acumuladores_tiempo(self.estado.tiempo_actual)
         
         # Resetear contadores de atención (pero mantener llegadas)
         self.estado.total_pacientes_atendidos = 0
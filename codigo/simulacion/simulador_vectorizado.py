@@ -0,0 +1,669 @@
+"""
+Simulador Vectorizado: Avanza R réplicas de una misma configuración en
+paralelo (lockstep) con el estado almacenado en arrays de NumPy
+"""
+
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+import numpy as np
+
+from .simulador import Simulador
+from .core.estado import EstadoSistema
+from .core.pool import PoolRecursos
+from .core.acumulador import AcumuladorTiempo
+from .core.evento import LLEGADA, FIN_CONSULTA, FIN_PARTO, FIN_REPOSO, FIN_INCUBACION, NOMBRES_EVENTOS
+from .generadores.variables_aleatorias import GeneradorVariablesAleatorias, Semilla
+from .indicadores.calculadora import CalculadoraIndicadores
+from .indicadores.costos import CalculadoraCostos
+
+
+# Columnas fijas de la matriz de próximos eventos (una fila por réplica); a
+# continuación van los consultorios, las salas de recuperación y las incubadoras
+COL_LLEGADA = 0
+COL_PARTO = 1
+COL_CONSULTORIOS = 2
+
+INFINITO = float('inf')
+
+
+class _BloquesReplicas:
+    """
+    Buffers de valores pre-generados de un sub-flujo, una fila por réplica.
+    
+    Cada fila se regenera con el generador de su réplica al agotarse, con el
+    mismo tamaño de bloque que GeneradorVariablesAleatorias: la réplica r
+    recibe exactamente la misma secuencia que en el simulador de referencia.
+    """
+    
+    __slots__ = ('_generadores', '_flujo', '_tamano', 'valores', 'posicion', '_seguras')
+    
+    def __init__(self, generadores: List[GeneradorVariablesAleatorias], flujo: str, tamano: int):
+        """
+        Inicializa los buffers vacíos (se generan en la primera extracción).
+        
+        Args:
+            generadores: Generador de cada réplica
+            flujo: Nombre del sub-flujo (ver FLUJOS)
+            tamano: Cantidad de valores por bloque
+        """
+        self._generadores = generadores
+        self._flujo = flujo
+        self._tamano = tamano
+        self.valores = np.empty((len(generadores), tamano))
+        self.posicion = np.full(len(generadores), tamano)
+        self._seguras = 0
+    
+    def _regenerar(self):
+        """
+        Regenera las filas agotadas. Cada extracción avanza a lo sumo una
+        posición por fila, así que las próximas tamano - max(posicion)
+        extracciones no necesitan verificar si alguna fila se agotó.
+        """
+        agotadas = np.flatnonzero(self.posicion >= self._tamano)
+        for fila in agotadas.tolist():
+            self.valores[fila] = self._generadores[fila].generar_bloque(self._flujo, self._tamano)
+        self.posicion[agotadas] = 0
+        self._seguras = self._tamano - int(self.posicion.max())
+    
+    def extraer(self, filas: np.ndarray) -> np.ndarray:
+        """
+        Extrae el próximo valor de cada una de las réplicas indicadas.
+        
+        Args:
+            filas: Índices de réplica (sin repetir)
+        
+        Returns:
+            Array con un valor por réplica
+        """
+        if self._seguras <= 0:
+            self._regenerar()
+        self._seguras -= 1
+        posicion = self.posicion[filas]
+        self.posicion[filas] = posicion + 1
+        return self.valores[filas, posicion]
+
+
+class _ColasReplicas:
+    """
+    Cola FIFO de tiempos de llegada de cada réplica (buffer circular, una fila
+    por réplica) con su largo integrado en el tiempo, como AcumuladorTiempo.
+    """
+    
+    __slots__ = ('tiempos', 'cabeza', 'largo', 'area', 'ultimo_cambio')
+    
+    def __init__(self, replicas: int, capacidad: int = 64):
+        """
+        Inicializa las colas vacías.
+        
+        Args:
+            replicas: Cantidad de réplicas
+            capacidad: Capacidad inicial del buffer (se duplica al llenarse)
+        """
+        self.tiempos = np.zeros((replicas, capacidad))
+        self.cabeza = np.zeros(replicas, dtype=np.int64)
+        self.largo = np.zeros(replicas, dtype=np.int64)
+        self.area = np.zeros(replicas)
+        self.ultimo_cambio = np.zeros(replicas)
+    
+    def _integrar(self, filas: np.ndarray, tiempo: np.ndarray, largo: np.ndarray):
+        """Acumula el área del largo vigente hasta tiempo."""
+        self.area[filas] += largo * (tiempo - self.ultimo_cambio[filas])
+        self.ultimo_cambio[filas] = tiempo
+    
+    def _ampliar(self):
+        """Duplica la capacidad del buffer, dejando cada cola al inicio de su fila."""
+        replicas, capacidad = self.tiempos.shape
+        posiciones = (self.cabeza[:, None] + np.arange(capacidad)) % capacidad
+        tiempos = np.zeros((replicas, 2 * capacidad))
+        tiempos[:, :capacidad] = np.take_along_axis(self.tiempos, posiciones, axis=1)
+        self.tiempos = tiempos
+        self.cabeza[:] = 0
+    
+    def encolar(self, filas: np.ndarray, tiempo: np.ndarray):
+        """
+        Agrega un paciente al final de la cola de cada réplica indicada.
+        
+        Args:
+            filas: Índices de réplica (sin repetir)
+            tiempo: Tiempo de llegada de cada paciente
+        """
+        if not filas.size:
+            return
+        largo = self.largo[filas]
+        if largo.max() >= self.tiempos.shape[1]:
+            self._ampliar()
+        capacidad = self.tiempos.shape[1]
+        self.tiempos[filas, (self.cabeza[filas] + largo) % capacidad] = tiempo
+        self._integrar(filas, tiempo, largo)
+        self.largo[filas] = largo + 1
+    
+    def desencolar(self, filas: np.ndarray, tiempo: np.ndarray) -> np.ndarray:
+        """
+        Quita el primer paciente de la cola de cada réplica indicada.
+        
+        Args:
+            filas: Índices de réplica con cola no vacía (sin repetir)
+            tiempo: Instante en que cada paciente deja la cola
+        
+        Returns:
+            Tiempo de llegada de cada paciente
+        """
+        cabeza = self.cabeza[filas]
+        largo = self.largo[filas]
+        llegada = self.tiempos[filas, cabeza]
+        self._integrar(filas, tiempo, largo)
+        self.cabeza[filas] = (cabeza + 1) % self.tiempos.shape[1]
+        self.largo[filas] = largo - 1
+        return llegada
+    
+    def reiniciar(self, filas: np.ndarray, tiempo: float):
+        """Descarta el área acumulada y comienza una nueva ventana en tiempo."""
+        self.area[filas] = 0.0
+        self.ultimo_cambio[filas] = tiempo
+    
+    def acumulador(self, fila: int, tiempo: float, inicio_ventana: float) -> AcumuladorTiempo:
+        """
+        Construye el AcumuladorTiempo equivalente de una réplica.
+        
+        Args:
+            fila: Índice de réplica
+            tiempo: Fin del intervalo de integración
+            inicio_ventana: Inicio de la ventana de acumulación
+        
+        Returns:
+            AcumuladorTiempo con la integral del largo de la cola hasta tiempo
+        """
+        acumulador = AcumuladorTiempo(inicio_ventana)
+        acumulador.area = float(self.area[fila] + self.largo[fila] * (tiempo - self.ultimo_cambio[fila]))
+        return acumulador
+
+
+class _PoolsReplicas:
+    """
+    Unidades idénticas de cada réplica (una fila por réplica), asignadas por
+    menor índice libre como PoolRecursos(ordenado=True).
+    
+    La matriz fin es una vista sobre las columnas de la matriz de próximos
+    eventos: contiene el fin del período ocupado en curso de cada unidad, e
+    infinito si está libre.
+    """
+    
+    __slots__ = ('fin', 'inicio_ocupacion', 'tiempo_ocupado')
+    
+    def __init__(self, fin: np.ndarray):
+        """
+        Inicializa las unidades libres.
+        
+        Args:
+            fin: Vista (réplicas × capacidad) sobre la matriz de próximos eventos
+        """
+        self.fin = fin
+        self.fin[:] = INFINITO
+        self.inicio_ocupacion = np.zeros(fin.shape)
+        self.tiempo_ocupado = np.zeros(fin.shape)
+    
+    def libres(self, filas: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Busca la unidad libre de menor índice de cada réplica indicada.
+        
+        Args:
+            filas: Índices de réplica
+        
+        Returns:
+            Tupla (hay_libre, unidad) con un valor por réplica
+        """
+        if self.fin.shape[1] == 0:
+            return np.zeros(filas.size, dtype=bool), np.zeros(filas.size, dtype=np.int64)
+        libres = self.fin[filas] == INFINITO
+        return libres.any(axis=1), libres.argmax(axis=1)
+    
+    def ocupar(self, filas: np.ndarray, unidades: np.ndarray, tiempo: np.ndarray, fin: np.ndarray):
+        """Marca las unidades como ocupadas desde tiempo hasta fin."""
+        self.fin[filas, unidades] = fin
+        self.inicio_ocupacion[filas, unidades] = tiempo
+    
+    def liberar(self, filas: np.ndarray, unidades: np.ndarray, tiempo: np.ndarray):
+        """Libera las unidades y acumula la duración del período ocupado."""
+        self.tiempo_ocupado[filas, unidades] += tiempo - self.inicio_ocupacion[filas, unidades]
+        self.fin[filas, unidades] = INFINITO
+    
+    def reiniciar_acumuladores(self, filas: np.ndarray, tiempo: float):
+        """Descarta el tiempo ocupado y cuenta los períodos en curso desde tiempo."""
+        self.tiempo_ocupado[filas] = 0.0
+        self.inicio_ocupacion[filas] = tiempo
+    
+    def pool(self, fila: int, inicio_ventana: float) -> PoolRecursos:
+        """
+        Construye el PoolRecursos equivalente de una réplica.
+        
+        Args:
+            fila: Índice de réplica
+            inicio_ventana: Inicio de la ventana de acumulación
+        
+        Returns:
+            PoolRecursos con el estado y los acumuladores de la réplica
+        """
+        return PoolRecursos.desde_acumuladores(
+            (self.fin[fila] != INFINITO).tolist(),
+            self.tiempo_ocupado[fila].tolist(),
+            self.inicio_ocupacion[fila].tolist(),
+            inicio_ventana
+        )
+
+
+class SimuladorVectorizado:
+    """
+    Motor que simula R réplicas de una configuración en lockstep.
+    
+    En cada paso, cada réplica activa procesa su próximo evento: la matriz de
+    próximos eventos tiene una fila por réplica y una columna por actividad
+    que puede terminar (próxima llegada, parto en curso, cada consultorio,
+    sala de recuperación e incubadora), por lo que el próximo evento es el
+    mínimo de la fila. Las rutinas de eventos operan sobre todas las réplicas
+    que procesan el mismo tipo de evento a la vez, y los valores aleatorios
+    se extraen por bloques de todas esas réplicas juntas. Así el costo del
+    intérprete por paso se reparte entre las R réplicas.
+    
+    Los eventos de inicio de atención (demora cero) se procesan dentro de la
+    asignación de recursos. Cada réplica usa los sub-flujos de su semilla con
+    el mismo tamaño de bloque que Simulador, por lo que reproduce la misma
+    trayectoria que Simulador(G, SR, I, SC, semilla) y sus resultados se
+    calculan con las mismas CalculadoraIndicadores y CalculadoraCostos.
+    """
+    
+    TIEMPO_SIMULACION = Simulador.TIEMPO_SIMULACION
+    TIEMPO_CALENTAMIENTO = Simulador.TIEMPO_CALENTAMIENTO
+    TAMANO_BLOQUE = Simulador.TAMANO_BLOQUE
+    
+    def __init__(self, G: int, SR: int, I: int, SC: int = 1,
+                 semillas: Sequence[Optional[Semilla]] = (None,),
+                 tamano_bloque: int = TAMANO_BLOQUE,
+                 tiempo_simulacion: Optional[float] = None,
+                 tiempo_calentamiento: Optional[float] = None):
+        """
+        Inicializa el simulador.
+        
+        Args:
+            G: Cantidad de médicos de guardia
+            SR: Cantidad de salas de recuperación
+            I: Cantidad de incubadoras
+            SC: Cantidad de salas de consultorio
+            semillas: Semilla de cada réplica (entero, SeedSequence o None)
+            tamano_bloque: Valores por bloque de cada sub-flujo
+            tiempo_simulacion: Horizonte en minutos (None = TIEMPO_SIMULACION)
+            tiempo_calentamiento: Calentamiento en minutos (None = TIEMPO_CALENTAMIENTO)
+        """
+        if len(semillas) == 0:
+            raise ValueError("Se requiere al menos una semilla (una por réplica)")
+        if tamano_bloque < 1:
+            raise ValueError("tamano_bloque debe ser un entero positivo")
+        if tiempo_simulacion is not None:
+            self.TIEMPO_SIMULACION = tiempo_simulacion
+        if tiempo_calentamiento is not None:
+            self.TIEMPO_CALENTAMIENTO = tiempo_calentamiento
+        if not 0 <= self.TIEMPO_CALENTAMIENTO < self.TIEMPO_SIMULACION:
+            raise ValueError("Se requiere 0 <= tiempo_calentamiento < tiempo_simulacion")
+        self.G = G
+        self.SR = SR
+        self.I = I
+        self.SC = SC
+        self.semillas = list(semillas)
+        self.tamano_bloque = tamano_bloque
+        
+        self.calculadora_indicadores = CalculadoraIndicadores(
+            tiempo_simulacion=self.TIEMPO_SIMULACION,
+            tiempo_calentamiento=self.TIEMPO_CALENTAMIENTO
+        )
+        self.calculadora_costos = CalculadoraCostos(
+            tiempo_simulacion=self.TIEMPO_SIMULACION
+        )
+    
+    @property
+    def replicas(self) -> int:
+        """Cantidad de réplicas simuladas en paralelo."""
+        return len(self.semillas)
+    
+    def inicializar(self):
+        """Inicializa el estado de todas las réplicas y programa las primeras llegadas."""
+        R = self.replicas
+        generadores = [GeneradorVariablesAleatorias(semilla=semilla) for semilla in self.semillas]
+        self._generador = generadores[0]
+        self._bloques = {
+            nombre: _BloquesReplicas(generadores, nombre, self.tamano_bloque)
+            for nombre in ('arribos', 'tipo_paciente', 'consulta', 'parto', 'reposo', 'incubadora')
+        }
+        
+        # Matriz de próximos eventos y recursos individualizados (vistas sobre sus columnas)
+        inicio_sr = COL_CONSULTORIOS + self.SC
+        inicio_inc = inicio_sr + self.SR
+        self._proximos = np.full((R, inicio_inc + self.I), INFINITO)
+        self._consultorios = _PoolsReplicas(self._proximos[:, COL_CONSULTORIOS:inicio_sr])
+        self._salas_recuperacion = _PoolsReplicas(self._proximos[:, inicio_sr:inicio_inc])
+        self._incubadoras = _PoolsReplicas(self._proximos[:, inicio_inc:])
+        
+        # Colas de pacientes
+        self._cola_consultas = _ColasReplicas(R)
+        self._cola_partos_naturales = _ColasReplicas(R)
+        self._cola_partos_cesarea = _ColasReplicas(R)
+        
+        # Recursos y actividades en curso
+        self._medicos_disponibles = np.full(R, self.G, dtype=np.int64)
+        self._duracion_parto = np.zeros(R)
+        self._parto_natural = np.zeros(R, dtype=bool)
+        self._duracion_consulta = np.zeros((R, self.SC))
+        
+        # Contadores y acumuladores (mismos nombres que EstadoSistema)
+        self._contadores = {
+            nombre: np.zeros(R, dtype=np.int64)
+            for nombre in ('total_pacientes_llegados', 'total_pacientes_atendidos', 'total_consultas',
+                           'total_partos_naturales', 'total_partos_cesarea', 'total_derivaciones_sr',
+                           'total_derivaciones_inc', 'total_neonatos_requieren_inc')
+        }
+        self._acumuladores = {
+            nombre: np.zeros(R)
+            for nombre in ('tiempo_total_espera_consultas', 'tiempo_total_espera_partos_nat',
+                           'tiempo_total_espera_partos_ces', 'tiempo_ocupacion_medicos',
+                           'tiempo_ocupacion_quirofano')
+        }
+        self._eventos_procesados = np.zeros(R, dtype=np.int64)
+        self._inicio_ventana = np.zeros(R)
+        
+        # Programar primera llegada de cada réplica
+        todas = np.arange(R)
+        self._proximos[:, COL_LLEGADA] = self._bloques['arribos'].extraer(todas)
+    
+    def ejecutar(self, mostrar_progreso: bool = False) -> List[Dict[str, Any]]:
+        """
+        Ejecuta todas las réplicas hasta el horizonte.
+        
+        Args:
+            mostrar_progreso: Si mostrar progreso por consola
+        
+        Returns:
+            Lista con los resultados de cada réplica (en el orden de semillas),
+            con las mismas claves que Simulador.ejecutar
+        """
+        self.inicializar()
+        
+        proximos = self._proximos
+        tiempo_simulacion = self.TIEMPO_SIMULACION
+        tiempo_calentamiento = self.TIEMPO_CALENTAMIENTO
+        inicio_sr = COL_CONSULTORIOS + self.SC
+        inicio_inc = inicio_sr + self.SR
+        
+        # Tipo de evento (código de core/evento.py) que indica cada columna
+        tipo_columna = np.empty(proximos.shape[1], dtype=np.int64)
+        tipo_columna[COL_LLEGADA] = LLEGADA
+        tipo_columna[COL_PARTO] = FIN_PARTO
+        tipo_columna[COL_CONSULTORIOS:inicio_sr] = FIN_CONSULTA
+        tipo_columna[inicio_sr:inicio_inc] = FIN_REPOSO
+        tipo_columna[inicio_inc:] = FIN_INCUBACION
+        
+        calentando = np.full(self.replicas, tiempo_calentamiento > 0)
+        hay_calentando = tiempo_calentamiento > 0
+        activas = np.arange(self.replicas)
+        pasos = 0
+        
+        while activas.size:
+            # Próximo evento de cada réplica activa
+            columnas = proximos[activas].argmin(axis=1)
+            tiempo = proximos[activas, columnas]
+            
+            # Las réplicas cuyo próximo evento supera el horizonte terminan
+            if tiempo.max() > tiempo_simulacion:
+                vigentes = tiempo <= tiempo_simulacion
+                activas = activas[vigentes]
+                columnas = columnas[vigentes]
+                tiempo = tiempo[vigentes]
+                if not activas.size:
+                    break
+            
+            # Al cruzar el fin del calentamiento, resetear acumuladores en ese instante exacto
+            if hay_calentando:
+                cruzan = calentando[activas] & (tiempo >= tiempo_calentamiento)
+                if cruzan.any():
+                    filas = activas[cruzan]
+                    self._resetear_acumuladores(filas, tiempo_calentamiento)
+                    calentando[filas] = False
+                    hay_calentando = bool(calentando.any())
+            
+            self._eventos_procesados[activas] += 1
+            
+            # Agrupar las réplicas por tipo de evento: cada tipo ocupa un tramo
+            # contiguo, en orden de código (llegada, fin de consulta, fin de
+            # parto, fin de reposo, fin de incubación)
+            tipos = tipo_columna[columnas]
+            orden = tipos.argsort()
+            filas = activas[orden]
+            tiempo = tiempo[orden]
+            columnas = columnas[orden]
+            limites = [0] + np.bincount(tipos, minlength=len(NOMBRES_EVENTOS)).cumsum().tolist()
+            
+            # Procesar cada tipo de evento sobre todas las réplicas que lo tienen
+            llegada = slice(limites[LLEGADA], limites[LLEGADA + 1])
+            fin_consulta = slice(limites[FIN_CONSULTA], limites[FIN_CONSULTA + 1])
+            fin_parto = slice(limites[FIN_PARTO], limites[FIN_PARTO + 1])
+            fin_reposo = slice(limites[FIN_REPOSO], limites[FIN_REPOSO + 1])
+            fin_incubacion = slice(limites[FIN_INCUBACION], limites[FIN_INCUBACION + 1])
+            if llegada.start < llegada.stop:
+                self._procesar_llegada(filas[llegada], tiempo[llegada])
+            if fin_consulta.start < fin_consulta.stop:
+                self._procesar_fin_consulta(filas[fin_consulta], tiempo[fin_consulta],
+                                            columnas[fin_consulta] - COL_CONSULTORIOS)
+            if fin_parto.start < fin_parto.stop:
+                self._procesar_fin_parto(filas[fin_parto], tiempo[fin_parto])
+            if fin_reposo.start < fin_reposo.stop:
+                self._salas_recuperacion.liberar(filas[fin_reposo], columnas[fin_reposo] - inicio_sr,
+                                                 tiempo[fin_reposo])
+            if fin_incubacion.start < fin_incubacion.stop:
+                self._incubadoras.liberar(filas[fin_incubacion], columnas[fin_incubacion] - inicio_inc,
+                                          tiempo[fin_incubacion])
+            
+            # Asignar recursos en las réplicas donde llegaron pacientes o se
+            # liberaron médicos (tramo contiguo de llegadas y fines de atención)
+            asignan = slice(llegada.start, fin_parto.stop)
+            self._asignar_recursos(filas[asignan], tiempo[asignan])
+            
+            # Programar próxima llegada
+            if llegada.start < llegada.stop:
+                filas_llegada = filas[llegada]
+                proximos[filas_llegada, COL_LLEGADA] = (tiempo[llegada]
+                                                        + self._bloques['arribos'].extraer(filas_llegada))
+            
+            pasos += 1
+            if mostrar_progreso and pasos % 10000 == 0:
+                progreso = (float(tiempo.min()) / tiempo_simulacion) * 100
+                print(f"Progreso: {progreso:.1f}% - Réplicas activas: {activas.size} - "
+                      f"Eventos: {int(self._eventos_procesados.sum()):,}")
+        
+        return [self._resultados_replica(fila) for fila in range(self.replicas)]
+    
+    def _procesar_llegada(self, filas: np.ndarray, tiempo: np.ndarray):
+        """
+        Procesa la llegada de un paciente en cada réplica indicada: determina
+        su tipo y lo encola (ver eventos/llegada.py).
+        """
+        generador = self._generador
+        tipo = self._bloques['tipo_paciente']
+        es_parto = tipo.extraer(filas) < generador.p_parto
+        filas_parto = filas[es_parto]
+        natural = tipo.extraer(filas_parto) < generador.p_nat
+        tiempo_parto = tiempo[es_parto]
+        
+        self._contadores['total_pacientes_llegados'][filas] += 1
+        self._cola_consultas.encolar(filas[~es_parto], tiempo[~es_parto])
+        self._cola_partos_naturales.encolar(filas_parto[natural], tiempo_parto[natural])
+        self._cola_partos_cesarea.encolar(filas_parto[~natural], tiempo_parto[~natural])
+    
+    def _procesar_fin_consulta(self, filas: np.ndarray, tiempo: np.ndarray, consultorios: np.ndarray):
+        """
+        Procesa el fin de una consulta en cada réplica indicada: libera médico
+        y consultorio (ver eventos/consulta.py).
+        """
+        self._medicos_disponibles[filas] += 1
+        self._consultorios.liberar(filas, consultorios, tiempo)
+        self._contadores['total_consultas'][filas] += 1
+        self._contadores['total_pacientes_atendidos'][filas] += 1
+        self._acumuladores['tiempo_ocupacion_medicos'][filas] += self._duracion_consulta[filas, consultorios]
+    
+    def _procesar_fin_parto(self, filas: np.ndarray, tiempo: np.ndarray):
+        """
+        Procesa el fin de un parto en cada réplica indicada: libera médico y
+        quirófano y asigna sala de recuperación e incubadora o deriva
+        (ver eventos/parto.py).
+        """
+        generador = self._generador
+        contadores = self._contadores
+        
+        # Liberar médico y quirófano
+        self._medicos_disponibles[filas] += 1
+        self._proximos[filas, COL_PARTO] = INFINITO
+        tap = self._duracion_parto[filas]
+        self._acumuladores['tiempo_ocupacion_quirofano'][filas] += tap
+        self._acumuladores['tiempo_ocupacion_medicos'][filas] += tap
+        
+        # Actualizar contadores
+        natural = self._parto_natural[filas]
+        contadores['total_partos_naturales'][filas] += natural
+        contadores['total_partos_cesarea'][filas] += ~natural
+        contadores['total_pacientes_atendidos'][filas] += 1
+        
+        # Madre: sala de recuperación (TREP se genera también para las derivadas)
+        trep = self._bloques['reposo'].extraer(filas)
+        hay, sala = self._salas_recuperacion.libres(filas)
+        self._salas_recuperacion.ocupar(filas[hay], sala[hay], tiempo[hay], tiempo[hay] + trep[hay])
+        contadores['total_derivaciones_sr'][filas[~hay]] += 1
+        
+        # Neonato: incubadora si la requiere
+        requiere = self._bloques['incubadora'].extraer(filas) < generador.p_inc
+        filas_inc = filas[requiere]
+        tiempo_inc = tiempo[requiere]
+        contadores['total_neonatos_requieren_inc'][filas_inc] += 1
+        hay, incubadora = self._incubadoras.libres(filas_inc)
+        self._incubadoras.ocupar(filas_inc[hay], incubadora[hay], tiempo_inc[hay],
+                                 tiempo_inc[hay] + generador.generar_tiempo_incubacion())
+        contadores['total_derivaciones_inc'][filas_inc[~hay]] += 1
+    
+    def _asignar_recursos(self, filas: np.ndarray, tiempo: np.ndarray):
+        """
+        Asigna recursos a pacientes en cola según las prioridades (partos
+        naturales, cesáreas, consultas) en cada réplica indicada, e inicia la
+        atención en el mismo instante (ver recursos/asignacion.py).
+        
+        Cada iteración realiza a lo sumo una asignación por réplica y continúa
+        solo con las réplicas que asignaron, como el ciclo de asignar_recursos.
+        """
+        acumuladores = self._acumuladores
+        while filas.size:
+            medico = self._medicos_disponibles[filas] > 0
+            natural = self._cola_partos_naturales.largo[filas] > 0
+            cesarea = self._cola_partos_cesarea.largo[filas] > 0
+            quirofano = self._proximos[filas, COL_PARTO] == INFINITO
+            
+            # Prioridades 1 y 2: partos naturales y cesáreas (médico + quirófano)
+            parto = medico & quirofano & (natural | cesarea)
+            if parto.any():
+                filas_parto = filas[parto]
+                tiempo_parto = tiempo[parto]
+                es_natural = natural[parto]
+                llegada = np.empty(filas_parto.size)
+                llegada[es_natural] = self._cola_partos_naturales.desencolar(
+                    filas_parto[es_natural], tiempo_parto[es_natural])
+                llegada[~es_natural] = self._cola_partos_cesarea.desencolar(
+                    filas_parto[~es_natural], tiempo_parto[~es_natural])
+                espera = tiempo_parto - llegada
+                acumuladores['tiempo_total_espera_partos_nat'][filas_parto[es_natural]] += espera[es_natural]
+                acumuladores['tiempo_total_espera_partos_ces'][filas_parto[~es_natural]] += espera[~es_natural]
+                
+                self._medicos_disponibles[filas_parto] -= 1
+                tap = self._bloques['parto'].extraer(filas_parto)
+                self._proximos[filas_parto, COL_PARTO] = tiempo_parto + tap
+                self._duracion_parto[filas_parto] = tap
+                self._parto_natural[filas_parto] = es_natural
+                self._eventos_procesados[filas_parto] += 1
+            
+            # Prioridad 3: consultas (médico + consultorio), solo sin partos esperando
+            consulta = (medico & ~natural & ~cesarea) & (self._cola_consultas.largo[filas] > 0)
+            if consulta.any():
+                hay, consultorio = self._consultorios.libres(filas[consulta])
+                consulta[consulta] = hay
+                consultorio = consultorio[hay]
+            if consulta.any():
+                filas_consulta = filas[consulta]
+                tiempo_consulta = tiempo[consulta]
+                llegada = self._cola_consultas.desencolar(filas_consulta, tiempo_consulta)
+                acumuladores['tiempo_total_espera_consultas'][filas_consulta] += tiempo_consulta - llegada
+                
+                self._medicos_disponibles[filas_consulta] -= 1
+                tac = self._bloques['consulta'].extraer(filas_consulta)
+                self._consultorios.ocupar(filas_consulta, consultorio, tiempo_consulta, tiempo_consulta + tac)
+                self._duracion_consulta[filas_consulta, consultorio] = tac
+                self._eventos_procesados[filas_consulta] += 1
+            
+            # Seguir solo con las réplicas que asignaron algún recurso
+            asignaron = parto | consulta
+            filas = filas[asignaron]
+            tiempo = tiempo[asignaron]
+    
+    def _resetear_acumuladores(self, filas: np.ndarray, tiempo: float):
+        """
+        Resetea los acumuladores de las réplicas indicadas al finalizar el
+        período de calentamiento (ver Simulador._resetear_acumuladores).
+        
+        Args:
+            filas: Índices de réplica
+            tiempo: Fin del calentamiento
+        """
+        for acumulador in self._acumuladores.values():
+            acumulador[filas] = 0.0
+        for nombre, contador in self._contadores.items():
+            # No resetear contadores de llegadas (para calcular derivaciones correctamente)
+            if nombre != 'total_pacientes_llegados':
+                contador[filas] = 0
+        for pool in (self._consultorios, self._salas_recuperacion, self._incubadoras):
+            pool.reiniciar_acumuladores(filas, tiempo)
+        for cola in (self._cola_consultas, self._cola_partos_naturales, self._cola_partos_cesarea):
+            cola.reiniciar(filas, tiempo)
+        self._inicio_ventana[filas] = tiempo
+    
+    def _resultados_replica(self, fila: int) -> Dict[str, Any]:
+        """
+        Calcula los resultados de una réplica con las calculadoras del
+        simulador de referencia, sobre un EstadoSistema equivalente.
+        
+        Args:
+            fila: Índice de réplica
+        
+        Returns:
+            Diccionario con todos los resultados (indicadores + costos)
+        """
+        tiempo = self.TIEMPO_SIMULACION
+        inicio_ventana = float(self._inicio_ventana[fila])
+        
+        estado = EstadoSistema(self.G, self.SR, self.I, self.SC)
+        estado.tiempo_actual = tiempo
+        for nombre, contador in self._contadores.items():
+            setattr(estado, nombre, int(contador[fila]))
+        for nombre, acumulador in self._acumuladores.items():
+            setattr(estado, nombre, float(acumulador[fila]))
+        estado.medicos_disponibles = int(self._medicos_disponibles[fila])
+        estado.quirofano_disponible = bool(self._proximos[fila, COL_PARTO] == INFINITO)
+        estado.consultorios = self._consultorios.pool(fila, inicio_ventana)
+        estado.salas_recuperacion = self._salas_recuperacion.pool(fila, inicio_ventana)
+        estado.incubadoras = self._incubadoras.pool(fila, inicio_ventana)
+        estado.largo_cola_consultas = self._cola_consultas.acumulador(fila, tiempo, inicio_ventana)
+        estado.largo_cola_partos_naturales = self._cola_partos_naturales.acumulador(fila, tiempo, inicio_ventana)
+        estado.largo_cola_partos_cesarea = self._cola_partos_cesarea.acumulador(fila, tiempo, inicio_ventana)
+        
+        indicadores = self.calculadora_indicadores.calcular_todos(estado)
+        costos = self.calculadora_costos.calcular_costos(estado)
+        
+        return {
+            **indicadores,
+            **costos,
+            'eventos_procesados': int(self._eventos_procesados[fila]),
+            'tiempo_simulacion': estado.tiempo_actual,
+            'G': self.G,
+            'SR': self.SR,
+            'I': self.I,
+            'SC': self.SC
+        }